@@ -0,0 +1,191 @@
+"""
+API Key Authentication
+======================
+Resolves `X-API-Key` (or `Authorization: Bearer hcm_...`) to a principal for
+integration partners calling the API at high rates.
+
+- Lookup: SHA-256 of the presented key (`crud._hash_key`) against the unique
+  index on `core_api_keys.key_hash`; raw keys are never stored or cached.
+- Verified keys sit in a bounded LRU for `API_KEY_CACHE_TTL_SECONDS`, never
+  past their own `expires_at`. Revoking or deleting a key drops it from this
+  worker's cache immediately; other workers converge within the TTL.
+- `last_used` is write-behind: each request only records a timestamp in
+  memory, and one batched UPDATE per `API_KEY_LAST_USED_FLUSH_SECONDS` writes
+  them out (plus a final flush at shutdown).
+"""
+
+import datetime
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import Session
+
+from backend.config import auth_config
+from backend.database import SessionLocal
+from backend.domains.core.models import DBApiKey
+
+logger = logging.getLogger(__name__)
+
+# Matches crud._generate_key(); JWTs start with "eyJ", so the two never collide
+API_KEY_PREFIX = "hcm_"
+# Role API-key principals act as; grant it permissions in System Settings
+API_KEY_ROLE = "Integration"
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.utcnow()
+
+
+def _naive_utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class ApiKeyCache:
+    """Thread-safe LRU of key hash -> (expires_at monotonic, principal)."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key_hash: str) -> Optional[dict]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key_hash]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key_hash)
+            self.hits += 1
+        return dict(entry[1])
+
+    def put(self, key_hash: str, principal: dict, key_expires_at: Optional[datetime.datetime]):
+        ttl = self.ttl_seconds
+        if key_expires_at is not None:
+            ttl = min(ttl, (_naive_utc(key_expires_at) - _utcnow()).total_seconds())
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key_hash] = (time.monotonic() + ttl, dict(principal))
+            self._entries.move_to_end(key_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key_hash: Optional[str]):
+        with self._lock:
+            self._entries.pop(key_hash, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class LastUsedBuffer:
+    """In-memory key id -> last use, written out in one batched UPDATE."""
+
+    def __init__(self, flush_seconds: float = 5.0):
+        self.flush_seconds = flush_seconds
+        self._pending: Dict[str, datetime.datetime] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+        self.flushes = 0
+
+    def touch(self, key_id: str, when: Optional[datetime.datetime] = None):
+        with self._lock:
+            self._pending[key_id] = when or _utcnow()
+
+    def due(self) -> bool:
+        return bool(self._pending) and time.monotonic() - self._flushed_at >= self.flush_seconds
+
+    def flush(self, db: Session) -> int:
+        """Write buffered timestamps (never moving last_used backwards). Returns keys written."""
+        if not self._flush_lock.acquire(blocking=False):
+            return 0  # another thread is flushing
+        try:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            self._flushed_at = time.monotonic()
+            if not pending:
+                return 0
+            table = DBApiKey.__table__
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("key_id"))
+                .where(or_(table.c.last_used.is_(None), table.c.last_used < bindparam("used_at")))
+                .values(last_used=bindparam("used_at"))
+            )
+            try:
+                db.connection().execute(
+                    stmt, [{"key_id": k, "used_at": v} for k, v in pending.items()]
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:  # keep them for the next flush (newer touches win)
+                    for key_id, used_at in pending.items():
+                        self._pending.setdefault(key_id, used_at)
+                raise
+            self.flushes += 1
+            return len(pending)
+        finally:
+            self._flush_lock.release()
+
+
+api_key_cache = ApiKeyCache(
+    max_entries=auth_config.API_KEY_CACHE_MAX_ENTRIES,
+    ttl_seconds=auth_config.API_KEY_CACHE_TTL_SECONDS,
+)
+last_used_buffer = LastUsedBuffer(flush_seconds=auth_config.API_KEY_LAST_USED_FLUSH_SECONDS)
+
+
+def resolve_api_key(db: Session, key_hash: str, writer_sessions=SessionLocal) -> dict:
+    """
+    Principal for a hashed key; 401 when unknown, revoked or expired. When `db`
+    is a read-only session, `last_used` is flushed on `writer_sessions`.
+    """
+    principal = api_key_cache.get(key_hash)
+    if principal is None:
+        db_key = db.execute(select(DBApiKey).where(DBApiKey.key_hash == key_hash)).scalar()
+        if db_key is None or db_key.revoked:
+            raise HTTPException(status_code=401, detail="Invalid API key")
+        if db_key.expires_at is not None and _naive_utc(db_key.expires_at) <= _utcnow():
+            raise HTTPException(status_code=401, detail="API key expired")
+        principal = {
+            "id": db_key.id,
+            "username": f"api-key:{db_key.name}",
+            "role": API_KEY_ROLE,
+            "organization_id": db_key.organization_id,
+            "status": "Active",
+            "apiKeyId": db_key.id,
+        }
+        api_key_cache.put(key_hash, principal, db_key.expires_at)
+
+    last_used_buffer.touch(principal["apiKeyId"])
+    if last_used_buffer.due():
+        try:
+            if db.info.get("read_only"):
+                with writer_sessions() as writer:
+                    last_used_buffer.flush(writer)
+            else:
+                last_used_buffer.flush(db)
+        except Exception as e:
+            logger.warning(f"API key last_used flush failed, retrying later: {e}")
+    return principal
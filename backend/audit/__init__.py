@@ -1,15 +1,28 @@
-"""Audit module initialization"""
-
-from .audit_engine import AuditEngine, run_system_audit
-from .models import ActionItem, AuditFinding, AuditReport, DimensionScore
-from .report_generator import ReportGenerator
-
-__all__ = [
-    "AuditEngine",
-    "run_system_audit",
-    "AuditReport",
-    "DimensionScore",
-    "AuditFinding",
-    "ActionItem",
-    "ReportGenerator",
-]
+"""Audit module initialization
+
+Exports resolve on first use, so importing `backend.audit.scheduler` (or any
+submodule) does not load the audit engine and its analyzers.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "AuditEngine": ".audit_engine",
+    "run_system_audit": ".audit_engine",
+    "AuditReport": ".models",
+    "DimensionScore": ".models",
+    "AuditFinding": ".models",
+    "ActionItem": ".models",
+    "ReportGenerator": ".report_generator",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,6 +1,10 @@
 """
 Audit Scheduler
 Uses APScheduler to run periodic system audits.
+
+With several API workers, only the holder of the "audit-scheduler" lease
+(backend/leader_election.py) starts the scheduler; the others just keep
+contending for the lease and take over if the leader goes away.
 """
 
 import logging
@@ -9,7 +13,7 @@ from pathlib import Path
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from .audit_engine import ReportGenerator, run_system_audit
+from backend.config import system_config
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +23,8 @@ scheduler = BackgroundScheduler()
 def scheduled_audit_job():
     """Wrapper to run audit and save report"""
     try:
+        from .audit_engine import ReportGenerator, run_system_audit
+
         print("⏰ Running Scheduled System Audit...")
         report = run_system_audit(executed_by="System Scheduler")
         reports_dir = Path(__file__).parent.parent / "data" / "reports"
@@ -34,11 +40,54 @@ def scheduled_audit_job():
         logger.error(f"Scheduled audit failed: {e}", exc_info=True)
 
 
-def start_scheduler():
-    """Start the background scheduler"""
+def _run_scheduler():
+    """Start the background scheduler in this process (or resume it after a demotion)"""
     if not scheduler.running:
         scheduler.start()
         print("[INFO] Audit Scheduler Started")
+    else:
+        scheduler.resume()
+
+
+def _pause_scheduler():
+    if scheduler.running:
+        scheduler.pause()
+        print("[INFO] Audit Scheduler Paused (no longer the leader)")
+
+
+_lease = None
+
+
+def scheduler_lease():
+    """The audit scheduler's lease, created on first use."""
+    global _lease
+    if _lease is None:
+        from backend.leader_election import LeaderLease
+
+        _lease = LeaderLease(
+            "audit-scheduler",
+            ttl_seconds=system_config.SCHEDULER_LEASE_TTL_SECONDS,
+            heartbeat_seconds=system_config.SCHEDULER_LEASE_HEARTBEAT_SECONDS,
+            on_elected=_run_scheduler,
+            on_demoted=_pause_scheduler,
+        )
+    return _lease
+
+
+def start_scheduler() -> str:
+    """Join the scheduler election; the scheduler only starts in the leader. Returns this worker's role."""
+    if not system_config.SCHEDULER_LEADER_ELECTION:
+        _run_scheduler()
+        return "leader"
+    return "leader" if scheduler_lease().start() else "standby"
+
+
+def stop_scheduler():
+    """Stop the scheduler and hand the lease to another worker."""
+    if _lease is not None:
+        _lease.stop()
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
 
 
 def configure_schedule(cron_expression: str):
@@ -0,0 +1,126 @@
+"""
+Batch Reads
+===========
+`POST /api/v1/batch` serves many GETs in one round-trip, e.g. the dozen
+master-data lists the React app loads after login.
+
+- The caller is authenticated (and rate-limited) once, for the batch. Each
+  sub-request is dispatched in-process through the ASGI app with the resolved
+  principal in `scope["state"]["principal"]`, which `get_current_user` returns
+  directly. Routing, validation, permission checks, ETags and response models
+  therefore behave exactly as for a standalone GET.
+- The batch itself authenticates on a read session (`@reads_on_write`) and
+  closes it before dispatching, so a long batch never keeps the single
+  writer connection from sub-requests (`@writes_on_read`) or other writers.
+- Sub-requests run concurrently (at most `BATCH_MAX_CONCURRENCY` at a time),
+  each on its own pooled session, since a Session must not be shared between
+  concurrent requests.
+- Sub-response bodies are spliced into the envelope as raw JSON bytes, so
+  nothing is parsed and re-encoded:
+  `{"responses": [{"id", "status", "headers", "body"}, ...]}`, in request order.
+"""
+
+import asyncio
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from backend.serialization import dumps
+
+API_PREFIX = "/api/v1"
+BATCH_PATH = f"{API_PREFIX}/batch"
+# Request headers a sub-request never inherits from the batch POST
+_DROPPED_REQUEST_HEADERS = {b"content-length", b"content-type", b"transfer-encoding"}
+_DROPPED_RESPONSE_HEADERS = {"content-length"}
+
+
+def resolve_path(path: str) -> Optional[str]:
+    """Absolute API path for a sub-request ("/plants" -> "/api/v1/plants"); None if not allowed."""
+    if not path.startswith("/"):
+        path = "/" + path
+    if not path.startswith("/api/"):
+        path = API_PREFIX + path
+    if not path.startswith(API_PREFIX + "/") or urlsplit(path).path.rstrip("/") == BATCH_PATH:
+        return None
+    return path
+
+
+def _sub_scope(parent: dict, path: str, headers: dict, principal: dict) -> dict:
+    parts = urlsplit(path)
+    inherited = [(k, v) for k, v in parent.get("headers", []) if k not in _DROPPED_REQUEST_HEADERS]
+    overrides = {k.lower().encode("latin-1"): str(v).encode("latin-1") for k, v in headers.items()}
+    inherited = [(k, v) for k, v in inherited if k not in overrides]
+    return {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "method": "GET",
+        "path": parts.path,
+        "raw_path": parts.path.encode("utf-8"),
+        "query_string": parts.query.encode("utf-8"),
+        "headers": inherited + list(overrides.items()),
+        "state": {"principal": principal},
+    }
+
+
+async def dispatch(app, scope: dict) -> tuple:
+    """Run one GET through the ASGI app; returns (status, headers dict, body bytes)."""
+    status = 500
+    headers: dict = {}
+    chunks: List[bytes] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers = {
+                k.decode("latin-1"): v.decode("latin-1")
+                for k, v in message.get("headers", [])
+                if k.decode("latin-1") not in _DROPPED_RESPONSE_HEADERS
+            }
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # ServerErrorMiddleware has already produced the 500; keep the batch going
+        if not chunks:
+            status, headers, chunks = 500, {}, [dumps({"detail": "Internal Server Error"})]
+    return status, headers, b"".join(chunks)
+
+
+def _render_item(item_id, status: int, headers: dict, body: bytes) -> bytes:
+    head = dumps({"id": item_id, "status": status, "headers": headers})
+    if not body:
+        payload = b"null"
+    elif headers.get("content-type", "").startswith("application/json"):
+        payload = body
+    else:
+        payload = dumps(body.decode("utf-8", errors="replace"))
+    return head[:-1] + b',"body":' + payload + b"}"
+
+
+async def run_batch(app, parent_scope: dict, items, principal: dict, max_concurrency: int) -> bytes:
+    """Dispatch the sub-requests concurrently and render the multiplexed envelope."""
+    limit = asyncio.Semaphore(max_concurrency)
+
+    async def one(index, item):
+        item_id = item.id if item.id is not None else str(index)
+        path = resolve_path(item.path)
+        if path is None:
+            body = dumps({"detail": f"Path not allowed in a batch: {item.path}"})
+            return _render_item(item_id, 400, {"content-type": "application/json"}, body)
+        async with limit:
+            scope = _sub_scope(parent_scope, path, item.headers or {}, principal)
+            status, headers, body = await dispatch(app, scope)
+        return _render_item(item_id, status, headers, body)
+
+    rendered = await asyncio.gather(*(one(i, item) for i, item in enumerate(items)))
+    return b'{"responses":[' + b",".join(rendered) + b"]}"
@@ -0,0 +1,152 @@
+"""
+Organization Bootstrap Snapshot
+===============================
+One pre-serialized JSON document per organization with everything the
+front-end needs at cold start: profile, plants (with divisions), departments,
+sub-departments, grades, designations, shifts, holidays, banks, employment
+levels and payroll settings. Served by
+`GET /api/v1/organizations/{org_id}/bootstrap`.
+
+- Every section is tied to the (organization, resource) version counter that
+  crud already bumps on writes (`_touch_reference`, plus `organization` and
+  `payroll-settings`). The document is cached together with the version
+  vector it was built from; while that vector is unchanged, a request is
+  served from the cached bytes.
+- When versions move, only the stale sections are re-queried and
+  re-serialized. The document is re-assembled from the cached section bytes
+  without parsing them again.
+- The version vector doubles as the ETag, so an unchanged client gets a 304.
+- Sections whose table is not part of this deployment's models are left out
+  of the document.
+- Building is read-only, so the route runs on the reader session. A
+  section whose row does not exist yet (an organization's payroll settings
+  before first use) is listed in `Snapshot.missing` for the route to create
+  on a short-lived writer session.
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend import crud, schemas
+from backend.config import system_config
+from backend.serialization import dumps, serializer_for
+from backend.versioning import resource_versions
+
+logger = logging.getLogger(__name__)
+
+
+class Section(NamedTuple):
+    key: str  # name in the document
+    resource: str  # version counter crud bumps on writes
+    load: Callable[[Session, str], object]
+    schema: object
+
+
+def _org_rows(model_name: str):
+    def load(db: Session, org_id: str):
+        model = getattr(crud.models, model_name)
+        return db.query(model).filter(model.organization_id == org_id).all()
+    return load
+
+
+SECTIONS: Tuple[Section, ...] = (
+    Section("profile", "organization", crud.get_organization, schemas.OrganizationList),
+    Section("plants", "plants", crud.get_plants, List[schemas.Plant]),
+    Section("departments", "departments", _org_rows("DBDepartment"), List[schemas.Department]),
+    Section("subDepartments", "sub-departments", _org_rows("DBSubDepartment"), List[schemas.SubDepartment]),
+    Section("grades", "grades", _org_rows("DBGrade"), List[schemas.Grade]),
+    Section("designations", "designations", _org_rows("DBDesignation"), List[schemas.Designation]),
+    Section("shifts", "shifts", _org_rows("DBShift"), List[schemas.Shift]),
+    Section("holidays", "holidays", _org_rows("DBHoliday"), List[schemas.Holiday]),
+    Section("banks", "banks", _org_rows("DBBank"), List[schemas.Bank]),
+    Section("employmentLevels", "employment-levels", crud.get_employment_levels, List[schemas.EmploymentLevel]),
+    # Read-only: a missing row is reported in Snapshot.missing, not created here
+    Section("payrollSettings", "payroll-settings", crud.find_payroll_settings, schemas.PayrollSettings),
+)
+
+
+class Snapshot(NamedTuple):
+    versions: Tuple[int, ...]
+    etag: str
+    body: bytes
+    found: bool  # False when the organization itself does not exist
+    missing: Tuple[str, ...] = ()  # sections whose row does not exist yet
+
+
+class BootstrapSnapshots:
+    """Per-organization document cache, rebuilt section by section."""
+
+    def __init__(self, sections: Tuple[Section, ...] = SECTIONS):
+        self.sections = sections
+        self._documents: Dict[str, Snapshot] = {}
+        # (org_id, section key) -> (version, rendered bytes or None when unavailable)
+        self._sections: Dict[Tuple[str, str], Tuple[int, Optional[bytes]]] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.section_builds = 0
+
+    def versions(self, db: Session, org_id: str) -> Tuple[int, ...]:
+        return tuple(resource_versions.get(db, org_id, s.resource) for s in self.sections)
+
+    def get(self, db: Session, org_id: str) -> Snapshot:
+        versions = self.versions(db, org_id)
+        snapshot = self._documents.get(org_id)
+        if snapshot is not None and snapshot.versions == versions:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._documents.get(org_id)
+            if snapshot is not None and snapshot.versions == versions:
+                return snapshot
+            parts, missing = [], []
+            for section, version in zip(self.sections, versions):
+                cached = self._sections.get((org_id, section.key))
+                if cached is None or cached[0] != version:
+                    cached = (version, self._render(db, org_id, section))
+                    self._sections[(org_id, section.key)] = cached
+                    self.section_builds += 1
+                if section.key == "profile" and cached[1] == b"null":
+                    # Unknown organization: don't build the rest
+                    return Snapshot(versions, "", b"null", False)
+                if cached[1] == b"null":
+                    missing.append(section.key)
+                if cached[1] is not None:
+                    parts.append(dumps(section.key) + b":" + cached[1])
+            body = b"{" + b",".join(parts) + b"}"
+            digest = hashlib.sha1(".".join(map(str, versions)).encode()).hexdigest()[:16]
+            snapshot = Snapshot(versions, f'"bootstrap.{org_id}.{digest}"', body, True, tuple(missing))
+            self._documents[org_id] = snapshot
+            self.builds += 1
+            return snapshot
+
+    @staticmethod
+    def _render(db: Session, org_id: str, section: Section) -> Optional[bytes]:
+        try:
+            content = section.load(db, org_id)
+        except AttributeError as e:  # model not registered in this deployment
+            logger.debug(f"Bootstrap section '{section.key}' unavailable: {e}")
+            return None
+        if content is None:
+            return b"null"
+        mode = "trusted" if system_config.FAST_JSON_MODE == "trusted" else "validated"
+        return serializer_for(section.schema).render(content, mode=mode)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self._sections.clear()
+            self.builds = self.section_builds = 0
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._documents),
+            "builds": self.builds,
+            "sectionBuilds": self.section_builds,
+        }
+
+
+bootstrap_snapshots = BootstrapSnapshots()
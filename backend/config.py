@@ -31,6 +31,9 @@ class DatabaseConfig:
     DATABASE_URL: str = os.getenv(
         "DATABASE_URL", f"sqlite:///{DB_PATH}"
     )
+    # Async engine for the read endpoints; empty derives it from DATABASE_URL
+    # (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
 
 
 class CorsConfig:
@@ -51,13 +54,66 @@ class SystemConfig:
     RATE_LIMIT_MAX_REQUESTS: int = 100
     RATE_LIMIT_WINDOW_MS: int = 60000
     AUDIT_LOG_RETENTION_DAYS: int = 90
+    # How long a worker trusts its cached copy of a shared version counter
+    RESOURCE_VERSION_REFRESH_SECONDS: float = float(
+        os.getenv("RESOURCE_VERSION_REFRESH_SECONDS", 2.0)
+    )
+    # List endpoint serialization: off (stock FastAPI), validated, trusted.
+    # "trusted" skips output validation; opt in per deployment only once the
+    # data is known to match the response schemas.
+    FAST_JSON_MODE: str = os.getenv("FAST_JSON_MODE", "off")
+    # SQL instrumentation: slow-query log threshold and N+1 repeat count
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", 250))
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", 10))
+    # Tenant rate limiter: buckets idle this long are evicted (keep >= 60s,
+    # the time an empty bucket takes to refill); a file path shares the
+    # buckets between workers
+    RATE_LIMIT_IDLE_SECONDS: float = float(os.getenv("RATE_LIMIT_IDLE_SECONDS", 120))
+    RATE_LIMIT_STORE_PATH: str = os.getenv("RATE_LIMIT_STORE_PATH", "")
+    # POST /api/v1/batch: sub-requests per batch and how many run at once
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", 25))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", 8))
+    # SQLite profile for file databases: page cache (KiB), memory-mapped I/O
+    # window (bytes), lock wait, read-only pool size and how long a write
+    # waits for the single writer connection
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", 65536))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_READ_POOL_SIZE: int = int(os.getenv("SQLITE_READ_POOL_SIZE", 8))
+    SQLITE_WRITE_TIMEOUT_SECONDS: float = float(os.getenv("SQLITE_WRITE_TIMEOUT_SECONDS", 30))
+    # Fast-start: targeted legacy-DB check, create_all only when the schema
+    # fingerprint changed, scheduler started after the first request
+    FAST_START: bool = os.getenv("FAST_START", "false").lower() in ("1", "true", "yes")
+    # In-process schedulers run in the one worker holding the lease row;
+    # a dead leader is replaced within TTL + heartbeat seconds
+    SCHEDULER_LEADER_ELECTION: bool = os.getenv("SCHEDULER_LEADER_ELECTION", "true").lower() in ("1", "true", "yes")
+    SCHEDULER_LEASE_TTL_SECONDS: float = float(os.getenv("SCHEDULER_LEASE_TTL_SECONDS", 30))
+    SCHEDULER_LEASE_HEARTBEAT_SECONDS: float = float(os.getenv("SCHEDULER_LEASE_HEARTBEAT_SECONDS", 10))
+    # Ids reserved per round trip by the hi/lo sequence service (backend/sequences.py)
+    ID_BLOCK_SIZE: int = int(os.getenv("ID_BLOCK_SIZE", 50))
 
 
 class AuthConfig:
     """Authentication Configuration Constants"""
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     LOGIN_RATE_LIMIT: str = "20/minute"
-    
+
+    # Principal cache for get_current_user (0 entries disables caching)
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 4096))
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+
+    # API-key principals: verified-key cache and last_used write-behind interval
+    API_KEY_CACHE_MAX_ENTRIES: int = int(os.getenv("API_KEY_CACHE_MAX_ENTRIES", 1024))
+    API_KEY_CACHE_TTL_SECONDS: int = int(os.getenv("API_KEY_CACHE_TTL_SECONDS", 60))
+    API_KEY_LAST_USED_FLUSH_SECONDS: float = float(os.getenv("API_KEY_LAST_USED_FLUSH_SECONDS", 5))
+
+    # Password hashing pool: bcrypt cost ("auto" calibrates to BCRYPT_TARGET_MS),
+    # worker threads and the queued+running limit before logins get a 429
+    BCRYPT_ROUNDS: str = os.getenv("BCRYPT_ROUNDS", "12")
+    BCRYPT_TARGET_MS: float = float(os.getenv("BCRYPT_TARGET_MS", 250))
+    BCRYPT_WORKERS: int = int(os.getenv("BCRYPT_WORKERS", 2))
+    BCRYPT_QUEUE_LIMIT: int = int(os.getenv("BCRYPT_QUEUE_LIMIT", 64))
+
     # Import from single source of truth
     from backend.permissions_config import DEFAULT_ROLE_PERMISSIONS
     DEFAULT_PERMISSIONS: dict = DEFAULT_ROLE_PERMISSIONS
@@ -77,6 +133,7 @@ class Settings:
     PORT: int = api_config.PORT
     ENVIRONMENT: str = api_config.ENVIRONMENT
     DATABASE_URL: str = database_config.DATABASE_URL
+    ASYNC_DATABASE_URL: str = database_config.ASYNC_DATABASE_URL
     DB_FILE: str = database_config.DB_FILE
     DB_PATH: str = database_config.DB_PATH
     CORS_ORIGINS: list = cors_config.CORS_ORIGINS
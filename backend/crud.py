@@ -5,55 +5,127 @@ import time
 import hashlib
 import secrets
 from datetime import datetime
-from typing import List, Optional
-import bcrypt
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
 from fastapi import HTTPException
 
+from sqlalchemy import bindparam, case, func, inspect, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload, selectinload
 
 from . import schemas
+from .api_key_auth import api_key_cache
+from .database import upsert_insert
+from .password_hasher import password_hasher
+from .pagination import KeysetOrder, keyset_orders, paginate, resolve_order
+from .permission_matrix import mark_permissions_changed, reload_permission_matrix
+from .principal_cache import principal_cache
+from .rate_limiter import FLAGS_RESOURCE, rate_limiter
+from .sequences import id_sequences
 from .utils import format_to_db
-import backend.domains.core.models as core_models
-import backend.domains.hcm.models as hcm_models
-
-
-# Map models for generic usage if needed, or replace usages
-class ModelsProxy:
-    def __getattr__(self, name):
-        if hasattr(core_models, name):
-            return getattr(core_models, name)
-        if hasattr(hcm_models, name):
-            return getattr(hcm_models, name)
-        raise AttributeError(
-            f"Model {name} not found in Core or HCM domains"
+from .versioning import ALL_SCOPE, resource_versions
+from .model_registry import models
+
+
+# --- Keyset sort orders for list endpoints ---
+# Each non-id sort key is backed by a composite (key, id) index on its table.
+# Built lazily so entities whose models are not registered don't break import.
+@lru_cache(maxsize=None)
+def list_sort_orders(entity: str) -> Dict[str, KeysetOrder]:
+    if entity == "employees":
+        return keyset_orders(models.DBEmployee.id, name=models.DBEmployee.name)
+    if entity == "audit_logs":
+        return keyset_orders(models.DBAuditLog.id, time=models.DBAuditLog.time)
+    if entity == "attendance":
+        return keyset_orders(models.DBAttendance.id, date=models.DBAttendance.date)
+    if entity == "payroll":
+        return keyset_orders(
+            models.DBPayrollLedger.id, employee_id=models.DBPayrollLedger.employee_id
         )
-
-
-models = ModelsProxy()
-
-
-def get_employee(db: Session, employee_id: str):
+    if entity == "leaves":
+        return keyset_orders(
+            models.DBLeaveRequest.id, start_date=models.DBLeaveRequest.start_date
+        )
+    if entity == "jobs":
+        return keyset_orders(models.DBJobVacancy.id)
+    if entity == "candidates":
+        return keyset_orders(models.DBCandidate.id)
+    # Employee profile tabs
+    if entity == "education":
+        return keyset_orders(models.DBEducation.id, passing_year=models.DBEducation.passing_year)
+    if entity == "experience":
+        return keyset_orders(models.DBExperience.id, start_date=models.DBExperience.start_date)
+    if entity == "family":
+        return keyset_orders(models.DBFamily.id)
+    if entity == "discipline":
+        return keyset_orders(models.DBDiscipline.id, date=models.DBDiscipline.date)
+    if entity == "increments":
+        return keyset_orders(models.DBIncrement.id, effective_date=models.DBIncrement.effective_date)
+    raise KeyError(entity)
+
+
+# --- Reference data versions (conditional GET) ---
+def _touch_reference(db: Session, resource: str, obj):
+    """
+    Bump the version counters behind the org-setup ETags, inside the caller's
+    transaction. Covers the row's organization, the organization it was
+    moved away from (if any) and the all-organizations listing.
+    """
+    history = inspect(obj).attrs.organization_id.history
+    scopes = {ALL_SCOPE, obj.organization_id, *history.deleted} - {None, ""}
+    for scope in scopes:
+        resource_versions.bump(db, scope, resource)
+
+
+def get_employee(db: Session, employee_id: str, include: Optional[Iterable[str]] = None):
+    """
+    One employee. `include` names the child tabs to load with it (all of them
+    when None); the rest stay unloaded until touched.
+    """
+    tabs = EMPLOYEE_CHILDREN if include is None else [tab for tab in EMPLOYEE_CHILDREN if tab in include]
     return (
         db.query(models.DBEmployee)
-        .options(
-            joinedload(models.DBEmployee.department_rel),
-            joinedload(models.DBEmployee.designation_rel),
-            joinedload(models.DBEmployee.grade_rel),
-            joinedload(models.DBEmployee.plant_rel),
-            joinedload(models.DBEmployee.shift_rel),
-            selectinload(models.DBEmployee.education),
-            selectinload(models.DBEmployee.experience),
-            selectinload(models.DBEmployee.family),
-            selectinload(models.DBEmployee.discipline),
-            selectinload(models.DBEmployee.increments),
-        )
+        .options(*(selectinload(getattr(models.DBEmployee, tab)) for tab in tabs))
         .filter(models.DBEmployee.id == employee_id)
         .first()
     )
 
 
-def get_employees(db: Session, skip: int = 0, limit: int = 100):
-    return (
+def employee_scope(employee_id: str) -> str:
+    """Version scope of one employee's child tabs (resource = tab name)."""
+    return f"employee:{employee_id}"
+
+
+def _touch_employee_tabs(db: Session, employee_id: str, tabs: Iterable[str]):
+    for tab in tabs:
+        resource_versions.bump(db, employee_scope(employee_id), tab)
+
+
+def get_employee_tab(
+    db: Session,
+    employee_id: str,
+    tab: str,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+):
+    """One page of an employee's child tab (education, family, ...)."""
+    model, _ = EMPLOYEE_CHILDREN[tab]
+    order = resolve_order(list_sort_orders(tab), sort)
+    query = db.query(model).filter(model.employee_id == employee_id)
+    return paginate(query, order, cursor=cursor, skip=skip, limit=limit).all()
+
+
+def get_employees(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+):
+    order = resolve_order(list_sort_orders("employees"), sort)
+    query = (
         db.query(models.DBEmployee)
         .options(
             joinedload(models.DBEmployee.department_rel),
@@ -67,10 +139,58 @@ def get_employees(db: Session, skip: int = 0, limit: int = 100):
             selectinload(models.DBEmployee.discipline),
             selectinload(models.DBEmployee.increments),
         )
-        .offset(skip)
-        .limit(limit)
-        .all()
     )
+    return paginate(query, order, cursor=cursor, skip=skip, limit=limit).all()
+
+
+# Directory-grid projection: response key -> column. Keys match the aliases
+# schemas.Employee serializes with, so summary rows are a subset of detail rows.
+EMPLOYEE_SUMMARY_COLUMNS = {
+    "id": models.DBEmployee.id,
+    "name": models.DBEmployee.name,
+    "role": models.DBEmployee.role,
+    "department": models.DBEmployee.department,
+    "status": models.DBEmployee.status,
+    "join_date": models.DBEmployee.join_date,
+    "email": models.DBEmployee.email,
+    "organizationId": models.DBEmployee.organization_id,
+    "department_id": models.DBEmployee.department_id,
+    "designation_id": models.DBEmployee.designation_id,
+    "grade_id": models.DBEmployee.grade_id,
+    "plant_id": models.DBEmployee.plant_id,
+    "shift_id": models.DBEmployee.shift_id,
+}
+
+
+def get_employee_summaries(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+):
+    """
+    Column-only employee listing through SQLAlchemy Core: no relationship
+    loads, no identity map, no Pydantic. Returns plain Row objects keyed by
+    the API field names.
+    """
+    order = resolve_order(list_sort_orders("employees"), sort)
+    if fields:
+        unknown = [f for f in fields if f not in EMPLOYEE_SUMMARY_COLUMNS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields {unknown}. Allowed: {', '.join(EMPLOYEE_SUMMARY_COLUMNS)}",
+            )
+        # id and the sort key are always selected so the next cursor can be built
+        keys = ["id"] + [f for f in fields if f != "id"]
+        if order.attr and order.attr not in keys:
+            keys.append(order.attr)
+    else:
+        keys = list(EMPLOYEE_SUMMARY_COLUMNS)
+    stmt = select(*[EMPLOYEE_SUMMARY_COLUMNS[k].label(k) for k in keys])
+    return db.execute(paginate(stmt, order, cursor=cursor, skip=skip, limit=limit)).all()
 
 
 # --- RBAC Persistence CRUD ---
@@ -82,16 +202,16 @@ def create_employee(db: Session, employee: schemas.EmployeeCreate, user_id: str)
     # Construct name if missing
     full_name = employee.name
     if not full_name:
-        parts = [employee.firstName or "", employee.lastName or ""]
+        parts = [employee.first_name or "", employee.last_name or ""]
         full_name = " ".join(parts).strip() or "Unknown"
 
     # Use hireDate if join_date not provided
-    join_date_value = employee.join_date or employee.hireDate
+    join_date_value = employee.join_date or employee.hire_date
 
     # Generate ID if missing
     generated_id = employee.id
     if not generated_id:
-        generated_id = f"EMP-{int(time.time())}"
+        generated_id = id_sequences.next_id(db, "employee", employee.organization_id, employee.plant_id)
 
     db_employee = models.DBEmployee(
         id=generated_id,
@@ -117,84 +237,135 @@ def create_employee(db: Session, employee: schemas.EmployeeCreate, user_id: str)
         medical_status=False,
         # Legacy Fields (End)
     )
+
+    # --- Secondary Tabs: inserted with the employee in one flush/transaction ---
+    children = employee_child_rows(employee, generated_id, user_id)
+    for attr, (model, _) in EMPLOYEE_CHILDREN.items():
+        setattr(db_employee, attr, [model(**values) for values in children[model]])
+    # An id can be reused after a delete; move its tab ETags past the old rows
+    _touch_employee_tabs(
+        db, generated_id, [tab for tab, (model, _) in EMPLOYEE_CHILDREN.items() if children[model]]
+    )
+
     db.add(db_employee)
     db.commit()
     db.refresh(db_employee)
+    return db_employee
 
-    # --- Save Secondary Tabs ---
-    # 1. Education
-    for edu in employee.education:
-        db_edu = models.DBEducation(
-            employee_id=db_employee.id,
-            degree=edu.degree,
-            institute=edu.institute,
-            passing_year=edu.year,
-            score=edu.gradeGpa,
-            marks_obtained=edu.marksObtained,
-            total_marks=edu.totalMarks,
-            created_by=user_id,
-            updated_by=user_id,
-        )
-        db.add(db_edu)
-
-    # 2. Experience
-    for exp in employee.experience:
-        db_exp = models.DBExperience(
-            employee_id=db_employee.id,
-            company_name=exp.orgName,
-            designation=exp.designation,
-            start_date=exp.from_,
-            end_date=exp.to,
-            gross_salary=exp.grossSalary,
-            remarks=exp.remarks,
-            created_by=user_id,
-            updated_by=user_id,
-        )
-        db.add(db_exp)
-
-    # 3. Family
-    for fam in employee.family:
-        db_fam = models.DBFamily(
-            employee_id=db_employee.id,
-            name=fam.name,
-            relationship=fam.relationship,
-            dob=fam.dob,
-            created_by=user_id,
-            updated_by=user_id,
-        )
-        db.add(db_fam)
-
-    # 4. Discipline
-    for disc in employee.discipline:
-        db_disc = models.DBDiscipline(
-            employee_id=db_employee.id,
-            date=disc.date,
-            description=disc.description,
-            outcome=disc.outcome,
-            created_by=user_id,
-            updated_by=user_id,
-        )
-        db.add(db_disc)
-
-    # 5. Increments
-    for inc in employee.increments:
-        db_inc = models.DBIncrement(
-            employee_id=db_employee.id,
-            effective_date=inc.effectiveDate,
-            amount=inc.newGross,
-            increment_type=inc.type,
-            remarks=inc.remarks,
-            new_gross=inc.newGross,
-            house_rent=inc.newHouseRent,
-            utility=inc.newUtilityAllowance,
-            other_allowance=inc.newOtherAllowance,
-            created_by=user_id,
-            updated_by=user_id,
-        )
-        db.add(db_inc)
 
-    db.commit()
-    return db_employee
+# --- Employee row builders (bulk paths) ---
+# Column dicts for Core insert()s; the mapping mirrors create_employee.
+def employee_row(employee: schemas.EmployeeCreate, employee_id: str, user_id: str) -> dict:
+    join_date_value = employee.join_date or employee.hire_date
+    return {
+        "id": employee_id,
+        "employee_code": employee_id,
+        "name": employee.name or "Unknown",
+        "role": employee.role or "",
+        "department": employee.department or "",
+        "department_id": employee.department_id,
+        "designation_id": employee.designation_id,
+        "grade_id": employee.grade_id,
+        "plant_id": employee.plant_id,
+        "shift_id": employee.shift_id,
+        "status": employee.status,
+        "join_date": format_to_db(join_date_value) if join_date_value else None,
+        "email": employee.email,
+        "organization_id": employee.organization_id,
+        "eobi_status": False,
+        "social_security_status": False,
+        "medical_status": False,
+        "created_by": user_id,
+        "updated_by": user_id,
+    }
+
+
+def employee_child_rows(employee: schemas.EmployeeCreate, employee_id: str, user_id: str) -> dict:
+    """Child-table rows for one employee, keyed by model."""
+    audit = {"employee_id": employee_id, "created_by": user_id, "updated_by": user_id}
+    return {
+        models.DBEducation: [
+            {**audit, "degree": e.degree, "institute": e.institute, "passing_year": e.year,
+             "score": e.grade_gpa, "marks_obtained": e.marks_obtained, "total_marks": e.total_marks}
+            for e in employee.education
+        ],
+        models.DBExperience: [
+            {**audit, "company_name": e.org_name, "designation": e.designation,
+             "start_date": e.from_, "end_date": e.to, "gross_salary": e.gross_salary,
+             "remarks": e.remarks}
+            for e in employee.experience
+        ],
+        models.DBFamily: [
+            {**audit, "name": f.name, "relationship": f.relationship, "dob": f.dob}
+            for f in employee.family
+        ],
+        models.DBDiscipline: [
+            {**audit, "date": d.date, "description": d.description, "outcome": d.outcome}
+            for d in employee.discipline
+        ],
+        models.DBIncrement: [
+            {**audit, "effective_date": i.effective_date, "amount": i.new_gross,
+             "increment_type": i.type, "remarks": i.remarks, "new_gross": i.new_gross,
+             "house_rent": i.new_house_rent, "utility": i.new_utility_allowance,
+             "other_allowance": i.new_other_allowance}
+            for i in employee.increments
+        ],
+    }
+
+
+# Child collections of DBEmployee: relationship -> (model, natural key). The
+# natural key matches an incoming row sent without an id to an existing row.
+EMPLOYEE_CHILDREN = {
+    "education": (models.DBEducation, ("degree", "institute", "passing_year")),
+    "experience": (models.DBExperience, ("company_name", "designation", "start_date")),
+    "family": (models.DBFamily, ("name", "relationship")),
+    "discipline": (models.DBDiscipline, ("date", "description")),
+    "increments": (models.DBIncrement, ("effective_date", "increment_type")),
+}
+_CHILD_BOOKKEEPING = {"employee_id", "created_by", "updated_by"}
+
+
+def sync_employee_children(db_employee, employee: schemas.EmployeeCreate, user_id: str) -> List[str]:
+    """
+    Diff each incoming child list against the employee's loaded rows. Rows are
+    matched by id, else by natural key; matched rows are updated only if a
+    value changed, unmatched incoming rows are inserted and unmatched existing
+    rows are deleted (delete-orphan). The session's next flush writes all of
+    it, batched per table. Returns the tabs that changed.
+    """
+    incoming = employee_child_rows(employee, db_employee.id, user_id)
+    changed_tabs = []
+    for attr, (model, natural_key) in EMPLOYEE_CHILDREN.items():
+        existing = list(getattr(db_employee, attr))
+        unclaimed = {row.id: row for row in existing}
+        synced = []
+        for item, values in zip(getattr(employee, attr), incoming[model]):
+            row = unclaimed.pop(item.id, None) if item.id is not None else None
+            if row is None and item.id is None:
+                key = tuple(values[k] for k in natural_key)
+                row = next(
+                    (r for r in unclaimed.values() if tuple(getattr(r, k) for k in natural_key) == key),
+                    None,
+                )
+                if row is not None:
+                    del unclaimed[row.id]
+            if row is None:
+                # New row (an id that isn't one of this employee's rows is ignored)
+                synced.append(model(**values))
+                continue
+            changed = False
+            for column, value in values.items():
+                if column not in _CHILD_BOOKKEEPING and getattr(row, column) != value:
+                    setattr(row, column, value)
+                    changed = True
+            if changed:
+                row.updated_by = user_id
+                changed_tabs.append(attr)
+            synced.append(row)
+        if synced != existing:
+            setattr(db_employee, attr, synced)
+            changed_tabs.append(attr)
+    return list(dict.fromkeys(changed_tabs))
 
 
 def update_employee(
@@ -234,101 +405,16 @@ def update_employee(
             elif db_employee.status == "Active":
                 linked_user.is_active = True
 
-        # --- Update Secondary Tabs (Full Replace Strategy) ---
-
-        # Education
-        db.query(models.DBEducation).filter(
-            models.DBEducation.employee_id == employee_id
-        ).delete()
-        for edu in employee.education:
-            db.add(
-                models.DBEducation(
-                    employee_id=employee_id,
-                    degree=edu.degree,
-                    institute=edu.institute,
-                    passing_year=edu.year,
-                    score=edu.gradeGpa,
-                    marks_obtained=edu.marksObtained,
-                    total_marks=edu.totalMarks,
-                    created_by=user_id,
-                    updated_by=user_id,
-                )
-            )
-
-        # Experience
-        db.query(models.DBExperience).filter(
-            models.DBExperience.employee_id == employee_id
-        ).delete()
-        for exp in employee.experience:
-            db.add(
-                models.DBExperience(
-                    employee_id=employee_id,
-                    company_name=exp.orgName,
-                    designation=exp.designation,
-                    start_date=exp.from_,
-                    end_date=exp.to,
-                    gross_salary=exp.grossSalary,
-                    remarks=exp.remarks,
-                    created_by=user_id,
-                    updated_by=user_id,
-                )
-            )
-
-        # Family
-        db.query(models.DBFamily).filter(
-            models.DBFamily.employee_id == employee_id
-        ).delete()
-        for fam in employee.family:
-            db.add(
-                models.DBFamily(
-                    employee_id=employee_id,
-                    name=fam.name,
-                    relationship=fam.relationship,
-                    dob=fam.dob,
-                    created_by=user_id,
-                    updated_by=user_id,
-                )
-            )
-
-        # Discipline
-        db.query(models.DBDiscipline).filter(
-            models.DBDiscipline.employee_id == employee_id
-        ).delete()
-        for disc in employee.discipline:
-            db.add(
-                models.DBDiscipline(
-                    employee_id=employee_id,
-                    date=disc.date,
-                    description=disc.description,
-                    outcome=disc.outcome,
-                    created_by=user_id,
-                    updated_by=user_id,
-                )
-            )
-
-        # Increments
-        db.query(models.DBIncrement).filter(
-            models.DBIncrement.employee_id == employee_id
-        ).delete()
-        for inc in employee.increments:
-            db.add(
-                models.DBIncrement(
-                    employee_id=employee_id,
-                    effective_date=inc.effectiveDate,
-                    amount=inc.newGross,
-                    increment_type=inc.type,
-                    remarks=inc.remarks,
-                    new_gross=inc.newGross,
-                    house_rent=inc.newHouseRent,
-                    utility=inc.newUtilityAllowance,
-                    other_allowance=inc.newOtherAllowance,
-                    created_by=user_id,
-                    updated_by=user_id,
-                )
-            )
+        # --- Secondary Tabs: only the rows that changed ---
+        changed_tabs = sync_employee_children(db_employee, employee, user_id)
+        _touch_employee_tabs(db, employee_id, changed_tabs)
 
         db.commit()
         db.refresh(db_employee)
+
+        # Linked account may have been (de)activated: evict after commit
+        if linked_user:
+            principal_cache.invalidate_user(linked_user.id, linked_user.username)
     return db_employee
 
 
@@ -360,6 +446,7 @@ def delete_employee(db: Session, employee_id: str):
         db.query(models.DBIncrement).filter(
             models.DBIncrement.employee_id == employee_id
         ).delete()
+        _touch_employee_tabs(db, employee_id, EMPLOYEE_CHILDREN)
 
         # Delete the employee
         db.delete(db_employee)
@@ -371,8 +458,16 @@ def delete_employee(db: Session, employee_id: str):
 
 
 # --- Candidates ---
-def get_candidates(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.DBCandidate).offset(skip).limit(limit).all()
+def get_candidates(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+):
+    order = resolve_order(list_sort_orders("candidates"), sort)
+    query = db.query(models.DBCandidate)
+    return paginate(query, order, cursor=cursor, skip=skip, limit=limit).all()
 
 
 def create_candidate(db: Session, candidate: schemas.CandidateCreate, user_id: str):
@@ -451,8 +546,16 @@ def update_candidate(
 
 
 # --- Job Vacancies ---
-def get_job_vacancies(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.DBJobVacancy).offset(skip).limit(limit).all()
+def get_job_vacancies(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+):
+    order = resolve_order(list_sort_orders("jobs"), sort)
+    query = db.query(models.DBJobVacancy)
+    return paginate(query, order, cursor=cursor, skip=skip, limit=limit).all()
 
 
 def create_job_vacancy(db: Session, job: schemas.JobVacancyCreate, user_id: str):
@@ -579,6 +682,7 @@ def create_organization(db: Session, org: schemas.OrganizationCreate, user_id: s
             ),
         )
         db.add(db_org)
+        resource_versions.bump(db, org_id, "organization")
         db.commit()
         db.refresh(db_org)
         return db_org
@@ -641,6 +745,7 @@ def update_organization(
                 db_org.social_links = org.social_links
 
         db_org.updated_by = user_id
+        resource_versions.bump(db, org_id, "organization")
         db.commit()
         db.refresh(db_org)
     return db_org
@@ -676,8 +781,10 @@ def update_role_permissions(db: Session, role: str, permissions: List[str]):
     for p in permissions:
         db_p = models.DBRolePermission(role=role, permission=p)
         db.add(db_p)
-    
+
+    mark_permissions_changed(db)
     db.commit()
+    reload_permission_matrix(db)
     return get_role_permissions(db, role)
 
 
@@ -703,6 +810,7 @@ def create_department(db: Session, dept: schemas.DepartmentCreate, user_id: str)
         updated_by=user_id,
     )
     db.add(db_dept)
+    _touch_reference(db, "departments", db_dept)
     db.commit()
     db.refresh(db_dept)
     return db_dept
@@ -720,6 +828,7 @@ def update_department(
         db_dept.is_active = dept.is_active
         db_dept.organization_id = dept.organization_id
         db_dept.updated_by = user_id
+        _touch_reference(db, "departments", db_dept)
         db.commit()
         db.refresh(db_dept)
     return db_dept
@@ -731,6 +840,7 @@ def delete_department(db: Session, dept_id: str):
     )
     if db_dept:
         db.delete(db_dept)
+        _touch_reference(db, "departments", db_dept)
         db.commit()
     return db_dept
 
@@ -773,6 +883,7 @@ def create_sub_department(db: Session, sub: schemas.SubDepartmentCreate, user_id
         updated_by=user_id,
     )
     db.add(db_sub)
+    _touch_reference(db, "sub-departments", db_sub)
     db.commit()
     db.refresh(db_sub)
     return db_sub
@@ -793,6 +904,7 @@ def update_sub_department(
         db_sub.is_active = sub.is_active
         db_sub.organization_id = sub.organization_id
         db_sub.updated_by = user_id
+        _touch_reference(db, "sub-departments", db_sub)
         db.commit()
         db.refresh(db_sub)
     return db_sub
@@ -806,6 +918,7 @@ def delete_sub_department(db: Session, sub_id: str):
     )
     if db_sub:
         db.delete(db_sub)
+        _touch_reference(db, "sub-departments", db_sub)
         db.commit()
     return db_sub
 
@@ -839,6 +952,7 @@ def create_grade(db: Session, grade: schemas.GradeCreate, user_id: str):
         code=code,
     )
     db.add(db_grade)
+    _touch_reference(db, "grades", db_grade)
     db.commit()
     db.refresh(db_grade)
     return db_grade
@@ -853,6 +967,7 @@ def update_grade(db: Session, grade_id: str, grade: schemas.GradeCreate, user_id
         db_grade.organization_id = grade.organization_id
         db_grade.job_level_id = grade.job_level_id  # Linked to Job Level
         db_grade.updated_by = user_id
+        _touch_reference(db, "grades", db_grade)
         db.commit()
         db.refresh(db_grade)
     return db_grade
@@ -862,6 +977,7 @@ def delete_grade(db: Session, grade_id: str):
     db_grade = db.query(models.DBGrade).filter(models.DBGrade.id == grade_id).first()
     if db_grade:
         db.delete(db_grade)
+        _touch_reference(db, "grades", db_grade)
         db.commit()
     return db_grade
 
@@ -901,6 +1017,7 @@ def create_designation(db: Session, desig: schemas.DesignationCreate, user_id: s
         code=code,
     )
     db.add(db_desig)
+    _touch_reference(db, "designations", db_desig)
     db.commit()
     db.refresh(db_desig)
     return db_desig
@@ -921,6 +1038,7 @@ def update_designation(
         db_desig.is_active = desig.is_active
         db_desig.organization_id = desig.organization_id
         db_desig.updated_by = user_id
+        _touch_reference(db, "designations", db_desig)
         db.commit()
         db.refresh(db_desig)
     return db_desig
@@ -934,6 +1052,7 @@ def delete_designation(db: Session, desig_id: str):
     )
     if db_desig:
         db.delete(db_desig)
+        _touch_reference(db, "designations", db_desig)
         db.commit()
     return db_desig
 
@@ -975,6 +1094,7 @@ def create_shift(db: Session, shift: schemas.ShiftCreate, user_id: str):
         updated_by=user_id,
     )
     db.add(db_shift)
+    _touch_reference(db, "shifts", db_shift)
     db.commit()
     db.refresh(db_shift)
     return db_shift
@@ -1009,6 +1129,7 @@ def update_shift(db: Session, shift_id: str, shift: schemas.ShiftCreate, user_id
         db_shift.isActive = shift.is_active
         db_shift.organization_id = shift.organization_id
         db_shift.updated_by = user_id
+        _touch_reference(db, "shifts", db_shift)
         db.commit()
         db.refresh(db_shift)
     return db_shift
@@ -1018,6 +1139,7 @@ def delete_shift(db: Session, shift_id: str):
     db_shift = db.query(models.DBShift).filter(models.DBShift.id == shift_id).first()
     if db_shift:
         db.delete(db_shift)
+        _touch_reference(db, "shifts", db_shift)
         db.commit()
     return db_shift
 
@@ -1089,6 +1211,7 @@ def create_position(db: Session, position: schemas.PositionCreate, user_id: str)
         updated_by=user_id,
     )
     db.add(db_pos)
+    _touch_reference(db, "positions", db_pos)
     db.commit()
     db.refresh(db_pos)
     return db_pos
@@ -1109,6 +1232,7 @@ def update_position(
         db_pos.description = position.description
         db_pos.is_active = position.is_active
         db_pos.updated_by = user_id
+        _touch_reference(db, "positions", db_pos)
         db.commit()
         db.refresh(db_pos)
     return db_pos
@@ -1120,6 +1244,7 @@ def delete_position(db: Session, position_id: str):
     )
     if db_pos:
         db.delete(db_pos)
+        _touch_reference(db, "positions", db_pos)
         db.commit()
     return db_pos
 
@@ -1144,6 +1269,7 @@ def create_holiday(db: Session, holiday: schemas.HolidayCreate, user_id: str):
         updated_by=user_id,
     )
     db.add(db_holiday)
+    _touch_reference(db, "holidays", db_holiday)
     db.commit()
     db.refresh(db_holiday)
     return db_holiday
@@ -1162,6 +1288,7 @@ def update_holiday(
         db_holiday.is_recurring = holiday.is_recurring
         db_holiday.description = holiday.description
         db_holiday.updated_by = user_id
+        _touch_reference(db, "holidays", db_holiday)
         db.commit()
         db.refresh(db_holiday)
     return db_holiday
@@ -1173,6 +1300,7 @@ def delete_holiday(db: Session, holiday_id: str):
     )
     if db_holiday:
         db.delete(db_holiday)
+        _touch_reference(db, "holidays", db_holiday)
         db.commit()
     return db_holiday
 
@@ -1200,6 +1328,7 @@ def create_bank(db: Session, bank: schemas.BankCreate, user_id: str):
         updated_by=user_id,
     )
     db.add(db_bank)
+    _touch_reference(db, "banks", db_bank)
     db.commit()
     db.refresh(db_bank)
     return db_bank
@@ -1217,6 +1346,7 @@ def update_bank(db: Session, bank_id: str, bank: schemas.BankCreate, user_id: st
         db_bank.currency = bank.currency
         db_bank.is_active = bank.is_active
         db_bank.updated_by = user_id
+        _touch_reference(db, "banks", db_bank)
         db.commit()
         db.refresh(db_bank)
     return db_bank
@@ -1226,6 +1356,7 @@ def delete_bank(db: Session, bank_id: str):
     db_bank = db.query(models.DBBank).filter(models.DBBank.id == bank_id).first()
     if db_bank:
         db.delete(db_bank)
+        _touch_reference(db, "banks", db_bank)
         db.commit()
     return db_bank
 
@@ -1233,8 +1364,16 @@ def delete_bank(db: Session, bank_id: str):
 # --- Job Vacancies ---
 
 
-def get_audit_logs(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.DBAuditLog).offset(skip).limit(limit).all()
+def get_audit_logs(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+):
+    order = resolve_order(list_sort_orders("audit_logs"), sort)
+    query = db.query(models.DBAuditLog)
+    return paginate(query, order, cursor=cursor, skip=skip, limit=limit).all()
 
 
 def create_audit_log(db: Session, log: schemas.AuditLogCreate):
@@ -1254,8 +1393,16 @@ def create_audit_log(db: Session, log: schemas.AuditLogCreate):
     return db_log
 
 
-def get_payroll_records(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.DBPayrollLedger).offset(skip).limit(limit).all()
+def get_payroll_records(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+):
+    order = resolve_order(list_sort_orders("payroll"), sort)
+    query = db.query(models.DBPayrollLedger)
+    return paginate(query, order, cursor=cursor, skip=skip, limit=limit).all()
 
 
 def create_payroll_ledger_entry(
@@ -1383,6 +1530,7 @@ def create_payroll_settings(
         updated_by=user_id,
     )
     db.add(db_settings)
+    _touch_reference(db, "payroll-settings", db_settings)
     db.commit()
     db.refresh(db_settings)
     return db_settings
@@ -1409,6 +1557,7 @@ def update_payroll_settings(
         db_settings.overtime_enabled = settings.overtimeEnabled
         db_settings.overtime_rate = settings.overtimeRate
         db_settings.updated_by = user_id
+        _touch_reference(db, "payroll-settings", db_settings)
 
         db.commit()
         db.refresh(db_settings)
@@ -1507,6 +1656,7 @@ def revoke_api_key(db: Session, key_id: str):
     if db_key:
         db_key.revoked = True
         db.commit()
+        api_key_cache.invalidate(db_key.key_hash)
         db.refresh(db_key)
     return db_key
 
@@ -1517,6 +1667,7 @@ def delete_api_key(db: Session, key_id: str):
     if db_key:
         db.delete(db_key)
         db.commit()
+        api_key_cache.invalidate(db_key.key_hash)
     return db_key
 
 
@@ -1850,6 +2001,37 @@ def _format_background_job(db_job) -> dict:
 # --- Payroll Settings CRUD ---
 
 
+def _default_payroll_settings(organization_id: str):
+    return models.DBPayrollSettings(
+        id=str(uuid.uuid4()),
+        organization_id=organization_id,
+        created_by="system",
+        calculation_method="Per Month",
+        custom_formulas='{"staff": "", "worker": ""}',
+        overtime_rules="{}",
+        currency="PKR",
+        tax_year_start="July",
+        allow_negative_salary=False,
+        pay_frequency="Monthly",
+        pay_day=1,
+        tax_calculation_method="Annualized",
+        eobi_enabled=True,
+        social_security_enabled=True,
+        overtime_enabled=True,
+        overtime_rate=1.5,
+    )
+
+
+def find_payroll_settings(db: Session, organization_id: str):
+    """Read-only lookup: the organization's settings, or None when it has no row yet."""
+    db_settings = (
+        db.query(models.DBPayrollSettings)
+        .filter(models.DBPayrollSettings.organization_id == organization_id)
+        .first()
+    )
+    return _payroll_settings_schema(db_settings) if db_settings else None
+
+
 def get_payroll_settings(db: Session, organization_id: str):
     db_settings = (
         db.query(models.DBPayrollSettings)
@@ -1858,28 +2040,15 @@ def get_payroll_settings(db: Session, organization_id: str):
     )
     if not db_settings:
         # Create default if missing
-        db_settings = models.DBPayrollSettings(
-            id=str(uuid.uuid4()),
-            organization_id=organization_id,
-            created_by="system",
-            calculation_method="Per Month",
-            custom_formulas='{"staff": "", "worker": ""}',
-            overtime_rules="{}",
-            currency="PKR",
-            tax_year_start="July",
-            allow_negative_salary=False,
-            pay_frequency="Monthly",
-            pay_day=1,
-            tax_calculation_method="Annualized",
-            eobi_enabled=True,
-            social_security_enabled=True,
-            overtime_enabled=True,
-            overtime_rate=1.5,
-        )
+        db_settings = _default_payroll_settings(organization_id)
         db.add(db_settings)
+        _touch_reference(db, "payroll-settings", db_settings)
         db.commit()
         db.refresh(db_settings)
+    return _payroll_settings_schema(db_settings)
+
 
+def _payroll_settings_schema(db_settings) -> schemas.PayrollSettings:
     # Manual Mapping
     return schemas.PayrollSettings(
         id=db_settings.id,
@@ -1979,23 +2148,8 @@ def create_user(db: Session, user: schemas.UserCreate, creator_id: str = None):
         # Generate ID
         user_id = user.id or str(uuid.uuid4())
 
-        # Hash Password (using context from main.py implicitly or separate logic)
-        # For now, we store hash directly if provided, or we might need a hasher helper.
-        # Assuming `user.password` is raw, we need to hash it.
-        # But `main.py` has the hashing logic.
-        # Ideally CRUD shouldn't depend on View logic, but we need `get_password_hash`.
-        # We will import bcrypt here directly to avoid circular imports if possible, or expect hashed password.
-        # Let's assume the Service/Main layer handles hashing for now?
-        # Standard pattern: CRUD receives Pydantic model.
-        # Let's add hashing here using passlib or bcrypt if available, matching main.py
-
-        # We will use a simple specialized function or import from utils if available.
-        # Given `main.py` uses direct bcrypt, we'll replicate or better, move hashing to a util.
-        # For this step, to avoid breaking, I'll assumme the schema might have `password` and we hash it.
-
-        pwd_bytes = user.password.encode("utf-8")
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(pwd_bytes, salt).decode("utf-8")
+        # Hashed on the bounded bcrypt pool, at the configured cost
+        hashed_password = password_hasher.hash_sync(user.password)
 
         db_user = models.DBUser(
             id=user_id,
@@ -2027,13 +2181,12 @@ def update_user(
     if not db_user:
         return None
 
+    previous_username = db_user.username
     update_data = updates.dict(exclude_unset=True)
 
     # Handle Password Update
     if "password" in update_data and update_data["password"]:
-        pwd_bytes = update_data["password"].encode("utf-8")
-        salt = bcrypt.gensalt()
-        update_data["password_hash"] = bcrypt.hashpw(pwd_bytes, salt).decode("utf-8")
+        update_data["password_hash"] = password_hasher.hash_sync(update_data["password"])
         del update_data["password"]
 
     # Field Mapping
@@ -2065,14 +2218,27 @@ def update_user(
     db_user.updated_by = updater_id
     db.commit()
     db.refresh(db_user)
+
+    # Role, status or username may have changed: evict cached principals
+    principal_cache.invalidate_user(db_user.id, previous_username)
+    principal_cache.invalidate_user(username=db_user.username)
     return db_user
 
 
+def set_password_hash(db: Session, user_id: str, password_hash: str):
+    """Store an upgraded hash for the same password (rehash-on-login)."""
+    db.execute(
+        update(models.DBUser).where(models.DBUser.id == user_id).values(password_hash=password_hash)
+    )
+    db.commit()
+
+
 def delete_user(db: Session, user_id: str):
     db_user = get_user(db, user_id)
     if db_user:
         db.delete(db_user)
         db.commit()
+        principal_cache.invalidate_user(db_user.id, db_user.username)
     return db_user
 
 
@@ -2130,7 +2296,9 @@ def update_system_flags(db: Session, organization_id: str, flags: schemas.System
             setattr(db_flags, field, value)
     
     db_flags.updated_by = user_id
+    resource_versions.bump(db, organization_id, FLAGS_RESOURCE)
     db.commit()
+    rate_limiter.invalidate(organization_id)
     db.refresh(db_flags)
     return db_flags
 
@@ -2199,6 +2367,7 @@ def create_employment_level(db: Session, level: schemas.EmploymentLevelCreate, u
     )
     db.add(db_level)
     try:
+        _touch_reference(db, "employment-levels", db_level)
         db.commit()
         db.refresh(db_level)
         return db_level
@@ -2215,6 +2384,7 @@ def update_employment_level(db: Session, level_id: str, level: schemas.Employmen
         db_level.description = level.description
         db_level.is_active = level.is_active
         db_level.updated_by = user_id
+        _touch_reference(db, "employment-levels", db_level)
         db.commit()
         db.refresh(db_level)
     return db_level
@@ -2225,6 +2395,7 @@ def delete_employment_level(db: Session, level_id: str):
     if db_level:
         db_level.is_active = False
         db_level.updated_at = datetime.utcnow()
+        _touch_reference(db, "employment-levels", db_level)
         db.commit()
         db.refresh(db_level)
     return db_level
@@ -2233,7 +2404,7 @@ def delete_employment_level(db: Session, level_id: str):
 # --- Plants (Locations) & Divisions ---
 
 def get_plants(db: Session, organization_id: Optional[str] = None):
-    query = db.query(models.DBHRPlant)
+    query = db.query(models.DBHRPlant).options(selectinload(models.DBHRPlant.plant_divisions))
     if organization_id:
         query = query.filter(models.DBHRPlant.organization_id == organization_id)
     return query.all()
@@ -2276,6 +2447,7 @@ def create_plant(db: Session, plant: schemas.PlantCreate, user_id: str):
         db.add(db_div)
 
     try:
+        _touch_reference(db, "plants", db_plant)
         db.commit()
         db.refresh(db_plant)
         return db_plant
@@ -2338,6 +2510,7 @@ def update_plant(db: Session, plant_id: str, plant: schemas.PlantCreate, user_id
             db.delete(div)
 
     try:
+        _touch_reference(db, "plants", db_plant)
         db.commit()
         db.refresh(db_plant)
         return db_plant
@@ -2349,6 +2522,7 @@ def delete_plant(db: Session, plant_id: str):
     db_plant = get_plant(db, plant_id)
     if db_plant:
         db.delete(db_plant)
+        _touch_reference(db, "plants", db_plant)
         db.commit()
     return db_plant
 
@@ -2360,13 +2534,16 @@ def get_attendance_records(
     limit: int = 100,
     employee_id: str = None,
     date: str = None,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
 ):
+    order = resolve_order(list_sort_orders("attendance"), sort)
     query = db.query(models.DBAttendance)
     if employee_id:
         query = query.filter(models.DBAttendance.employee_id == employee_id)
     if date:
         query = query.filter(models.DBAttendance.date == date)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, order, cursor=cursor, skip=skip, limit=limit).all()
 
 
 def create_attendance_record(
@@ -2383,11 +2560,111 @@ def create_attendance_record(
         updated_by=user_id,
     )
     db.add(db_attendance)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # uq_hcm_attendance_employee_date: one row per employee-day
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"Attendance for {attendance.employee_id} on {attendance.date} already exists.",
+        )
     db.refresh(db_attendance)
     return db_attendance
 
 
+PUNCH_CHUNK_SIZE = 1000
+
+
+def ingest_attendance_punches(
+    db: Session,
+    punches: List[schemas.AttendancePunch],
+    user_id: str,
+    chunk_size: int = PUNCH_CHUNK_SIZE,
+) -> dict:
+    """
+    Fold raw punches into one hcm_attendance row per (employee, day).
+
+    Punches are first collapsed in memory to the earliest and latest time per
+    employee-day, then written with a chunked executemany of
+    INSERT ... ON CONFLICT (employee_id, date) DO UPDATE. The update keeps the
+    earliest clock_in and latest clock_out across old and new values, so
+    re-delivering the same punches (or delivering them out of order) is a no-op.
+    Timestamps are taken as terminal wall-clock time.
+    """
+    table = models.DBAttendance.__table__
+    known = set()
+    employee_ids = list({p.employee_id for p in punches})
+    for i in range(0, len(employee_ids), chunk_size):
+        known.update(db.execute(
+            select(models.DBEmployee.id).where(models.DBEmployee.id.in_(employee_ids[i:i + chunk_size]))
+        ).scalars())
+
+    days: dict = {}
+    rejected = []
+    devices: dict = {}
+    for index, punch in enumerate(punches):
+        if punch.employee_id not in known:
+            rejected.append({"index": index, "employeeId": punch.employee_id, "error": "Unknown employee"})
+            continue
+        devices[punch.device] = devices.get(punch.device, 0) + 1
+        key = (punch.employee_id, punch.timestamp.date().isoformat())
+        at = punch.timestamp.strftime("%H:%M:%S")
+        first, last = days.get(key, (at, at))
+        days[key] = (min(first, at), max(last, at))
+
+    rows = [
+        {
+            "employee_id": employee_id,
+            "date": day,
+            "clock_in": first,
+            "clock_out": last if last != first else None,
+            "status": "Present",
+            "created_by": user_id,
+            "updated_by": user_id,
+        }
+        for (employee_id, day), (first, last) in days.items()
+    ]
+
+    insert = upsert_insert(db)
+    greatest = func.max if db.get_bind().dialect.name == "sqlite" else func.greatest
+    least = func.min if db.get_bind().dialect.name == "sqlite" else func.least
+    # One statement, compiled once and run as executemany per chunk; a
+    # multi-row VALUES clause would be recompiled for every chunk.
+    stmt = insert(table)
+    new = stmt.excluded
+    first = least(func.coalesce(table.c.clock_in, new.clock_in), new.clock_in)
+    last = greatest(
+        func.coalesce(table.c.clock_out, table.c.clock_in, new.clock_in),
+        func.coalesce(new.clock_out, new.clock_in),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.employee_id, table.c.date],
+        set_={
+            "clock_in": first,
+            "clock_out": func.nullif(last, first),
+            # Manual statuses (Leave, Late, ...) win over the punch default
+            "status": case(
+                (or_(table.c.status.is_(None), table.c.status == "Absent"), new.status),
+                else_=table.c.status,
+            ),
+            "updated_by": new.updated_by,
+            "updated_at": func.now(),
+        },
+    )
+    for i in range(0, len(rows), chunk_size):
+        db.execute(stmt, rows[i:i + chunk_size])
+    db.commit()
+
+    return {
+        "received": len(punches),
+        "accepted": len(punches) - len(rejected),
+        "days_upserted": len(rows),
+        "rejected": rejected,
+        "devices": {str(k): v for k, v in devices.items()},
+    }
+
+
 # --- Leaves ---
 def get_leave_requests(
     db: Session,
@@ -2395,14 +2672,17 @@ def get_leave_requests(
     limit: int = 100,
     employee_id: str = None,
     status: str = None,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
 ):
-    query = db.query(models.DBLeaveRequest)
+    order = resolve_order(list_sort_orders("leaves"), sort)
+    query = db.query(models.DBLeaveRequest).options(joinedload(models.DBLeaveRequest.employee))
     if employee_id:
         query = query.filter(models.DBLeaveRequest.employee_id == employee_id)
     if status:
         query = query.filter(models.DBLeaveRequest.status == status)
     
-    requests = query.offset(skip).limit(limit).all()
+    requests = paginate(query, order, cursor=cursor, skip=skip, limit=limit).all()
     # Enrich with employee name for UI
     for req in requests:
         if req.employee:
@@ -2412,8 +2692,14 @@ def get_leave_requests(
 def create_leave_request(
     db: Session, leave: schemas.LeaveRequestCreate, user_id: str
 ):
+    # Numbered per organization and plant, like the employee ids
+    scope = db.execute(
+        select(models.DBEmployee.organization_id, models.DBEmployee.plant_id)
+        .where(models.DBEmployee.id == leave.employee_id)
+    ).first()
+    organization_id, plant_id = scope if scope else ("", "")
     db_leave = models.DBLeaveRequest(
-        id=f"LR-{int(time.time())}", # Simple ID generation
+        id=id_sequences.next_id(db, "leave_request", organization_id, plant_id),
         employee_id=leave.employee_id,
         type=leave.type,
         start_date=leave.start_date,
@@ -2432,53 +2718,130 @@ def create_leave_request(
 def update_leave_status(
     db: Session, leave_id: str, status: str, user_id: str
 ):
+    if status == "Approved":
+        # Same set-based path as the batch endpoint (real year, atomic deltas)
+        result = approve_leave_requests(db, [leave_id], user_id)
+        if leave_id not in result["approved"]:
+            # Only Pending requests move; anything else must not look approved
+            reason = result["skipped"][0]["reason"]
+            raise HTTPException(status_code=404 if reason == "Not found" else 409, detail=reason)
+        return db.get(models.DBLeaveRequest, leave_id, populate_existing=True)
+
     db_leave = db.query(models.DBLeaveRequest).filter(models.DBLeaveRequest.id == leave_id).first()
     if db_leave:
         db_leave.status = status
         db_leave.updated_by = user_id
-        
-        # If Approved, update balance
-        if status == "Approved":
-            # Find balance
-            # Assuming current year 2025 for simplicity
-            current_year = 2025 
-            balance = db.query(models.DBLeaveBalance).filter(
-                models.DBLeaveBalance.employee_id == db_leave.employee_id,
-                models.DBLeaveBalance.year == current_year
-            ).first()
-            
-            if not balance:
-                # auto-create default balance if missing
-                balance = models.DBLeaveBalance(
-                    employee_id=db_leave.employee_id,
-                    year=current_year,
-                    annual_total=14,
-                    sick_total=10,
-                    casual_total=10,
-                    annual_used=0.0,
-                    sick_used=0.0,
-                    casual_used=0.0,
-                    unpaid_used=0.0,
-                    created_by="System"
-                )
-                db.add(balance)
-            
-            # Deduct
-            if db_leave.type == "Annual":
-                balance.annual_used += db_leave.days
-            elif db_leave.type == "Sick":
-                balance.sick_used += db_leave.days
-            elif db_leave.type == "Casual":
-                balance.casual_used += db_leave.days
-            elif db_leave.type == "Unpaid":
-                balance.unpaid_used += db_leave.days
-                
         db.commit()
         db.refresh(db_leave)
     return db_leave
 
+
+# Leave type -> hcm_leave_balances column charged on approval
+LEAVE_USED_COLUMNS = {
+    "Annual": "annual_used",
+    "Sick": "sick_used",
+    "Casual": "casual_used",
+    "Unpaid": "unpaid_used",
+}
+# Entitlements of a balance row created on first approval in a year
+DEFAULT_LEAVE_BALANCE = {
+    "annual_total": 14.0, "sick_total": 10.0, "casual_total": 10.0,
+    "annual_used": 0.0, "sick_used": 0.0, "casual_used": 0.0, "unpaid_used": 0.0,
+}
+
+
+def leave_year(start_date: str) -> int:
+    """Balance year a leave is charged to: the year it starts in."""
+    try:
+        return int(format_to_db(start_date)[:4])
+    except (TypeError, ValueError):
+        return dt.date.today().year
+
+
+def approve_leave_requests(db: Session, leave_ids: List[str], user_id: str) -> dict:
+    """
+    Approve pending leave requests in one transaction, set-based:
+
+    - one UPDATE moves every still-Pending request to Approved and RETURNs
+      exactly the rows it changed, so a request approved concurrently is
+      never charged twice;
+    - missing (employee, year) balances are created with one
+      INSERT ... ON CONFLICT DO NOTHING;
+    - used days are applied per leave type with one executemany
+      UPDATE ... SET <type>_used = <type>_used + delta, grouped by
+      (employee, year), so concurrent approvals add up instead of
+      overwriting each other.
+    """
+    leave_ids = list(dict.fromkeys(leave_ids))
+    requests = models.DBLeaveRequest.__table__
+    balances = models.DBLeaveBalance.__table__
+
+    approved = []
+    if leave_ids:
+        approved = db.execute(
+            update(requests)
+            .where(requests.c.id.in_(leave_ids), requests.c.status == "Pending")
+            .values(status="Approved", updated_by=user_id, updated_at=func.now())
+            .returning(requests.c.id, requests.c.employee_id, requests.c.type, requests.c.days, requests.c.start_date)
+        ).all()
+
+    # (leave type, employee, year) -> days
+    deltas: Dict[tuple, float] = {}
+    for row in approved:
+        if row.type in LEAVE_USED_COLUMNS and row.days:
+            key = (row.type, row.employee_id, leave_year(row.start_date))
+            deltas[key] = deltas.get(key, 0.0) + row.days
+
+    if deltas:
+        insert = upsert_insert(db)
+        pairs = {(employee_id, year) for _, employee_id, year in deltas}
+        db.execute(
+            insert(balances)
+            .values([
+                {**DEFAULT_LEAVE_BALANCE, "employee_id": employee_id, "year": year, "created_by": "System"}
+                for employee_id, year in sorted(pairs)
+            ])
+            .on_conflict_do_nothing(index_elements=[balances.c.employee_id, balances.c.year])
+        )
+        for leave_type, column_name in LEAVE_USED_COLUMNS.items():
+            params = [
+                {"b_employee_id": employee_id, "b_year": year, "b_delta": days}
+                for (kind, employee_id, year), days in deltas.items() if kind == leave_type
+            ]
+            if not params:
+                continue
+            column = balances.c[column_name]
+            db.execute(
+                update(balances)
+                .where(balances.c.employee_id == bindparam("b_employee_id"), balances.c.year == bindparam("b_year"))
+                .values({column_name: func.coalesce(column, 0) + bindparam("b_delta"), "updated_by": user_id}),
+                params,
+            )
+    db.commit()
+
+    approved_ids = {row.id for row in approved}
+    skipped = []
+    leftover = [leave_id for leave_id in leave_ids if leave_id not in approved_ids]
+    if leftover:
+        statuses = dict(db.execute(select(requests.c.id, requests.c.status).where(requests.c.id.in_(leftover))).all())
+        skipped = [
+            {"id": leave_id, "reason": f"Already {statuses[leave_id]}" if leave_id in statuses else "Not found"}
+            for leave_id in leftover
+        ]
+    return {
+        "approved": [leave_id for leave_id in leave_ids if leave_id in approved_ids],
+        "skipped": skipped,
+        "balances_updated": len({(employee_id, year) for _, employee_id, year in deltas}),
+    }
+
+
 def get_leave_balances(db: Session, year: int = 2025):
-    balances = db.query(models.DBLeaveBalance).filter(models.DBLeaveBalance.year == year).all()
+    balances = (
+        db.query(models.DBLeaveBalance)
+        .options(joinedload(models.DBLeaveBalance.employee))
+        .filter(models.DBLeaveBalance.year == year)
+        .all()
+    )
     
     # Format for UI
     results = []
@@ -2,16 +2,21 @@
 import os
 import datetime
 from typing import Optional, List, Union
-import bcrypt
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import jwt  # Assumes PyJWT is installed as per main.py checks
 
-from backend.database import SessionLocal
+from backend.database import ReadSessionLocal, SessionLocal, get_async_db  # noqa: F401 (re-exported)
 from backend import schemas
+from backend.api_key_auth import API_KEY_PREFIX, resolve_api_key
 from backend.config import settings, auth_config
-from backend.permissions_config import DEFAULT_ROLE_PERMISSIONS
+from backend.password_hasher import password_hasher
+from backend.permission_matrix import get_permission_matrix
+from backend.principal_cache import principal_cache
+from backend.rate_limiter import principal_subject, rate_limiter
+from backend.versioning import ALL_SCOPE, make_etag, resource_versions
 
 # Logger
 import logging
@@ -26,30 +31,61 @@ from backend.permissions_config import SUPER_ROLES
 ORG_SETUP_ROLES = SUPER_ROLES | {"Business Admin"}  # Union with Business Admin
 
 # OAuth2 Scheme
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+# auto_error off: get_current_user falls back to the X-API-Key header
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 # Database Dependency
-def get_db():
-    db = SessionLocal()
+READ_METHODS = {"GET", "HEAD"}
+# GET endpoints that write anyway (e.g. create-a-default-on-first-read)
+_WRITES_ON_READ = set()
+# Non-GET endpoints that only read (e.g. the batch envelope)
+_READS_ON_WRITE = set()
+
+
+def writes_on_read(endpoint):
+    """Mark a GET endpoint that writes, so get_db hands it the writer session."""
+    _WRITES_ON_READ.add(endpoint)
+    return endpoint
+
+
+def reads_on_write(endpoint):
+    """Mark a POST endpoint that never writes, so get_db hands it a read session."""
+    _READS_ON_WRITE.add(endpoint)
+    return endpoint
+
+
+def get_db(request: Request = None):
+    """Read-only session for GET/HEAD routes, the serialized writer for everything else."""
+    factory = SessionLocal
+    if request is not None:
+        endpoint = getattr(request.scope.get("route"), "endpoint", None)
+        if request.method in READ_METHODS:
+            if endpoint not in _WRITES_ON_READ:
+                factory = ReadSessionLocal
+        elif endpoint in _READS_ON_WRITE:
+            factory = ReadSessionLocal
+    db = factory()
     try:
         yield db
     finally:
         db.close()
 
-# Password Utils
+async def get_writer_sessions():
+    """
+    Writer session factory for a read route that occasionally has to write.
+    Unlike `writes_on_read`, the single writer connection is only checked out
+    when the route actually opens a session. Async so resolving it never takes
+    a threadpool hop on the async read path.
+    """
+    return SessionLocal
+
+# Password Utils (blocking; async routes await password_hasher.verify / .hash)
 def verify_password(plain_password, hashed_password):
-    try:
-        if isinstance(hashed_password, str):
-            hashed_password = hashed_password.encode("utf-8")
-        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password)
-    except ValueError:
-        return False
+    return password_hasher.verify_sync(plain_password, hashed_password)
 
 def get_password_hash(password):
-    pwd_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(pwd_bytes, salt)
-    return hashed.decode("utf-8")
+    return password_hasher.hash_sync(password)
 
 # Token Utils
 def create_access_token(data: dict, expires_delta: Optional[datetime.timedelta] = None):
@@ -67,14 +103,44 @@ def create_access_token(data: dict, expires_delta: Optional[datetime.timedelta]
 
 # Current User Dependency
 def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    request: Request = None,
+    token: Optional[str] = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+    api_key: Optional[str] = Depends(api_key_header),
+    writer_sessions=Depends(get_writer_sessions),
 ):
+    # Sub-requests of POST /api/v1/batch reuse the principal resolved for the batch
+    if request is not None:
+        principal = request.scope.get("state", {}).get("principal")
+        if principal is not None:
+            return dict(principal)
+
+    # Integration partners send an API key, as X-API-Key or as the bearer token
+    # (isinstance: direct calls leave the Depends default in place)
+    if not token and isinstance(api_key, str):
+        token = api_key
+    if not token:
+        raise HTTPException(
+            status_code=401,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if token.startswith(API_KEY_PREFIX):
+        return get_api_key_principal(api_key=token, db=db, writer_sessions=writer_sessions)
+
     credentials_exception = HTTPException(
         status_code=401,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+    # Fast path: token already resolved by this worker
+    cached = principal_cache.get(token)
+    if cached is not None:
+        user_dict = cached[1]
+        rate_limiter.check(db, user_dict.get("organization_id"), principal_subject(user_dict))
+        return user_dict
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -101,8 +167,40 @@ def get_current_user(
         "avatar": f"https://ui-avatars.com/api/?name={user.username}&background=random",
         "employeeId": user.employee_id,
     }
+    principal_cache.put(token, payload, user_dict)
+    rate_limiter.check(db, user.organization_id, principal_subject(user_dict))
     return user_dict
 
+async def get_current_user_async(
+    request: Request = None,
+    token: Optional[str] = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+    api_key: Optional[str] = Depends(api_key_header),
+    writer_sessions=Depends(get_writer_sessions),
+):
+    """
+    get_current_user for `async def` routes. The same resolution runs through
+    `run_sync` on the request's (read-only) AsyncSession, so authenticating
+    does not take a threadpool worker (or a second connection) on the async
+    read path; the rare API-key `last_used` write goes to `writer_sessions`.
+    """
+    return await db.run_sync(
+        lambda session: get_current_user(request, token, session, api_key, writer_sessions)
+    )
+
+def get_api_key_principal(
+    api_key: Optional[str] = Depends(api_key_header),
+    db: Session = Depends(get_db),
+    writer_sessions=Depends(get_writer_sessions),
+):
+    """Principal for an integration API key (`X-API-Key` header)."""
+    if not api_key:
+        raise HTTPException(status_code=401, detail="Missing API key")
+    from backend import crud
+    principal = resolve_api_key(db, crud._hash_key(api_key), writer_sessions)
+    rate_limiter.check(db, principal.get("organization_id"), principal_subject(principal))
+    return principal
+
 def get_user_org(user: dict) -> str:
     """Helper to get organization ID from current user"""
     if "organization_id" in user:
@@ -146,26 +244,77 @@ def requires_role(*allowed_roles):
 def check_permission(permission: str):
     def permission_checker(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
         user_role = current_user.get("role", "")
-        
-        # 1. Super Admin / Root Bypass - Always has all permissions
-        if user_role in SUPER_ROLES:
+
+        # Compiled matrix: super roles, wildcard grants, DB grants and defaults
+        # are all resolved in memory. The DB is only touched when the shared
+        # permissions version is due for a refresh.
+        if get_permission_matrix(db).allows(user_role, permission):
             return current_user
-            
-        # 2. Check DB Permissions
-        from backend import crud
-        role_perms = crud.get_role_permissions(db, user_role)
-        
-        # 3. Fallback to Default Permissions if DB is empty
-        if not role_perms:
-            role_perms = DEFAULT_ROLE_PERMISSIONS.get(user_role, [])
-        
-        # 4. Check if permission exists in role permissions
-        # Wildcard permission grants all access
-        if '*' in role_perms or permission in role_perms:
+
+        raise HTTPException(
+            status_code=403,
+            detail=f"Access Forbidden: Role '{user_role}' lacks permission '{permission}'",
+        )
+    return permission_checker
+
+def check_permission_async(permission: str):
+    """check_permission for `async def` routes, on the request's AsyncSession."""
+    async def permission_checker(db: AsyncSession = Depends(get_async_db), current_user: dict = Depends(get_current_user_async)):
+        user_role = current_user.get("role", "")
+        matrix = await db.run_sync(get_permission_matrix)
+        if matrix.allows(user_role, permission):
             return current_user
-            
+
         raise HTTPException(
             status_code=403,
             detail=f"Access Forbidden: Role '{user_role}' lacks permission '{permission}'",
         )
     return permission_checker
+
+# Conditional GET
+def conditional_get(resource: str, org_scoped: bool = False):
+    """
+    ETag dependency for rarely-changing reference listings. The ETag is derived
+    from the (scope, resource) version counter that crud bumps on every write,
+    so a matching If-None-Match returns 304 before the endpoint body runs.
+    `org_scoped` listings are keyed by the caller's organization.
+    """
+    def unscoped(request: Request, response: Response, db: Session = Depends(get_db)):
+        return check_etag(request, response, db, ALL_SCOPE, resource)
+
+    def scoped(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        current_user: dict = Depends(get_current_user),
+    ):
+        return check_etag(request, response, db, get_user_org(current_user) or ALL_SCOPE, resource)
+
+    return scoped if org_scoped else unscoped
+
+
+def conditional_get_async(resource: str, org_scoped: bool = False):
+    """conditional_get for `async def` routes, on the request's AsyncSession."""
+    async def unscoped(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+        return await db.run_sync(lambda session: check_etag(request, response, session, ALL_SCOPE, resource))
+
+    async def scoped(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: dict = Depends(get_current_user_async),
+    ):
+        scope = get_user_org(current_user) or ALL_SCOPE
+        return await db.run_sync(lambda session: check_etag(request, response, session, scope, resource))
+
+    return scoped if org_scoped else unscoped
+
+
+def check_etag(request: Request, response: Response, db: Session, scope: str, resource: str) -> str:
+    """Raise 304 if If-None-Match holds the current (scope, resource) ETag, else set it on `response`."""
+    etag = make_etag(scope, resource, resource_versions.get(db, scope, resource))
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return etag
@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Boolean, Column, DateTime, Float, ForeignKey, Integer, String
+    Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -165,6 +165,9 @@ class DBSubDepartment(Base, PrismaAuditMixin):
 
 class DBAuditLog(Base):
     __tablename__ = "core_audit_logs"
+    __table_args__ = (
+        Index("idx_core_audit_logs_time_id", "time", "id"),  # keyset: sort=time
+    )
 
     id = Column(String, primary_key=True, index=True)
     organization_id = Column(
@@ -176,9 +179,64 @@ class DBAuditLog(Base):
     time = Column(String)
 
 
+class DBRolePermission(Base):
+    """Role -> permission grant (one row per permission)."""
+    __tablename__ = "role_permissions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    role = Column(String, index=True, nullable=False)
+    permission = Column(String, nullable=False)
+
+
+class DBResourceVersion(Base):
+    """Monotonic change counter per (scope, resource), shared by all workers."""
+    __tablename__ = "core_resource_versions"
+
+    scope = Column(String, primary_key=True)  # organization id, or "system"
+    resource = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class DBSchemaState(Base):
+    """Fingerprint of the model metadata the schema was last created from."""
+    __tablename__ = "core_schema_state"
+
+    id = Column(String, primary_key=True)  # "metadata"
+    fingerprint = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class DBLease(Base):
+    """Named leadership lease; the holder renews it before expires_at or loses it."""
+    __tablename__ = "core_leases"
+
+    name = Column(String, primary_key=True)  # e.g. "audit-scheduler"
+    holder = Column(String, nullable=False)  # host:pid:nonce of the leader
+    term = Column(Integer, nullable=False, default=1)  # +1 on every change of holder
+    acquired_at = Column(DateTime, nullable=False)
+    renewed_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
+class DBIdSequence(Base):
+    """Id counter per (organization, plant, entity); processes reserve blocks from it."""
+    __tablename__ = "core_id_sequences"
+
+    organization_id = Column(String, primary_key=True)  # "" for global counters
+    plant_id = Column(String, primary_key=True)  # "" when not plant-scoped
+    entity = Column(String, primary_key=True)  # e.g. "leave_request"
+    last_value = Column(Integer, nullable=False, default=0)  # highest value reserved so far
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
 class DBApiKey(Base, PrismaAuditMixin):
     """API key for external integrations."""
     __tablename__ = "core_api_keys"
+    __table_args__ = (
+        # API-key authentication looks keys up by hash
+        Index("uq_core_api_keys_key_hash", "key_hash", unique=True),
+    )
 
     id = Column(String, primary_key=True, index=True)
     organization_id = Column(
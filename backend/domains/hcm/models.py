@@ -1,4 +1,4 @@
-from sqlalchemy import (Boolean, Column, DateTime, Float, ForeignKey, Integer, String)
+from sqlalchemy import (Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.database import Base
@@ -12,6 +12,9 @@ class AuditMixin:
 
 class DBEmployee(Base, PrismaAuditMixin):
     __tablename__ = "hcm_employees"
+    __table_args__ = (
+        Index("idx_hcm_employees_name_id", "name", "id"),  # keyset: sort=name
+    )
 
     id = Column(String, primary_key=True, index=True)
     employee_code = Column(String)
@@ -219,6 +222,11 @@ class DBIncrement(Base, AuditMixin):
 
 class DBAttendance(Base, AuditMixin):
     __tablename__ = "hcm_attendance"
+    __table_args__ = (
+        Index("idx_hcm_attendance_date_id", "date", "id"),  # keyset: sort=date
+        # One row per employee-day; target of the punch ingest upsert
+        Index("uq_hcm_attendance_employee_date", "employee_id", "date", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(String, ForeignKey("hcm_employees.id"), nullable=False, index=True)
@@ -234,6 +242,9 @@ class DBAttendance(Base, AuditMixin):
 
 class DBPayrollLedger(Base, AuditMixin):
     __tablename__ = "hcm_payroll_ledger"
+    __table_args__ = (
+        Index("idx_hcm_payroll_ledger_employee_id_id", "employee_id", "id"),  # keyset: sort=employee_id
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(String, ForeignKey("hcm_employees.id"), nullable=False)
@@ -256,6 +267,10 @@ class DBPayrollLedger(Base, AuditMixin):
 
 class DBLeaveBalance(Base, AuditMixin):
     __tablename__ = "hcm_leave_balances"
+    __table_args__ = (
+        # One balance per employee-year; target of the batch approval upsert
+        Index("uq_hcm_leave_balances_employee_year", "employee_id", "year", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(String, ForeignKey("hcm_employees.id"), nullable=False, index=True)
@@ -277,6 +292,9 @@ class DBLeaveBalance(Base, AuditMixin):
 
 class DBLeaveRequest(Base, AuditMixin):
     __tablename__ = "hcm_leave_requests"
+    __table_args__ = (
+        Index("idx_hcm_leave_requests_start_date_id", "start_date", "id"),  # keyset: sort=start_date
+    )
     
     id = Column(String, primary_key=True, index=True) # LR-123
     employee_id = Column(String, ForeignKey("hcm_employees.id"), nullable=False, index=True)
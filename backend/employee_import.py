@@ -0,0 +1,329 @@
+"""
+Bulk Employee Import
+====================
+Loads CSV or JSONL files of `EmployeeCreate` payloads in chunks.
+
+- Records are parsed and validated one at a time while streaming the file;
+  a bad row is reported and skipped, it never aborts the import.
+- Department / designation / grade / plant / shift references may be given
+  as ids or as codes (`departmentCode`, `designationCode`, ...). Both are
+  resolved against lookup maps loaded once per organization.
+- Each chunk is written with one executemany INSERT per table
+  (hcm_employees plus the five child tables) inside a single transaction.
+  If a chunk hits a constraint error it is replayed row by row under
+  savepoints so only the offending rows are rejected.
+
+CSV columns are the EmployeeCreate field names (camelCase aliases or
+snake_case); the child lists (education, experience, family, discipline,
+increments) go in as JSON-encoded cells.
+
+CLI:
+    python -m backend.employee_import employees.jsonl --organization ORG-001
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend import crud, schemas
+from backend.domains.core.models import DBDepartment, DBHRPlant
+from backend.domains.hcm.models import DBDesignation, DBEmployee, DBGrade, DBShift
+from backend.sequences import id_sequences
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+CHILD_FIELDS = ("education", "experience", "family", "discipline", "increments")
+
+# reference kind -> (model, id field on EmployeeCreate, code key in the record)
+REFERENCES = {
+    "department": (DBDepartment, "department_id", "departmentCode"),
+    "designation": (DBDesignation, "designation_id", "designationCode"),
+    "grade": (DBGrade, "grade_id", "gradeCode"),
+    "plant": (DBHRPlant, "plant_id", "plantCode"),
+    "shift": (DBShift, "shift_id", "shiftCode"),
+}
+
+
+class RowError(ValueError):
+    """A record that cannot be imported; reported, never raised to the caller."""
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    chunks: int = 0
+    errors: List[dict] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str, employee_id: Optional[str] = None):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "id": employee_id, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "imported": self.imported,
+            "failed": self.failed,
+            "chunks": self.chunks,
+            "errors": self.errors,
+            "errorsTruncated": self.failed > len(self.errors),
+        }
+
+
+# --- Parsing ---
+
+def iter_records(stream: Iterable[str], fmt: str) -> Iterator[Tuple[int, dict]]:
+    """Yield (line number, raw record) from a CSV or JSONL text stream."""
+    if fmt == "jsonl":
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, {"__error__": f"Invalid JSON: {e}"}
+    elif fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            record = {k: v for k, v in record.items() if k and v not in (None, "")}
+            for child in CHILD_FIELDS:
+                if isinstance(record.get(child), str):
+                    try:
+                        record[child] = json.loads(record[child])
+                    except json.JSONDecodeError:
+                        record = {"__error__": f"Column '{child}' is not valid JSON"}
+                        break
+            # line_num is the physical line of the record's last line
+            yield reader.line_num, record
+    else:
+        raise ValueError(f"Unsupported import format '{fmt}'")
+
+
+def detect_format(filename: str) -> str:
+    return "csv" if filename.lower().endswith(".csv") else "jsonl"
+
+
+# --- Reference lookups ---
+
+class ReferenceMaps:
+    """code -> id and id sets for the org-setup tables, loaded once per import."""
+
+    def __init__(self, db: Session, organization_id: Optional[str] = None):
+        self.by_code: Dict[str, Dict[str, str]] = {}
+        self.ids: Dict[str, set] = {}
+        for kind, (model, _, _) in REFERENCES.items():
+            stmt = select(model.id, model.code)
+            if organization_id:
+                stmt = stmt.where(
+                    or_(model.organization_id == organization_id, model.organization_id.is_(None))
+                )
+            rows = db.execute(stmt).all()
+            self.ids[kind] = {row.id for row in rows}
+            self.by_code[kind] = {row.code.upper(): row.id for row in rows if row.code}
+
+    def resolve(self, record: dict):
+        """Replace *Code keys by ids in place and verify given ids exist."""
+        for kind, (_, id_field, code_key) in REFERENCES.items():
+            code = record.pop(code_key, None)
+            if code:
+                ref_id = self.by_code[kind].get(str(code).upper())
+                if ref_id is None:
+                    raise RowError(f"Unknown {kind} code '{code}'")
+                record[id_field] = ref_id
+            elif record.get(id_field):
+                if record[id_field] not in self.ids[kind]:
+                    raise RowError(f"Unknown {kind} id '{record[id_field]}'")
+            else:
+                record.pop(id_field, None)
+
+
+# --- Import ---
+
+def _prepare(db: Session, record: dict, refs: ReferenceMaps, organization_id: Optional[str], seen: set):
+    """Validate one raw record into (employee id, employee row, child rows)."""
+    if "__error__" in record:
+        raise RowError(record["__error__"])
+    if organization_id:
+        record.setdefault("organizationId", organization_id)
+    refs.resolve(record)
+    try:
+        employee = schemas.EmployeeCreate.model_validate(record)
+    except ValidationError as e:
+        first = e.errors()[0]
+        raise RowError(f"{'.'.join(str(p) for p in first['loc'])}: {first['msg']}")
+
+    # Drawn from the in-memory block; one counter round trip per ID_BLOCK_SIZE rows
+    employee_id = employee.id or id_sequences.next_id(db, "employee", employee.organization_id, employee.plant_id)
+    for key in (("id", employee_id), ("email", employee.email.lower())):
+        if key in seen:
+            raise RowError(f"Duplicate {key[0]} '{key[1]}' in this file")
+    seen.update({("id", employee_id), ("email", employee.email.lower())})
+    return employee_id, employee
+
+
+def _existing_conflicts(db: Session, batch) -> Dict[str, str]:
+    """Map employee id -> reason for rows whose id or email is already stored."""
+    ids = [employee_id for _, employee_id, _ in batch]
+    emails = [employee.email for _, _, employee in batch]
+    taken_ids, taken_emails = set(), set()
+    for row in db.execute(
+        select(DBEmployee.id, DBEmployee.email).where(
+            or_(DBEmployee.id.in_(ids), DBEmployee.email.in_(emails))
+        )
+    ):
+        taken_ids.add(row.id)
+        taken_emails.add(row.email)
+    conflicts = {}
+    for _, employee_id, employee in batch:
+        if employee_id in taken_ids:
+            conflicts[employee_id] = f"Employee id '{employee_id}' already exists"
+        elif employee.email in taken_emails:
+            conflicts[employee_id] = f"Email '{employee.email}' already exists"
+    return conflicts
+
+
+def _insert_rows(db: Session, rows: List[Tuple[dict, dict]]):
+    """One executemany per table for a list of (employee row, child rows)."""
+    db.execute(insert(DBEmployee), [employee for employee, _ in rows])
+    children: Dict[object, List[dict]] = {}
+    for _, child_rows in rows:
+        for model, values in child_rows.items():
+            children.setdefault(model, []).extend(values)
+    for model, values in children.items():
+        if values:
+            db.execute(insert(model), values)
+
+
+def _write_chunk(db: Session, batch, user_id: str, report: ImportReport):
+    # Make the chunk's id reservations durable first: the row-by-row replay
+    # below rolls back, and ids must not outlive the counter update
+    db.commit()
+    conflicts = _existing_conflicts(db, batch)
+    for line, employee_id, _ in batch:
+        if employee_id in conflicts:
+            report.add_error(line, conflicts[employee_id], employee_id)
+    batch = [item for item in batch if item[1] not in conflicts]
+
+    built = []
+    for line, employee_id, employee in batch:
+        try:
+            built.append((line, employee_id, (
+                crud.employee_row(employee, employee_id, user_id),
+                crud.employee_child_rows(employee, employee_id, user_id),
+            )))
+        except ValueError as e:  # e.g. unparseable join date
+            report.add_error(line, str(e), employee_id)
+
+    if not built:
+        return
+    try:
+        _insert_rows(db, [rows for _, _, rows in built])
+        db.commit()
+        report.imported += len(built)
+    except IntegrityError:
+        # Isolate the offending rows; the rest of the chunk still lands
+        db.rollback()
+        for line, employee_id, rows in built:
+            savepoint = db.begin_nested()
+            try:
+                _insert_rows(db, [rows])
+                savepoint.commit()
+                report.imported += 1
+            except IntegrityError as e:
+                savepoint.rollback()
+                report.add_error(line, f"Constraint violation: {e.orig}", employee_id)
+        db.commit()
+
+
+def import_employees(
+    db: Session,
+    records: Iterable[Tuple[int, dict]],
+    user_id: str,
+    organization_id: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Callable[[ImportReport], None]] = None,
+) -> ImportReport:
+    """Validate and insert records chunk by chunk; returns the final report."""
+    report = ImportReport()
+    refs = ReferenceMaps(db, organization_id)
+    seen: set = set()
+    batch = []
+
+    def flush():
+        _write_chunk(db, batch, user_id, report)
+        report.chunks += 1
+        batch.clear()
+        if progress:
+            progress(report)
+
+    for line, record in records:
+        report.total += 1
+        try:
+            employee_id, employee = _prepare(db, record, refs, organization_id, seen)
+        except RowError as e:
+            report.add_error(line, str(e), record.get("id") if isinstance(record, dict) else None)
+            continue
+        batch.append((line, employee_id, employee))
+        if len(batch) >= chunk_size:
+            flush()
+    if batch:
+        flush()
+    return report
+
+
+def import_file(db: Session, fileobj, filename: str, user_id: str, **kwargs) -> ImportReport:
+    """Import from a binary file object (an upload or an opened path)."""
+    fmt = kwargs.pop("fmt", None) or detect_format(filename)
+    stream = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        return import_employees(db, iter_records(stream, fmt), user_id, **kwargs)
+    finally:
+        stream.detach()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import employees from CSV or JSONL.")
+    parser.add_argument("path", help="CSV or JSONL file of EmployeeCreate records")
+    parser.add_argument("--organization", help="organizationId for records that omit it")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: by file extension")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--user", default="bulk-import", help="created_by / updated_by value")
+    args = parser.parse_args(argv)
+
+    from backend.database import SessionLocal
+
+    def show(report: ImportReport):
+        print(f"chunk {report.chunks}: {report.imported} imported, {report.failed} failed "
+              f"({report.total} read)", flush=True)
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as fh:
+            report = import_file(
+                db, fh, args.path, args.user, fmt=args.format,
+                organization_id=args.organization, chunk_size=args.chunk_size, progress=show,
+            )
+    finally:
+        db.close()
+
+    for error in report.errors:
+        print(f"line {error['line']}: {error['error']}")
+    print(json.dumps({k: v for k, v in report.as_dict().items() if k != "errors"}))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
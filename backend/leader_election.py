@@ -0,0 +1,233 @@
+"""
+Leader Election
+===============
+Lease-based leader election across API workers and nodes, so in-process
+schedulers run in exactly one process.
+
+- One row per lease in `core_leases`. Acquiring or renewing is a single
+  conditional upsert: it succeeds only if the row is absent, already ours,
+  or expired. The database serializes competing workers.
+- The leader renews every `heartbeat_seconds`; everyone else retries on the
+  same beat. A leader that dies stops renewing, and a standby takes over
+  within `ttl_seconds + heartbeat_seconds`. `term` is incremented on every
+  change of holder.
+- Heartbeats use their own database connection (`dedicated_sessions`) and
+  give up after `(ttl - heartbeat) / 4` by default, so a renewal never
+  queues behind application writes on the single writer connection.
+- A leader that cannot renew (database unreachable or locked) steps down on
+  its own once its lease would have expired, before anyone else can take
+  over: a timer fires at the end of every renewed lease and demotes the
+  process unless a later renewal has moved the deadline, even while a
+  heartbeat is still blocked in the database.
+- `stop()` releases the lease, so a graceful shutdown hands over on the
+  next heartbeat instead of after the TTL.
+"""
+
+import datetime
+import logging
+import os
+import socket
+import threading
+import uuid
+from typing import Callable, Optional
+
+from sqlalchemy import case, or_, select, update
+
+from backend.database import dedicated_sessions, upsert_insert
+from backend.domains.core.models import DBLease
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.utcnow()
+
+
+def default_holder_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderLease:
+    """Holds (or waits for) one named lease, calling back on election and demotion."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float = 30.0,
+        heartbeat_seconds: float = 10.0,
+        on_elected: Optional[Callable[[], None]] = None,
+        on_demoted: Optional[Callable[[], None]] = None,
+        session_factory=None,
+        holder_id: Optional[str] = None,
+        clock: Callable[[], datetime.datetime] = _utcnow,
+        db_timeout_seconds: Optional[float] = None,
+    ):
+        if heartbeat_seconds >= ttl_seconds:
+            raise ValueError("heartbeat_seconds must be shorter than ttl_seconds")
+        if db_timeout_seconds is None:
+            db_timeout_seconds = (ttl_seconds - heartbeat_seconds) / 4
+        if db_timeout_seconds >= ttl_seconds - heartbeat_seconds:
+            raise ValueError("db_timeout_seconds must be shorter than ttl_seconds - heartbeat_seconds")
+        self.name = name
+        self.ttl = datetime.timedelta(seconds=ttl_seconds)
+        self.heartbeat_seconds = heartbeat_seconds
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.session_factory = session_factory or dedicated_sessions(db_timeout_seconds)
+        self.holder_id = holder_id or default_holder_id()
+        self.clock = clock
+        self.is_leader = False
+        self.term: Optional[int] = None
+        self._valid_until: Optional[datetime.datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._expiry: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    # --- lease operations ---
+
+    def try_acquire(self) -> bool:
+        """Acquire or renew the lease; True if this process holds it afterwards."""
+        now = self.clock()
+        table = DBLease.__table__
+        with self.session_factory() as db:
+            insert = upsert_insert(db)
+            stmt = insert(table).values(
+                name=self.name, holder=self.holder_id, term=1,
+                acquired_at=now, renewed_at=now, expires_at=now + self.ttl,
+            )
+            same_holder = table.c.holder == stmt.excluded.holder
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.name],
+                set_={
+                    "holder": stmt.excluded.holder,
+                    "term": case((same_holder, table.c.term), else_=table.c.term + 1),
+                    "acquired_at": case((same_holder, table.c.acquired_at), else_=stmt.excluded.acquired_at),
+                    "renewed_at": stmt.excluded.renewed_at,
+                    "expires_at": stmt.excluded.expires_at,
+                },
+                where=or_(same_holder, table.c.expires_at <= now),
+            )
+            db.execute(stmt)
+            row = db.execute(select(table.c.holder, table.c.term).where(table.c.name == self.name)).one()
+            db.commit()
+        held = row.holder == self.holder_id
+        if held:
+            self.term = row.term
+            self._valid_until = now + self.ttl
+        return held
+
+    def release(self):
+        """Expire our lease now (no-op if someone else holds it)."""
+        table = DBLease.__table__
+        with self.session_factory() as db:
+            db.execute(
+                update(table)
+                .where(table.c.name == self.name, table.c.holder == self.holder_id)
+                .values(expires_at=self.clock())
+            )
+            db.commit()
+
+    # --- heartbeat loop ---
+
+    def tick(self) -> bool:
+        """One heartbeat: renew or contend, and fire the transition callbacks."""
+        # The database call stays outside the lock, so the expiry timer can
+        # demote while a renewal is still blocked
+        try:
+            held = self.try_acquire()
+            failed = False
+        except Exception as e:
+            logger.warning(f"Lease '{self.name}' heartbeat failed: {e}")
+            held, failed = False, True
+        with self._lock:
+            if failed:
+                # Keep leading only while the lease we last wrote is still valid
+                held = self.is_leader and self._lease_valid()
+            if held and not self.is_leader:
+                self.is_leader = True
+                logger.info(f"Lease '{self.name}': {self.holder_id} elected (term {self.term})")
+                self._fire(self.on_elected)
+            elif not held and self.is_leader:
+                self._demote("lost leadership")
+            if self.is_leader and not failed:
+                self._arm_expiry()
+            return held
+
+    def _lease_valid(self) -> bool:
+        return self._valid_until is not None and self.clock() < self._valid_until
+
+    def _demote(self, reason: str):
+        self.is_leader = False
+        self._cancel_expiry()
+        logger.warning(f"Lease '{self.name}': {self.holder_id} {reason}")
+        self._fire(self.on_demoted)
+
+    def _arm_expiry(self):
+        """(Re)start the timer that demotes this process when the lease runs out."""
+        self._cancel_expiry()
+        delay = (self._valid_until - self.clock()).total_seconds()
+        self._expiry = threading.Timer(max(delay, 0.0), self._expire)
+        self._expiry.daemon = True
+        self._expiry.start()
+
+    def _cancel_expiry(self):
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+
+    def _expire(self):
+        with self._lock:
+            if not self.is_leader:
+                return
+            if self._lease_valid():
+                # Renewed in the meantime (or the timer ran early): wait for the new deadline
+                self._arm_expiry()
+                return
+            self._demote("lease expired before it could be renewed")
+
+    def _fire(self, callback):
+        if callback is None:
+            return
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Lease '{self.name}' callback failed: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.heartbeat_seconds):
+            self.tick()
+
+    def start(self) -> bool:
+        """Contend once right away, then keep heartbeating in a daemon thread. Returns is_leader."""
+        if self._thread is not None and self._thread.is_alive():
+            return self.is_leader
+        self._stop.clear()
+        self.tick()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{self.name}", daemon=True)
+        self._thread.start()
+        return self.is_leader
+
+    def stop(self):
+        """Stop heartbeating and hand the lease over."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.heartbeat_seconds)
+            self._thread = None
+        with self._lock:
+            self._cancel_expiry()
+            if self.is_leader:
+                self.is_leader = False
+                self._fire(self.on_demoted)
+                try:
+                    self.release()
+                except Exception as e:
+                    logger.warning(f"Lease '{self.name}' release failed: {e}")
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "holder": self.holder_id,
+            "isLeader": self.is_leader,
+            "term": self.term,
+        }
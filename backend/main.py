@@ -1,40 +1,74 @@
 import datetime
-import importlib
 import logging
 import os
 import shutil
+import sys
 import time
 import traceback
 import uuid
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import Depends, FastAPI, File, HTTPException, Request, UploadFile, Body
+IMPORTS_STARTED = time.perf_counter()
+
+from fastapi import Depends, FastAPI, File, HTTPException, Request, Response, UploadFile, Body
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
-from sqlalchemy import text
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 # Internal Imports
-from backend.audit.scheduler import start_scheduler
-from backend.config import auth_config, settings
-from backend.database import engine
+from backend.api_key_auth import api_key_cache, last_used_buffer
+from backend.batch import run_batch
+from backend.bootstrap_snapshot import bootstrap_snapshots
+from backend.config import auth_config, settings, system_config
+from backend.permissions_config import SUPER_ROLES
+from backend.database import IS_FILE_SQLITE, SessionLocal, engine, read_engine
 from backend.dependencies import (
+    check_etag,
     check_permission,
+    check_permission_async,
+    conditional_get,
+    conditional_get_async,
     create_access_token,
+    get_async_db,
     get_current_user,
+    get_current_user_async,
     get_db,
     get_user_org,
+    get_writer_sessions,
     log_audit_event,
+    reads_on_write,
     requires_role,
-    verify_password,
+    writes_on_read,
+)
+from backend.employee_import import DEFAULT_CHUNK_SIZE, import_file
+from backend.exports import export_response
+from backend.metrics import MetricsMiddleware, request_metrics
+from backend.model_registry import models
+from backend.pagination import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    estimate_total,
+    resolve_order,
+    set_page_headers,
 )
-from backend.domains.core import models as core_models
-from backend.domains.hcm import models as hcm_models
+from backend.permission_matrix import reload_permission_matrix
+from backend.password_hasher import password_hasher
+from backend.principal_cache import principal_cache
+from backend.rate_limiter import principal_subject, rate_limiter
+from backend.query_stats import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, QueryStatsMiddleware
+from backend.serialization import fast_response, serializer_for
+from backend.startup import DeferredStartMiddleware, ensure_schema, startup_profiler
 from backend import crud, schemas
 
+startup_profiler.record("imports", IMPORTS_STARTED)
+
 # Configure Logging
 log_file_path = os.path.join(os.path.dirname(__file__), "people_os.log")
 logging.basicConfig(
@@ -47,19 +81,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Proxy to maintain 'models.DB...' compatibility during refactor
-class ModelsProxy:
-    def __getattr__(self, name):
-        for module in ["backend.domains.core.models", "backend.domains.hcm.models"]:
-            try:
-                mod = importlib.import_module(module)
-                if hasattr(mod, name):
-                    return getattr(mod, name)
-            except ImportError:
-                continue
-        raise AttributeError(f"Model {name} not found")
-
-models = ModelsProxy()
 
 # API Metadata
 app = FastAPI(
@@ -74,7 +95,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, "ETag", QUERY_COUNT_HEADER, QUERY_TIME_HEADER],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(DeferredStartMiddleware, profiler=startup_profiler)
+# Added last so it wraps everything else, CORS preflights included
+app.add_middleware(MetricsMiddleware)
 
 UPLOAD_DIR = settings.UPLOAD_DIR
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -86,25 +112,87 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 @app.on_event("startup")
 async def startup_event():
-    """Main application startup sequence"""
+    """Main application startup sequence (phases timed in /system/startup-report)"""
+    fast = system_config.FAST_START
+    startup_profiler.begin("fast" if fast else "standard")
     logger.info("Starting Application Lifecycle...")
     try:
-        from backend.security.db_enforcer import enforce_clean_db_state
-        logger.info("Verifying Database Configuration...")
-        enforce_clean_db_state()
+        with startup_profiler.phase("db_enforcer") as phase:
+            from backend.security.db_enforcer import enforce_clean_db_state
+            logger.info("Verifying Database Configuration...")
+            enforce_clean_db_state(fast=fast)
+            phase["detail"] = "targeted" if fast else "tree walk"
     except Exception as e:
         logger.warning(f"DB Enforcement skipped or failed: {e}")
-    
-    core_models.Base.metadata.create_all(bind=engine)
-    hcm_models.Base.metadata.create_all(bind=engine)
-    
+
+    # Core and HCM models share one Base, so one create_all covers both
+    with startup_profiler.phase("schema") as phase:
+        phase["detail"] = ensure_schema(engine, models.Base.metadata, fast=fast)
+
+    # Compile the RBAC matrix up front so the first request doesn't pay for it
+    with startup_profiler.phase("permission_matrix"):
+        db = SessionLocal()
+        try:
+            reload_permission_matrix(db)
+        except Exception as e:
+            logger.warning(f"Permission matrix preload skipped: {e}")
+        finally:
+            db.close()
+
+    def _start_scheduler():
+        try:
+            # Imported here: apscheduler and the audit engine stay off the import path
+            from backend.audit.scheduler import start_scheduler
+            role = start_scheduler()
+            logger.info(f"Audit Scheduler election joined as {role}.")
+            return role
+        except Exception as e:
+            logger.error(f"Failed to start Audit Scheduler: {e}")
+            return "failed"
+
+    if fast:
+        startup_profiler.defer("scheduler", _start_scheduler)
+    else:
+        with startup_profiler.phase("scheduler") as phase:
+            phase["detail"] = _start_scheduler()
+
+    logger.info("Application Startup Sequence Complete.")
+
+@app.on_event("shutdown")
+def shutdown_event():
+    # Hand the scheduler lease over now rather than after its TTL (the module
+    # is only loaded if startup got as far as joining the election)
+    if "backend.audit.scheduler" in sys.modules:
+        sys.modules["backend.audit.scheduler"].stop_scheduler()
+
+    # Write out API-key last_used timestamps still in the write-behind buffer
+    db = SessionLocal()
     try:
-        start_scheduler()
-        logger.info("Audit Scheduler started successfully.")
+        last_used_buffer.flush(db)
     except Exception as e:
-        logger.error(f"Failed to start Audit Scheduler: {e}")
-        
-    logger.info("Application Startup Sequence Complete.")
+        logger.warning(f"API key last_used flush skipped: {e}")
+    finally:
+        db.close()
+    # Closing the pooled connections runs PRAGMA optimize on the SQLite writer
+    # (an in-memory database would be discarded, so those are left open)
+    if IS_FILE_SQLITE:
+        read_engine.dispose()
+        engine.dispose()
+
+@app.post("/api/v1/batch", tags=["System"])
+@reads_on_write  # authentication only reads; never hold the writer for the whole batch
+async def batch_requests(payload: schemas.BatchRequest, request: Request, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    """Serve several GETs in one round-trip; see backend/batch.py."""
+    count = len(payload.requests)
+    if count > system_config.BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"At most {system_config.BATCH_MAX_REQUESTS} requests per batch")
+    # get_current_user charged one request; the sub-requests skip authentication
+    if count > 1:
+        rate_limiter.check(None, current_user.get("organization_id"), principal_subject(current_user), cost=count - 1)
+    # The sub-requests open their own sessions; return the auth session's connection first
+    db.close()
+    body = await run_batch(app, request.scope, payload.requests, current_user, system_config.BATCH_MAX_CONCURRENCY)
+    return Response(content=body, media_type="application/json")
 
 # =================================================================
 # II. CORE: IDENTITY & ACCESS CONTROL
@@ -120,11 +208,24 @@ def save_permissions(payload: schemas.RolePermissionCreate, db: Session = Depend
 
 @app.post("/api/v1/auth/login", tags=["Authentication"])
 @limiter.limit(auth_config.LOGIN_RATE_LIMIT)
-def login(login_data: schemas.LoginRequest, request: Request, db: Session = Depends(get_db)):
-    user = db.query(models.DBUser).filter(models.DBUser.username == login_data.username).first()
-    if not user or not verify_password(login_data.password, user.password_hash):
+async def login(login_data: schemas.LoginRequest, request: Request, db: AsyncSession = Depends(get_async_db), writer_sessions=Depends(get_writer_sessions)):
+    # bcrypt runs on the bounded password pool (429 when its queue is full),
+    # not on the threadpool that serves the rest of the API
+    result = await db.execute(select(models.DBUser).where(models.DBUser.username == login_data.username))
+    user = result.scalars().first()
+    if not user or not await password_hasher.verify(login_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    
+
+    if password_hasher.needs_rehash(user.password_hash):
+        # The async session is read-only; the upgrade queues on the single writer
+        new_hash = await password_hasher.hash(login_data.password)
+
+        def store_hash():
+            with writer_sessions() as writer:
+                crud.set_password_hash(writer, user.id, new_hash)
+
+        await run_in_threadpool(store_hash)
+
     access_token = create_access_token(data={"sub": user.username, "role": user.role, "organization_id": user.organization_id})
     return {
         "access_token": access_token,
@@ -160,85 +261,108 @@ def update_user(user_id: str, user: schemas.UserUpdate, db: Session = Depends(ge
 # III. CORE: ORGANIZATION SETUP
 # =================================================================
 
+# Hot read endpoints take the AsyncSession and drive the existing sync crud
+# readers through `run_sync`: the queries run on the aiosqlite / asyncpg
+# connection instead of holding one of the threadpool's workers.
+
 @app.get("/api/v1/organizations", response_model=List[schemas.OrganizationList], tags=["Organizations"])
-def get_organizations(db: Session = Depends(get_db)):
-    return crud.get_organizations(db)
+async def get_organizations(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_organizations)
 
 @app.put("/api/v1/organizations/{org_id}", response_model=schemas.Organization, tags=["Organizations"])
 def update_organization(org_id: str, org: schemas.OrganizationCreate, db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin", "Business Admin"))):
     return crud.update_organization(db, org_id, org, user_id=current_user["id"])
 
-@app.get("/api/v1/plants", response_model=List[schemas.Plant], tags=["Organizations"])
-def get_plants(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return crud.get_plants(db, organization_id=current_user.get("organization_id"))
+@app.get("/api/v1/organizations/{org_id}/bootstrap", tags=["Organizations"])
+def get_organization_bootstrap(org_id: str, request: Request, db: Session = Depends(get_db), writer_sessions=Depends(get_writer_sessions), current_user: dict = Depends(get_current_user)):
+    """Everything the front-end loads at cold start, as one cached, pre-serialized document."""
+    if current_user.get("role") not in SUPER_ROLES and get_user_org(current_user) != org_id:
+        raise HTTPException(status_code=403, detail="Cannot read another organization's setup")
+    snapshot = bootstrap_snapshots.get(db, org_id)
+    if not snapshot.found:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    if "payrollSettings" in snapshot.missing:
+        # First read for this organization: add its default row once
+        with writer_sessions() as writer:
+            crud.get_payroll_settings(writer, org_id)
+        db.rollback()  # end the read transaction so the new row is visible
+        snapshot = bootstrap_snapshots.get(db, org_id)
+    if_none_match = request.headers.get("if-none-match", "")
+    if snapshot.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": snapshot.etag})
+    return Response(snapshot.body, media_type="application/json", headers={"ETag": snapshot.etag})
+
+@app.get("/api/v1/plants", response_model=List[schemas.Plant], dependencies=[Depends(conditional_get_async("plants", org_scoped=True))], tags=["Organizations"])
+async def get_plants(db: AsyncSession = Depends(get_async_db), current_user: dict = Depends(get_current_user_async)):
+    return await db.run_sync(crud.get_plants, organization_id=current_user.get("organization_id"))
 
 @app.post("/api/v1/plants", response_model=schemas.Plant, tags=["Organizations"])
 def create_plant(plant: schemas.PlantCreate, db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin", "Business Admin"))):
     return crud.create_plant(db, plant, user_id=current_user["id"])
 
-@app.get("/api/v1/departments", response_model=List[schemas.Department], tags=["Organizations"])
-def get_departments(db: Session = Depends(get_db)):
-    return crud.get_departments(db)
+@app.get("/api/v1/departments", response_model=List[schemas.Department], dependencies=[Depends(conditional_get_async("departments"))], tags=["Organizations"])
+async def get_departments(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_departments)
 
 @app.post("/api/v1/departments", response_model=schemas.Department, tags=["Organizations"])
 def create_department(dept: schemas.DepartmentCreate, db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin", "Business Admin"))):
     return crud.create_department(db, dept, user_id=current_user["id"])
 
-@app.get("/api/v1/sub-departments", response_model=List[schemas.SubDepartment], tags=["Organizations"])
-def get_sub_departments(db: Session = Depends(get_db)):
-    return crud.get_sub_departments(db)
+@app.get("/api/v1/sub-departments", response_model=List[schemas.SubDepartment], dependencies=[Depends(conditional_get_async("sub-departments"))], tags=["Organizations"])
+async def get_sub_departments(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_sub_departments)
 
-@app.get("/api/v1/grades", response_model=List[schemas.Grade], tags=["Organizations"])
-def get_grades(db: Session = Depends(get_db)):
-    return crud.get_grades(db)
+@app.get("/api/v1/grades", response_model=List[schemas.Grade], dependencies=[Depends(conditional_get_async("grades"))], tags=["Organizations"])
+async def get_grades(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_grades)
 
 @app.post("/api/v1/grades", response_model=schemas.Grade, tags=["Organizations"])
 def create_grade(grade: schemas.GradeCreate, db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin", "Business Admin"))):
     return crud.create_grade(db, grade, user_id=current_user["id"])
 
-@app.get("/api/v1/designations", response_model=List[schemas.Designation], tags=["Organizations"])
-def get_designations(db: Session = Depends(get_db)):
-    return crud.get_designations(db)
+@app.get("/api/v1/designations", response_model=List[schemas.Designation], dependencies=[Depends(conditional_get_async("designations"))], tags=["Organizations"])
+async def get_designations(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_designations)
 
 @app.post("/api/v1/designations", response_model=schemas.Designation, tags=["Organizations"])
 def create_designation(desig: schemas.DesignationCreate, db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin", "Business Admin"))):
     return crud.create_designation(db, desig, user_id=current_user["id"], org_id=current_user.get("organization_id"))
 
-@app.get("/api/v1/shifts", response_model=List[schemas.Shift], tags=["Organizations"])
-def get_shifts(db: Session = Depends(get_db)):
-    return crud.get_shifts(db)
+@app.get("/api/v1/shifts", response_model=List[schemas.Shift], dependencies=[Depends(conditional_get_async("shifts"))], tags=["Organizations"])
+async def get_shifts(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_shifts)
 
 @app.post("/api/v1/shifts", response_model=schemas.Shift, tags=["Organizations"])
 def create_shift(shift: schemas.ShiftCreate, db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin", "Business Admin"))):
     return crud.create_shift(db, shift, user_id=current_user["id"])
 
-@app.get("/api/v1/positions", response_model=List[schemas.Position], tags=["Organizations"])
-def get_positions(db: Session = Depends(get_db)):
-    return crud.get_positions(db)
+@app.get("/api/v1/positions", response_model=List[schemas.Position], dependencies=[Depends(conditional_get_async("positions"))], tags=["Organizations"])
+async def get_positions(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_positions)
 
 @app.post("/api/v1/positions", response_model=schemas.Position, tags=["Organizations"])
 def create_position(position: schemas.PositionCreate, db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin", "Business Admin"))):
     return crud.create_position(db, position, user_id=current_user["id"])
 
-@app.get("/api/v1/holidays", response_model=List[schemas.Holiday], tags=["Organizations"])
-def get_holidays(db: Session = Depends(get_db)):
-    return crud.get_holidays(db)
+@app.get("/api/v1/holidays", response_model=List[schemas.Holiday], dependencies=[Depends(conditional_get_async("holidays"))], tags=["Organizations"])
+async def get_holidays(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_holidays)
 
 @app.post("/api/v1/holidays", response_model=schemas.Holiday, tags=["Organizations"])
 def create_holiday(holiday: schemas.HolidayCreate, db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin", "Business Admin"))):
     return crud.create_holiday(db, holiday, user_id=current_user["id"])
 
-@app.get("/api/v1/banks", response_model=List[schemas.Bank], tags=["Organizations"])
-def get_banks(db: Session = Depends(get_db)):
-    return crud.get_banks(db)
+@app.get("/api/v1/banks", response_model=List[schemas.Bank], dependencies=[Depends(conditional_get_async("banks"))], tags=["Organizations"])
+async def get_banks(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_banks)
 
 @app.post("/api/v1/banks", response_model=schemas.Bank, tags=["Organizations"])
 def create_bank(bank: schemas.BankCreate, db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin", "Business Admin"))):
     return crud.create_bank(db, bank, user_id=current_user["id"])
 
-@app.get("/api/v1/employment-levels", response_model=List[schemas.EmploymentLevel], tags=["Organizations"])
-def get_employment_levels(db: Session = Depends(get_db)):
-    return crud.get_employment_levels(db)
+@app.get("/api/v1/employment-levels", response_model=List[schemas.EmploymentLevel], dependencies=[Depends(conditional_get_async("employment-levels"))], tags=["Organizations"])
+async def get_employment_levels(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_employment_levels)
 
 @app.post("/api/v1/employment-levels", response_model=schemas.EmploymentLevel, tags=["Organizations"])
 def create_employment_level(level: schemas.EmploymentLevelCreate, db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin", "Business Admin"))):
@@ -248,17 +372,152 @@ def create_employment_level(level: schemas.EmploymentLevelCreate, db: Session =
 # IV. BUSINESS: HUMAN RESOURCES
 # =================================================================
 
+def _paged(response: Response, db: Session, entity: str, model, rows, sort, limit, include_total, schema=None):
+    """
+    Attach X-Next-Cursor (and X-Total-Count on request) to a list response.
+    With `schema` the page is pre-rendered by the fast JSON serializer.
+    """
+    order = resolve_order(crud.list_sort_orders(entity), sort)
+    total = estimate_total(db, db.query(model)) if include_total else None
+    set_page_headers(response, rows, order, limit, total)
+    if schema is not None:
+        return fast_response(schema, rows, response)
+    return rows
+
 @app.get("/api/v1/employees", response_model=List[schemas.Employee], tags=["Employees"])
-def get_employees(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_employees"))):
-    return crud.get_employees(db, skip=skip, limit=limit)
+async def get_employees(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, view: Literal["detail", "summary"] = "detail", fields: Optional[str] = None, db: AsyncSession = Depends(get_async_db), current_user: dict = Depends(check_permission_async("view_employees"))):
+    def read(db: Session):
+        if view == "summary" or fields:
+            # Directory grid: flat column rows serialized straight to JSON,
+            # bypassing the ORM graph and response_model validation.
+            field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+            rows = crud.get_employee_summaries(db, skip=skip, limit=limit, cursor=cursor, sort=sort, fields=field_list)
+            summary = JSONResponse(content=[dict(row._mapping) for row in rows])
+            _paged(summary, db, "employees", models.DBEmployee, rows, sort, limit, include_total)
+            return summary
+        rows = crud.get_employees(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+        return _paged(response, db, "employees", models.DBEmployee, rows, sort, limit, include_total, schema=List[schemas.Employee])
+    return await db.run_sync(read)
 
 @app.post("/api/v1/employees", response_model=schemas.Employee, tags=["Employees"])
 def create_employee(employee: schemas.EmployeeCreate, db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin"))):
     return crud.create_employee(db, employee, user_id=current_user["id"])
 
-@app.get("/api/v1/employees/{employee_id}", response_model=schemas.Employee, tags=["Employees"])
-def read_employee(employee_id: str, db: Session = Depends(get_db)):
-    return crud.get_employee(db, employee_id=employee_id)
+def _export(db: Session, current_user: dict, dataset: str, format: str, organization_id, date_from, date_to, status):
+    """Stream a dataset export, scoped to the caller's organization unless they hold a super role."""
+    own_org = get_user_org(current_user)
+    if current_user.get("role") not in SUPER_ROLES:
+        # No organization would mean an unscoped export of every tenant
+        if not own_org:
+            raise HTTPException(status_code=403, detail="Caller has no organization to export")
+        if organization_id and organization_id != own_org:
+            raise HTTPException(status_code=403, detail="Cannot export another organization's data")
+        organization_id = own_org
+    return export_response(
+        db, dataset, format,
+        organization_id=organization_id, date_from=date_from, date_to=date_to, status=status,
+    )
+
+# Registered before /employees/{employee_id} so "export" isn't taken as an id
+@app.get("/api/v1/employees/export", tags=["Employees"])
+def export_employees(format: Literal["csv", "ndjson"] = "csv", organization_id: Optional[str] = None, date_from: Optional[str] = None, date_to: Optional[str] = None, status: Optional[str] = None, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_employees"))):
+    return _export(db, current_user, "employees", format, organization_id, date_from, date_to, status)
+
+@app.post("/api/v1/employees/import", tags=["Employees"])
+def import_employees(
+    file: UploadFile = File(...),
+    organization_id: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    format: Optional[Literal["csv", "jsonl"]] = None,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(requires_role("SystemAdmin")),
+):
+    """Bulk import a CSV/JSONL file of EmployeeCreate records; returns per-row errors."""
+    def log_progress(report):
+        logger.info(f"Employee import {file.filename}: chunk {report.chunks}, "
+                    f"{report.imported} imported, {report.failed} failed")
+
+    report = import_file(
+        db, file.file, file.filename or "", current_user["id"], fmt=format,
+        organization_id=organization_id or get_user_org(current_user),
+        chunk_size=max(1, chunk_size), progress=log_progress,
+    )
+    log_audit_event(db, current_user, f"Imported {report.imported} employees from {file.filename}")
+    return report.as_dict()
+
+# Profile tabs served by /employees/{employee_id}/<tab>, each with its own ETag
+EMPLOYEE_TAB_SCHEMAS = {
+    "education": schemas.Education,
+    "experience": schemas.Experience,
+    "family": schemas.Family,
+    "discipline": schemas.Discipline,
+    "increments": schemas.Increment,
+}
+
+def _include_tabs(include: Optional[str]) -> List[str]:
+    """Parse `?include=education,family` (or `all`) into tab names."""
+    if not include:
+        return []
+    names = [name.strip() for name in include.split(",") if name.strip()]
+    if "all" in names:
+        return list(EMPLOYEE_TAB_SCHEMAS)
+    unknown = [name for name in names if name not in EMPLOYEE_TAB_SCHEMAS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported include '{','.join(unknown)}'. Allowed: all, {', '.join(EMPLOYEE_TAB_SCHEMAS)}",
+        )
+    return names
+
+@app.get("/api/v1/employees/{employee_id}", response_model=schemas.EmployeeProfile, tags=["Employees"])
+async def read_employee(employee_id: str, include: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    """Employee header record; child tabs are embedded only when named in `include`."""
+    tabs = _include_tabs(include)
+
+    def read(db: Session):
+        employee = crud.get_employee(db, employee_id, include=tabs)
+        if employee is None:
+            return None
+        content = schemas.EmployeeHeader.model_validate(employee).model_dump(mode="json", by_alias=True)
+        for tab in tabs:
+            adapter = serializer_for(List[EMPLOYEE_TAB_SCHEMAS[tab]]).adapter
+            rows = adapter.validate_python(getattr(employee, tab), from_attributes=True)
+            content[tab] = adapter.dump_python(rows, mode="json", by_alias=True)
+        return content
+
+    content = await db.run_sync(read)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return JSONResponse(content=content)
+
+def _employee_tab(request: Request, response: Response, db: Session, employee_id: str, tab: str, skip: int, limit: int, cursor: Optional[str], sort: Optional[str], include_total: bool):
+    """One page of a profile tab; 304 while the tab's version is unchanged."""
+    check_etag(request, response, db, crud.employee_scope(employee_id), tab)
+    rows = crud.get_employee_tab(db, employee_id, tab, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    model, _ = crud.EMPLOYEE_CHILDREN[tab]
+    total = estimate_total(db, db.query(model).filter(model.employee_id == employee_id), filtered=True) if include_total else None
+    set_page_headers(response, rows, resolve_order(crud.list_sort_orders(tab), sort), limit, total)
+    return fast_response(List[EMPLOYEE_TAB_SCHEMAS[tab]], rows, response)
+
+@app.get("/api/v1/employees/{employee_id}/education", response_model=List[schemas.Education], tags=["Employees"])
+def read_employee_education(employee_id: str, request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_employees"))):
+    return _employee_tab(request, response, db, employee_id, "education", skip, limit, cursor, sort, include_total)
+
+@app.get("/api/v1/employees/{employee_id}/experience", response_model=List[schemas.Experience], tags=["Employees"])
+def read_employee_experience(employee_id: str, request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_employees"))):
+    return _employee_tab(request, response, db, employee_id, "experience", skip, limit, cursor, sort, include_total)
+
+@app.get("/api/v1/employees/{employee_id}/family", response_model=List[schemas.Family], tags=["Employees"])
+def read_employee_family(employee_id: str, request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_employees"))):
+    return _employee_tab(request, response, db, employee_id, "family", skip, limit, cursor, sort, include_total)
+
+@app.get("/api/v1/employees/{employee_id}/discipline", response_model=List[schemas.Discipline], tags=["Employees"])
+def read_employee_discipline(employee_id: str, request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_employees"))):
+    return _employee_tab(request, response, db, employee_id, "discipline", skip, limit, cursor, sort, include_total)
+
+@app.get("/api/v1/employees/{employee_id}/increments", response_model=List[schemas.Increment], tags=["Employees"])
+def read_employee_increments(employee_id: str, request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_employees"))):
+    return _employee_tab(request, response, db, employee_id, "increments", skip, limit, cursor, sort, include_total)
 
 @app.put("/api/v1/employees/{employee_id}", response_model=schemas.Employee, tags=["Employees"])
 def update_employee(employee_id: str, employee: schemas.EmployeeCreate, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("edit_employee"))):
@@ -269,16 +528,18 @@ def create_job_vacancy(job: schemas.JobVacancyCreate, db: Session = Depends(get_
     return crud.create_job_vacancy(db, job, user_id=current_user["id"])
 
 @app.get("/api/v1/jobs", response_model=List[schemas.JobVacancy], tags=["Recruitment"])
-def get_job_vacancies(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_job_vacancies(db, skip=skip, limit=limit)
+def get_job_vacancies(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, db: Session = Depends(get_db)):
+    rows = crud.get_job_vacancies(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    return _paged(response, db, "jobs", models.DBJobVacancy, rows, sort, limit, include_total, schema=List[schemas.JobVacancy])
 
 @app.post("/api/v1/candidates", response_model=schemas.Candidate, tags=["Recruitment"])
 def create_candidate(candidate: schemas.CandidateCreate, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("manage_recruitment"))):
     return crud.create_candidate(db, candidate, user_id=current_user["id"])
 
 @app.get("/api/v1/candidates", response_model=List[schemas.Candidate], tags=["Recruitment"])
-def get_candidates(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_candidates(db, skip=skip, limit=limit)
+def get_candidates(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, db: Session = Depends(get_db)):
+    rows = crud.get_candidates(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    return _paged(response, db, "candidates", models.DBCandidate, rows, sort, limit, include_total, schema=List[schemas.Candidate])
 
 @app.post("/api/v1/performance-reviews", response_model=schemas.PerformanceReview, tags=["Performance"])
 def create_performance_review(review: schemas.PerformanceReviewCreate, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -299,8 +560,9 @@ def update_system_flags(flags_update: schemas.SystemFlagsUpdate, db: Session = D
     return crud.update_system_flags(db, org_id, flags_update, current_user.get("id"))
 
 @app.get("/api/v1/audit-logs", response_model=List[schemas.AuditLog], tags=["System"])
-def get_audit_logs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_audit_logs"))):
-    return crud.get_audit_logs(db, skip=skip, limit=limit)
+def get_audit_logs(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_audit_logs"))):
+    rows = crud.get_audit_logs(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    return _paged(response, db, "audit_logs", models.DBAuditLog, rows, sort, limit, include_total, schema=List[schemas.AuditLog])
 
 @app.post("/api/v1/system/audit/run", tags=["System"])
 async def run_audit_endpoint(
@@ -467,9 +729,45 @@ def restore_from_server_backup(
 
 @app.post("/api/v1/system/maintenance/flush-cache", tags=["System"])
 def flush_cache(current_user: dict = Depends(requires_role("SystemAdmin"))):
-    # Stub for cache flushing
+    principal_cache.clear()
+    api_key_cache.clear()
+    rate_limiter.invalidate()
     return {"status": "success", "message": "Cache flushed successfully"}
 
+@app.get("/api/v1/system/cache/stats", tags=["System"])
+def get_cache_stats(current_user: dict = Depends(requires_role("SystemAdmin"))):
+    return {
+        "principals": principal_cache.stats(),
+        "apiKeys": api_key_cache.stats(),
+        "rateLimiter": rate_limiter.stats(),
+        "bootstrap": bootstrap_snapshots.stats(),
+    }
+
+@app.get("/api/v1/system/startup-report", tags=["System"])
+def get_startup_report(current_user: dict = Depends(requires_role("SystemAdmin"))):
+    """How long each startup phase of this worker took, what was deferred, and its scheduler role."""
+    report = startup_profiler.report()
+    if system_config.SCHEDULER_LEADER_ELECTION and "backend.audit.scheduler" in sys.modules:
+        report["schedulerLease"] = sys.modules["backend.audit.scheduler"].scheduler_lease().status()
+    return report
+
+@app.get("/api/v1/system/metrics", response_class=PlainTextResponse, tags=["System"])
+async def get_metrics(current_user: dict = Depends(requires_role("SystemAdmin"))):
+    """Per-route request counts and latency histograms in Prometheus text format."""
+    # async: the counters are only read and written on the event loop thread
+    body = request_metrics.render_prometheus() + password_hasher.render_prometheus()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+@app.get("/api/v1/system/metrics/summary", tags=["System"])
+async def get_metrics_summary(current_user: dict = Depends(requires_role("SystemAdmin"))):
+    """p50/p95/p99 latency per route for the System Settings page."""
+    return {
+        "since": datetime.datetime.fromtimestamp(request_metrics.started_at).isoformat(),
+        "inFlight": sum(request_metrics.in_flight.values()),
+        "routes": request_metrics.summary(),
+        "authQueue": password_hasher.stats(),
+    }
+
 @app.post("/api/v1/system/maintenance/optimize-db", tags=["System"])
 def optimize_db_endpoint(db: Session = Depends(get_db), current_user: dict = Depends(requires_role("SystemAdmin"))):
     try:
@@ -504,42 +802,75 @@ def predict_attrition(request: schemas.AttritionPredictionRequest, db: Session =
 # =================================================================
 
 @app.get("/api/v1/hcm/attendance", response_model=List[schemas.Attendance], tags=["Attendance"])
-def get_attendance_records(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_attendance"))):
-    return crud.get_attendance_records(db, skip=skip, limit=limit)
+async def get_attendance_records(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, db: AsyncSession = Depends(get_async_db), current_user: dict = Depends(check_permission_async("view_attendance"))):
+    def read(db: Session):
+        rows = crud.get_attendance_records(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+        return _paged(response, db, "attendance", models.DBAttendance, rows, sort, limit, include_total, schema=List[schemas.Attendance])
+    return await db.run_sync(read)
+
+@app.get("/api/v1/hcm/attendance/export", tags=["Attendance"])
+def export_attendance(format: Literal["csv", "ndjson"] = "csv", organization_id: Optional[str] = None, date_from: Optional[str] = None, date_to: Optional[str] = None, status: Optional[str] = None, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_attendance"))):
+    return _export(db, current_user, "attendance", format, organization_id, date_from, date_to, status)
+
+@app.post("/api/v1/hcm/attendance/punches", response_model=schemas.AttendancePunchResult, tags=["Attendance"])
+def ingest_attendance_punches(batch: schemas.AttendancePunchBatch, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("edit_attendance"))):
+    """Batch ingest of terminal punches; idempotent, safe to re-deliver."""
+    return crud.ingest_attendance_punches(db, batch.punches, user_id=current_user["id"])
 
 @app.post("/api/v1/hcm/attendance", response_model=schemas.Attendance, tags=["Attendance"])
 def create_attendance(attendance: schemas.AttendanceCreate, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("edit_attendance"))):
     return crud.create_attendance_record(db, attendance, user_id=current_user["id"])
 
 @app.get("/api/v1/hcm/payroll", response_model=List[schemas.PayrollLedger], tags=["Payroll"])
-def get_payroll_records(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_payroll"))):
-    return crud.get_payroll_records(db, skip=skip, limit=limit)
+def get_payroll_records(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_payroll"))):
+    rows = crud.get_payroll_records(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+    return _paged(response, db, "payroll", models.DBPayrollLedger, rows, sort, limit, include_total, schema=List[schemas.PayrollLedger])
+
+@app.get("/api/v1/hcm/payroll/export", tags=["Payroll"])
+def export_payroll(format: Literal["csv", "ndjson"] = "csv", organization_id: Optional[str] = None, date_from: Optional[str] = None, date_to: Optional[str] = None, status: Optional[str] = None, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_payroll"))):
+    return _export(db, current_user, "payroll", format, organization_id, date_from, date_to, status)
 
 @app.post("/api/v1/hcm/payroll", response_model=schemas.PayrollLedger, tags=["Payroll"])
 def create_payroll_entry(payroll: schemas.PayrollLedgerCreate, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("run_payroll"))):
     return crud.create_payroll_ledger_entry(db, payroll, user_id=current_user["id"])
 
 @app.get("/api/v1/payroll-settings", response_model=schemas.PayrollSettings, tags=["Payroll"])
+@writes_on_read  # creates the default settings row on first read
 def get_payroll_settings(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     org_id = get_user_org(current_user)
     return crud.get_payroll_settings(db, org_id)
 
 @app.get("/api/v1/hcm/leaves", response_model=List[schemas.LeaveRequest], tags=["Leaves"])
-def get_leaves(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_leaves"))):
-    return crud.get_leave_requests(db, skip=skip, limit=limit)
+async def get_leaves(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, sort: Optional[str] = None, include_total: bool = False, db: AsyncSession = Depends(get_async_db), current_user: dict = Depends(check_permission_async("view_leaves"))):
+    def read(db: Session):
+        rows = crud.get_leave_requests(db, skip=skip, limit=limit, cursor=cursor, sort=sort)
+        return _paged(response, db, "leaves", models.DBLeaveRequest, rows, sort, limit, include_total, schema=List[schemas.LeaveRequest])
+    return await db.run_sync(read)
+
+@app.get("/api/v1/hcm/leaves/export", tags=["Leaves"])
+def export_leaves(format: Literal["csv", "ndjson"] = "csv", organization_id: Optional[str] = None, date_from: Optional[str] = None, date_to: Optional[str] = None, status: Optional[str] = None, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("view_leaves"))):
+    return _export(db, current_user, "leaves", format, organization_id, date_from, date_to, status)
 
 @app.post("/api/v1/hcm/leaves", response_model=schemas.LeaveRequest, tags=["Leaves"])
 def create_leave(leave: schemas.LeaveRequestCreate, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("request_leave"))):
     return crud.create_leave_request(db, leave, user_id=current_user["id"])
 
+@app.post("/api/v1/hcm/leaves/approve-batch", response_model=schemas.LeaveApprovalResult, tags=["Leaves"])
+def approve_leaves_batch(batch: schemas.LeaveApprovalBatch, db: Session = Depends(get_db), current_user: dict = Depends(check_permission("approve_leaves"))):
+    """Approve many pending requests at once; balances are charged in the same transaction."""
+    result = crud.approve_leave_requests(db, batch.leave_ids, user_id=current_user["id"])
+    if result["approved"]:
+        log_audit_event(db, current_user, f"Approved {len(result['approved'])} leave requests")
+    return result
+
 # =================================================================
 # VIII. DEPLOYMENT & HEALTH
 # =================================================================
 
 @app.get("/api/v1/health", tags=["System"])
-def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     try:
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         return {"status": "Optimal", "database": "Connected", "timestamp": datetime.datetime.now().isoformat()}
     except Exception as e:
         return {"status": "Degraded", "database": "Disconnected", "details": str(e)}
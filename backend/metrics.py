@@ -0,0 +1,172 @@
+"""
+Request Metrics
+===============
+Per-route request counters, status codes, in-flight gauges and latency
+histograms, collected by a pure ASGI middleware and exposed in Prometheus
+text format.
+
+- Routes are keyed by method and *templated* path (`/api/v1/employees/{employee_id}`),
+  taken from the route FastAPI matched, so cardinality stays bounded.
+  Requests that match no route are counted under `<unmatched>`.
+- Every counter lives in this worker process and is only ever touched from
+  the event loop thread, so updates are plain integer increments: no locks.
+  With several uvicorn workers each one reports its own series; sum them in
+  Prometheus.
+- Quantiles (p50/p95/p99) are estimated from the histogram buckets by
+  linear interpolation, which is what the System Settings page shows.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# Upper bounds in seconds; one extra slot counts +Inf
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5,
+    0.75, 1.0, 2.5, 5.0, 10.0,
+)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RouteStats:
+    __slots__ = ("statuses", "buckets", "total_seconds", "count")
+
+    def __init__(self):
+        self.statuses: Dict[int, int] = {}
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total_seconds = 0.0
+        self.count = 0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Latency (seconds) at quantile q, interpolated inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+                upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return LATENCY_BUCKETS[-1]
+
+
+class RequestMetrics:
+    """Metric store for this worker, keyed by (method, route template)."""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        # Keyed by method only: the route template is not known until routing
+        self.in_flight: Dict[str, int] = {}
+        self.started_at = time.time()
+
+    def stats(self, method: str, route: str) -> RouteStats:
+        key = (method, route)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = RouteStats()
+        return stats
+
+    def reset(self):
+        self.routes.clear()
+        self.in_flight.clear()
+        self.started_at = time.time()
+
+    def summary(self) -> List[dict]:
+        """Per-route counts and p50/p95/p99 in milliseconds, busiest first."""
+        rows = []
+        for (method, route), stats in self.routes.items():
+            def ms(q):
+                value = stats.quantile(q)
+                return round(value * 1000, 2) if value is not None else None
+            rows.append({
+                "method": method,
+                "route": route,
+                "count": stats.count,
+                "errors": sum(n for status, n in stats.statuses.items() if status >= 500),
+                "meanMs": round(stats.total_seconds * 1000 / stats.count, 2) if stats.count else None,
+                "p50Ms": ms(0.50),
+                "p95Ms": ms(0.95),
+                "p99Ms": ms(0.99),
+            })
+        return sorted(rows, key=lambda r: r["count"], reverse=True)
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# HELP http_requests_total Requests by route template, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        items = sorted(self.routes.items())
+        for (method, route), stats in items:
+            for status, n in sorted(stats.statuses.items()):
+                lines.append(
+                    f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {n}'
+                )
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being served by this worker.",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        for method, n in sorted(self.in_flight.items()):
+            lines.append(f'http_requests_in_flight{{method="{method}"}} {n}')
+        lines += [
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), stats in items:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += n
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {stats.total_seconds:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {stats.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: no BaseHTTPMiddleware task or body streaming, just
+    two clock reads and a handful of integer updates per request. The route
+    template is read from `scope["route"]`, which FastAPI sets during routing.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        metrics = self.metrics
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.in_flight[method] = metrics.in_flight.get(method, 0) + 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.in_flight[method] -= 1
+            route = scope.get("route")
+            stats = metrics.stats(method, route.path if route is not None else UNMATCHED_ROUTE)
+            stats.count += 1
+            stats.total_seconds += elapsed
+            stats.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+            stats.statuses[status_code] = stats.statuses.get(status_code, 0) + 1
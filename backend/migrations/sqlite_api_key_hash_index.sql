@@ -0,0 +1,6 @@
+-- SQLite Migration: Unique API Key Hash Index
+-- Purpose: Index the SHA-256 lookup done by API-key authentication
+-- (get_api_key_principal). Keys are random 32-byte tokens, so existing
+-- hashes are already unique.
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_core_api_keys_key_hash ON core_api_keys(key_hash);
@@ -0,0 +1,23 @@
+-- SQLite Migration: One Attendance Row per Employee-Day
+-- Purpose: Unique (employee_id, date) index backing the punch ingest upsert
+-- (INSERT ... ON CONFLICT (employee_id, date) DO UPDATE).
+-- Existing duplicates are collapsed onto the oldest row first: earliest
+-- clock_in, latest clock_out.
+
+UPDATE hcm_attendance
+SET clock_in = (
+        SELECT MIN(d.clock_in) FROM hcm_attendance d
+        WHERE d.employee_id = hcm_attendance.employee_id AND d.date = hcm_attendance.date
+    ),
+    clock_out = (
+        SELECT MAX(d.clock_out) FROM hcm_attendance d
+        WHERE d.employee_id = hcm_attendance.employee_id AND d.date = hcm_attendance.date
+    )
+WHERE id IN (
+    SELECT MIN(id) FROM hcm_attendance GROUP BY employee_id, date HAVING COUNT(*) > 1
+);
+
+DELETE FROM hcm_attendance
+WHERE id NOT IN (SELECT MIN(id) FROM hcm_attendance GROUP BY employee_id, date);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_hcm_attendance_employee_date ON hcm_attendance(employee_id, date);
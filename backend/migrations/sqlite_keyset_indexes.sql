@@ -0,0 +1,13 @@
+-- SQLite Migration: Keyset Pagination Indexes
+-- Purpose: Back every supported list sort order with a composite (sort_key, id)
+-- index so cursor pages are a single range scan at any depth.
+-- New databases get these from the model definitions via create_all.
+
+CREATE INDEX IF NOT EXISTS idx_hcm_employees_name_id ON hcm_employees(name, id);
+CREATE INDEX IF NOT EXISTS idx_core_audit_logs_time_id ON core_audit_logs(time, id);
+CREATE INDEX IF NOT EXISTS idx_hcm_attendance_date_id ON hcm_attendance(date, id);
+CREATE INDEX IF NOT EXISTS idx_hcm_payroll_ledger_employee_id_id ON hcm_payroll_ledger(employee_id, id);
+CREATE INDEX IF NOT EXISTS idx_hcm_leave_requests_start_date_id ON hcm_leave_requests(start_date, id);
+
+-- Refresh planner statistics (also feeds the X-Total-Count estimate)
+ANALYZE;
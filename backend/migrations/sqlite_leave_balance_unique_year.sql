@@ -0,0 +1,31 @@
+-- SQLite Migration: One Leave Balance per Employee-Year
+-- Purpose: Unique (employee_id, year) index backing the batch approval
+-- upsert (INSERT ... ON CONFLICT (employee_id, year) DO NOTHING).
+-- Existing duplicates are collapsed onto the oldest row first: the used
+-- days of all copies are summed, the entitlements of the oldest are kept.
+
+UPDATE hcm_leave_balances
+SET annual_used = (
+        SELECT SUM(COALESCE(d.annual_used, 0)) FROM hcm_leave_balances d
+        WHERE d.employee_id = hcm_leave_balances.employee_id AND d.year = hcm_leave_balances.year
+    ),
+    sick_used = (
+        SELECT SUM(COALESCE(d.sick_used, 0)) FROM hcm_leave_balances d
+        WHERE d.employee_id = hcm_leave_balances.employee_id AND d.year = hcm_leave_balances.year
+    ),
+    casual_used = (
+        SELECT SUM(COALESCE(d.casual_used, 0)) FROM hcm_leave_balances d
+        WHERE d.employee_id = hcm_leave_balances.employee_id AND d.year = hcm_leave_balances.year
+    ),
+    unpaid_used = (
+        SELECT SUM(COALESCE(d.unpaid_used, 0)) FROM hcm_leave_balances d
+        WHERE d.employee_id = hcm_leave_balances.employee_id AND d.year = hcm_leave_balances.year
+    )
+WHERE id IN (
+    SELECT MIN(id) FROM hcm_leave_balances GROUP BY employee_id, year HAVING COUNT(*) > 1
+);
+
+DELETE FROM hcm_leave_balances
+WHERE id NOT IN (SELECT MIN(id) FROM hcm_leave_balances GROUP BY employee_id, year);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_hcm_leave_balances_employee_year ON hcm_leave_balances(employee_id, year);
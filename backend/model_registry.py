@@ -0,0 +1,54 @@
+"""
+Model Registry
+==============
+`models.DBEmployee`-style access to every ORM model, whichever domain
+package defines it. The registry is built once, at import time, from the
+mapped classes in the domain modules, so a lookup is a plain attribute read.
+
+- Domains are scanned in `DOMAIN_MODULES` order; the first definition of a
+  name wins (core before HCM, as before).
+- Asking for a model that no domain defines raises AttributeError, so
+  `getattr(models, name, None)` and `hasattr` work as expected.
+"""
+
+from typing import Dict
+
+import backend.domains.core.models as core_models
+import backend.domains.hcm.models as hcm_models
+from backend.database import Base
+
+DOMAIN_MODULES = (core_models, hcm_models)
+
+
+def _mapped_classes(module) -> Dict[str, type]:
+    return {
+        name: obj
+        for name, obj in vars(module).items()
+        if isinstance(obj, type) and issubclass(obj, Base) and obj is not Base
+    }
+
+
+class ModelRegistry:
+    """Namespace of ORM models, filled in once."""
+
+    def __init__(self, modules=DOMAIN_MODULES):
+        registry: Dict[str, type] = {"Base": Base}
+        for module in modules:
+            for name, cls in _mapped_classes(module).items():
+                registry.setdefault(name, cls)
+        self.__dict__.update(registry)
+        self._names = tuple(sorted(registry))
+
+    def __getattr__(self, name):
+        # Only reached when the name is not registered
+        raise AttributeError(f"Model {name} not found in Core or HCM domains")
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    @property
+    def names(self):
+        return self._names
+
+
+models = ModelRegistry()
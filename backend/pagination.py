@@ -0,0 +1,168 @@
+"""
+Keyset (Cursor) Pagination
+==========================
+Offset paging rescans every skipped row, so deep pages on audit logs and
+attendance get linearly slower. Keyset paging instead resumes from the last
+row seen: `WHERE (sort_key, id) > (:last_key, :last_id) ORDER BY sort_key, id`,
+which is a single index range scan regardless of depth.
+
+Cursors are opaque url-safe tokens carrying the sort name and the
+(sort key, id) of the last row of the previous page. Every supported sort
+order is backed by a composite (sort_key, id) index.
+
+NULL sort keys are ordered as SQLite orders them (lowest), so a page boundary
+on a NULL key still resumes correctly.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, and_, func, or_, select, text
+from sqlalchemy.orm import Query, Session
+
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+@dataclass(frozen=True)
+class KeysetOrder:
+    """A supported sort order: an optional sort column with `id` as tiebreaker."""
+    name: str
+    id_column: Any
+    column: Any = None
+    descending: bool = False
+
+    @property
+    def attr(self) -> Optional[str]:
+        return self.column.key if self.column is not None else None
+
+
+def keyset_orders(id_column, **columns) -> Dict[str, KeysetOrder]:
+    """Build the sort table for an entity: `id`, plus `col`/`-col` per column."""
+    orders = {
+        "id": KeysetOrder("id", id_column),
+        "-id": KeysetOrder("-id", id_column, descending=True),
+    }
+    for name, column in columns.items():
+        orders[name] = KeysetOrder(name, id_column, column)
+        orders[f"-{name}"] = KeysetOrder(f"-{name}", id_column, column, descending=True)
+    return orders
+
+
+def resolve_order(orders: Dict[str, KeysetOrder], sort: Optional[str]) -> KeysetOrder:
+    order = orders.get(sort or "id")
+    if order is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported sort '{sort}'. Allowed: {', '.join(sorted(orders))}",
+        )
+    return order
+
+
+def encode_cursor(order: KeysetOrder, values: List[Any]) -> str:
+    raw = json.dumps({"s": order.name, "k": values}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order: KeysetOrder) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["k"]
+        sort_name = payload["s"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    expected = 2 if order.column is not None else 1
+    if sort_name != order.name or not isinstance(values, list) or len(values) != expected:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+    return values
+
+
+def _after(order: KeysetOrder, values: List[Any]):
+    """Predicate selecting rows strictly after the cursor position."""
+    id_col = order.id_column
+    if order.column is None:
+        (last_id,) = values
+        return id_col < last_id if order.descending else id_col > last_id
+
+    col = order.column
+    last_key, last_id = values
+    if not order.descending:
+        if last_key is None:
+            return or_(and_(col.is_(None), id_col > last_id), col.is_not(None))
+        return or_(col > last_key, and_(col == last_key, id_col > last_id))
+    if last_key is None:
+        return and_(col.is_(None), id_col < last_id)
+    return or_(col < last_key, and_(col == last_key, id_col < last_id), col.is_(None))
+
+
+def paginate(
+    query: Union[Query, Select],
+    order: KeysetOrder,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Union[Query, Select]:
+    """
+    Apply ordering plus either the cursor seek or the legacy offset. Works on
+    ORM queries and Core `select()` statements alike.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    keys = [order.column, order.id_column] if order.column is not None else [order.id_column]
+    query = query.order_by(*[k.desc() if order.descending else k.asc() for k in keys])
+    if cursor:
+        query = query.filter(_after(order, decode_cursor(cursor, order)))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def next_cursor(rows: List[Any], order: KeysetOrder, limit: int) -> Optional[str]:
+    """Cursor for the page after `rows`, or None when this was the last page."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    values = [last.id] if order.column is None else [getattr(last, order.attr), last.id]
+    return encode_cursor(order, values)
+
+
+def set_page_headers(
+    response: Response,
+    rows: List[Any],
+    order: KeysetOrder,
+    limit: int,
+    total: Optional[int] = None,
+) -> None:
+    """Expose paging state in headers so list response bodies stay unchanged."""
+    cursor = next_cursor(rows, order, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+
+
+def estimate_total(db: Session, query: Query, filtered: bool = False) -> int:
+    """
+    Row count for the X-Total-Count header. Unfiltered SQLite tables use the
+    planner statistics from `ANALYZE` (sqlite_stat1) when present; anything
+    else falls back to an exact COUNT.
+    """
+    if not filtered and db.get_bind().dialect.name == "sqlite":
+        table = query.column_descriptions[0]["entity"].__table__.name
+        try:
+            stat = db.execute(
+                text("SELECT stat FROM sqlite_stat1 WHERE tbl = :tbl LIMIT 1"),
+                {"tbl": table},
+            ).scalar()
+            if stat:
+                return int(stat.split()[0])
+        except Exception:
+            pass  # sqlite_stat1 only exists once ANALYZE has run
+    return db.execute(
+        select(func.count()).select_from(query.order_by(None).subquery())
+    ).scalar()
@@ -0,0 +1,186 @@
+"""
+Password Hasher
+===============
+bcrypt hashing and verification on a dedicated, size-bounded thread pool so
+a login storm at shift start cannot occupy the general request threadpool.
+
+- `BCRYPT_WORKERS` threads run the hashes (bcrypt releases the GIL). At most
+  `BCRYPT_QUEUE_LIMIT` jobs may be queued or running; beyond that callers get
+  a 429 with Retry-After instead of waiting behind the backlog.
+- Cost factor: `BCRYPT_ROUNDS`, or `auto` to calibrate once per process to the
+  highest cost whose hash stays within `BCRYPT_TARGET_MS` on this machine.
+- `needs_rehash()` flags hashes made with a different cost; login re-hashes
+  them transparently after a successful verification.
+- Queue depth, wait and run times are exported next to the request metrics.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+from fastapi import HTTPException
+
+from backend.config import auth_config
+
+logger = logging.getLogger(__name__)
+
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+# Cost used to time the machine during calibration (cheap, ~4 ms)
+PROBE_ROUNDS = 8
+
+
+def hash_rounds(hashed: str) -> Optional[int]:
+    """Cost factor encoded in a `$2b$12$...` hash, None if unparseable."""
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def calibrate_rounds(target_ms: float) -> int:
+    """Highest cost whose hash takes at most target_ms here (each round doubles the work)."""
+    started = time.perf_counter()
+    bcrypt.hashpw(b"calibration", bcrypt.gensalt(PROBE_ROUNDS))
+    probe_ms = max((time.perf_counter() - started) * 1000, 1e-3)
+    rounds = PROBE_ROUNDS + math.floor(math.log2(target_ms / probe_ms))
+    return max(MIN_ROUNDS, min(MAX_ROUNDS, rounds))
+
+
+class PasswordHasher:
+    """bcrypt behind a bounded executor, with queue metrics."""
+
+    def __init__(self, workers: int, queue_limit: int, rounds="12", target_ms: float = 250.0):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.target_ms = target_ms
+        self._rounds = None if str(rounds).lower() == "auto" else int(rounds)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+
+        self.pending = 0  # queued + running
+        self.running = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    @property
+    def rounds(self) -> int:
+        if self._rounds is None:
+            self._rounds = calibrate_rounds(self.target_ms)
+            logger.info(f"bcrypt cost calibrated to {self._rounds} for a {self.target_ms:.0f} ms target")
+        return self._rounds
+
+    @rounds.setter
+    def rounds(self, value: int):
+        self._rounds = value
+
+    # --- Public API ---
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await asyncio.wrap_future(self._submit(_checkpw, password, hashed))
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hashpw, password, self.rounds))
+
+    def verify_sync(self, password: str, hashed: str) -> bool:
+        """Blocking variant for sync callers (scripts, admin CRUD); same pool and limits."""
+        return self._submit(_checkpw, password, hashed).result()
+
+    def hash_sync(self, password: str) -> str:
+        return self._submit(_hashpw, password, self.rounds).result()
+
+    def needs_rehash(self, hashed) -> bool:
+        """True for hashes weaker than the current cost; never downgrades a stronger one."""
+        if isinstance(hashed, bytes):
+            hashed = hashed.decode("utf-8")
+        rounds = hash_rounds(hashed)
+        return rounds is not None and rounds < self.rounds
+
+    # --- Executor plumbing ---
+
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self.pending >= self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=429,
+                    detail="Authentication is busy, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+        return self._executor.submit(self._run, time.perf_counter(), fn, *args)
+
+    def _run(self, queued_at: float, fn, *args):
+        started = time.perf_counter()
+        with self._lock:
+            self.running += 1
+            self.wait_seconds += started - queued_at
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.pending -= 1
+                self.completed += 1
+                self.run_seconds += time.perf_counter() - started
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed
+            return {
+                "workers": self.workers,
+                "queueLimit": self.queue_limit,
+                "rounds": self._rounds,
+                "pending": self.pending,
+                "running": self.running,
+                "maxPending": self.max_pending,
+                "completed": done,
+                "rejected": self.rejected,
+                "meanWaitMs": round(self.wait_seconds * 1000 / done, 2) if done else None,
+                "meanHashMs": round(self.run_seconds * 1000 / done, 2) if done else None,
+            }
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            rows = [
+                ("auth_hash_queue_depth", "gauge", "Password hash jobs queued or running.", self.pending),
+                ("auth_hash_running", "gauge", "Password hash jobs running.", self.running),
+                ("auth_hash_completed_total", "counter", "Password hash jobs completed.", self.completed),
+                ("auth_hash_rejected_total", "counter", "Password hash jobs shed with 429.", self.rejected),
+                ("auth_hash_wait_seconds_total", "counter", "Time jobs spent queued.", round(self.wait_seconds, 6)),
+                ("auth_hash_run_seconds_total", "counter", "Time spent hashing.", round(self.run_seconds, 6)),
+            ]
+        lines = []
+        for name, kind, help_text, value in rows:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+def _checkpw(password: str, hashed) -> bool:
+    if isinstance(hashed, str):
+        hashed = hashed.encode("utf-8")
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed)
+    except (TypeError, ValueError):
+        return False
+
+
+def _hashpw(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+password_hasher = PasswordHasher(
+    workers=auth_config.BCRYPT_WORKERS,
+    queue_limit=auth_config.BCRYPT_QUEUE_LIMIT,
+    rounds=auth_config.BCRYPT_ROUNDS,
+    target_ms=auth_config.BCRYPT_TARGET_MS,
+)
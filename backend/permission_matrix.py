@@ -0,0 +1,126 @@
+"""
+Compiled RBAC Permission Matrix
+===============================
+The role -> permission table compiled into an immutable in-memory structure
+so `check_permission` needs no SELECT per request:
+
+- every permission string is interned and given a bit position
+- every role gets an integer bitset of its granted permissions
+- SUPER_ROLES and roles holding '*' are folded into a full-access set
+
+Roles without rows in `role_permissions` fall back to
+DEFAULT_ROLE_PERMISSIONS, same as the previous per-request lookup.
+
+Writes bump the ("system", "role_permissions") resource version. Each worker
+compares its compiled version against the shared counter (cached for
+RESOURCE_VERSION_REFRESH_SECONDS) and recompiles when it moves.
+"""
+
+import sys
+import threading
+from types import MappingProxyType
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.domains.core.models import DBRolePermission
+from backend.permissions_config import DEFAULT_ROLE_PERMISSIONS, SUPER_ROLES
+from backend.versioning import SYSTEM_SCOPE, resource_versions
+
+RESOURCE = "role_permissions"
+WILDCARD = "*"
+
+
+class PermissionMatrix:
+    """Immutable snapshot of role grants. Lookups are O(1)."""
+
+    __slots__ = ("version", "_bits", "_role_masks", "_full_access")
+
+    def __init__(
+        self,
+        role_permissions: Dict[str, Iterable[str]],
+        super_roles: Iterable[str] = SUPER_ROLES,
+        version: int = 0,
+    ):
+        bits: Dict[str, int] = {}
+        role_masks: Dict[str, int] = {}
+        full_access = set(super_roles)
+
+        for role, permissions in role_permissions.items():
+            mask = 0
+            for permission in permissions:
+                if permission == WILDCARD:
+                    full_access.add(role)
+                    continue
+                permission = sys.intern(permission)
+                bit = bits.get(permission)
+                if bit is None:
+                    bit = bits[permission] = 1 << len(bits)
+                mask |= bit
+            role_masks[sys.intern(role)] = mask
+
+        self.version = version
+        self._bits = MappingProxyType(bits)
+        self._role_masks = MappingProxyType(role_masks)
+        self._full_access = frozenset(full_access)
+
+    def allows(self, role: str, permission: str) -> bool:
+        if role in self._full_access:
+            return True
+        bit = self._bits.get(permission)
+        if bit is None:
+            return False
+        return bool(self._role_masks.get(role, 0) & bit)
+
+    def permissions_for(self, role: str) -> list:
+        if role in self._full_access:
+            return [WILDCARD]
+        mask = self._role_masks.get(role, 0)
+        return [p for p, bit in self._bits.items() if mask & bit]
+
+
+def compile_matrix(db: Session, version: int = 0) -> PermissionMatrix:
+    """Build a matrix from role_permissions rows merged over the defaults."""
+    stored: Dict[str, list] = {}
+    for role, permission in db.query(DBRolePermission.role, DBRolePermission.permission):
+        stored.setdefault(role, []).append(permission)
+
+    merged = {role: list(perms) for role, perms in DEFAULT_ROLE_PERMISSIONS.items()}
+    for role, perms in stored.items():
+        # An empty DB grant list keeps the defaults (legacy fallback)
+        if perms:
+            merged[role] = perms
+    return PermissionMatrix(merged, SUPER_ROLES, version)
+
+
+_matrix: PermissionMatrix = PermissionMatrix(DEFAULT_ROLE_PERMISSIONS, SUPER_ROLES, version=-1)
+_rebuild_lock = threading.Lock()
+
+
+def get_permission_matrix(db: Optional[Session] = None) -> PermissionMatrix:
+    """Current matrix; recompiled when the shared version counter has moved."""
+    matrix = _matrix
+    if db is None:
+        return matrix
+    version = resource_versions.get(db, SYSTEM_SCOPE, RESOURCE)
+    if version != matrix.version:
+        matrix = reload_permission_matrix(db, version)
+    return matrix
+
+
+def reload_permission_matrix(db: Session, version: Optional[int] = None) -> PermissionMatrix:
+    """Compile a fresh matrix and swap it in atomically."""
+    global _matrix
+    with _rebuild_lock:
+        if version is None:
+            version = resource_versions.get(db, SYSTEM_SCOPE, RESOURCE)
+        if _matrix.version == version:
+            return _matrix
+        matrix = compile_matrix(db, version)
+        _matrix = matrix
+        return matrix
+
+
+def mark_permissions_changed(db: Session) -> int:
+    """Bump the shared version inside the caller's write transaction."""
+    return resource_versions.bump(db, SYSTEM_SCOPE, RESOURCE)
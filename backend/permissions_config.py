@@ -25,6 +25,7 @@ DEFAULT_ROLE_PERMISSIONS = {
     "Business Admin": [],  # To be configured via System Settings
     "Manager": [],  # To be configured via System Settings
     "User": [],  # To be configured via System Settings
+    "Integration": [],  # API-key clients; to be configured via System Settings
 }
 
 # ============================================================
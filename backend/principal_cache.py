@@ -0,0 +1,137 @@
+"""
+Principal Cache
+===============
+Bounded LRU + TTL cache of resolved principals used by `get_current_user`.
+
+Entries are keyed by the SHA-256 of the bearer token (raw tokens are never
+kept in memory) and hold the decoded JWT claims plus the legacy user dict.
+An entry lives for at most `ttl_seconds`, and never past the token's own
+`exp` claim.
+
+Invalidation is in-process: CRUD writes that touch a user row call
+`invalidate_user()` so the change is visible on the next request in this
+worker. Other workers converge within the TTL.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from backend.config import auth_config
+
+
+class PrincipalCache:
+    """Thread-safe LRU of token hash -> (claims, user dict)."""
+
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # token_hash -> (expires_at, claims, user)
+        self._entries: "OrderedDict[str, Tuple[float, dict, dict]]" = OrderedDict()
+        # user id / username -> token hashes, for targeted invalidation
+        self._by_user: dict = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Tuple[dict, dict]]:
+        """Return (claims, user) for a cached token, or None on miss/expiry."""
+        key = self.token_key(token)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims, user = entry
+            if expires_at <= now:
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Hand out a copy so route handlers can't mutate the cached principal
+        return claims, dict(user)
+
+    def put(self, token: str, claims: dict, user: dict):
+        key = self.token_key(token)
+        ttl = self.ttl_seconds
+        exp = claims.get("exp")
+        if exp is not None:
+            # Never outlive the token itself
+            ttl = min(ttl, float(exp) - time.time())
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, claims, dict(user))
+            for ident in (user.get("id"), user.get("username")):
+                if ident is not None:
+                    self._by_user.setdefault(ident, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: Optional[str] = None, username: Optional[str] = None) -> int:
+        """Drop every cached token belonging to a user. Returns entries removed."""
+        removed = 0
+        with self._lock:
+            for ident in (user_id, username):
+                if ident is None:
+                    continue
+                for key in self._by_user.pop(ident, ()):
+                    if key in self._entries:
+                        self._drop(key)
+                        removed += 1
+            self.invalidations += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key: str):
+        """Remove an entry and its reverse-index links. Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user = entry[2]
+        for ident in (user.get("id"), user.get("username")):
+            keys = self._by_user.get(ident)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_user[ident]
+
+
+principal_cache = PrincipalCache(
+    max_entries=auth_config.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=auth_config.PRINCIPAL_CACHE_TTL_SECONDS,
+)
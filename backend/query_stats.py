@@ -0,0 +1,175 @@
+"""
+SQL Query Instrumentation
+=========================
+`before_cursor_execute` / `after_cursor_execute` hooks that time every
+statement on an instrumented engine.
+
+- Per request (`QueryStatsMiddleware`): query count and total SQL time,
+  returned as `X-Query-Count` / `X-Query-Time-Ms` headers outside production.
+- N+1 detection: when one statement shape runs `N_PLUS_ONE_THRESHOLD` times
+  within a request, the request is logged as an N+1 suspect together with the
+  crud function that issued it.
+- Slow-query log: statements slower than `SLOW_QUERY_MS` go to the
+  `backend.slow_queries` logger with normalized SQL and the calling crud
+  function, whether or not they run inside a request.
+
+Shapes are the SQL text with literals replaced by `?` and IN-lists collapsed,
+so `WHERE id = 1` and `WHERE id = 2` count as the same statement.
+"""
+
+import logging
+import re
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+
+from backend.config import api_config, system_config
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("backend.slow_queries")
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+QUERY_TIME_HEADER = "X-Query-Time-Ms"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,?)+\)", re.IGNORECASE)
+_POSTCOMPILE = re.compile(r"\(__\[POSTCOMPILE_\w+\]\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Statement shape: literals -> ?, IN-lists -> IN (...), single-spaced."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _POSTCOMPILE.sub("(...)", shape)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def calling_function() -> Optional[str]:
+    """Innermost crud function on the stack, else the innermost backend one."""
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module == "backend.crud":
+            return f"crud.{frame.f_code.co_name}"
+        if fallback is None and module.startswith("backend.") and module != __name__:
+            fallback = f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback
+
+
+class RequestQueryStats:
+    """Counters for the statements issued while serving one request."""
+
+    __slots__ = ("count", "seconds", "shapes", "suspects")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Dict[str, int] = {}
+        # shape -> calling function, recorded when the shape crosses the threshold
+        self.suspects: Dict[str, Optional[str]] = {}
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.seconds += elapsed
+        shape = normalize_sql(statement)
+        seen = self.shapes.get(shape, 0) + 1
+        self.shapes[shape] = seen
+        if seen == system_config.N_PLUS_ONE_THRESHOLD:
+            self.suspects[shape] = calling_function()
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries():
+    """Collect RequestQueryStats for the statements run inside the block."""
+    stats = RequestQueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+# --- Engine hooks ---
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # One slot per statement: a statement that fails never reaches the after
+    # hook, and its start time goes away with its execution context
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started_at", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if elapsed * 1000 >= system_config.SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "Slow query %.1f ms from %s: %s",
+            elapsed * 1000, calling_function() or "<unknown>", normalize_sql(statement),
+        )
+
+
+def instrument_engine(engine):
+    """Attach the timing hooks to a (sync) Engine; idempotent."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# --- Request scope ---
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware that opens a RequestQueryStats for each HTTP
+    request, reports N+1 suspects when it finishes and, outside production,
+    adds the query count and time to the response headers.
+    """
+
+    def __init__(self, app, expose_headers: Optional[bool] = None):
+        self.app = app
+        if expose_headers is None:
+            expose_headers = api_config.ENVIRONMENT != "production"
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if self.expose_headers and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((QUERY_COUNT_HEADER.lower().encode(), str(stats.count).encode()))
+                headers.append((QUERY_TIME_HEADER.lower().encode(), f"{stats.seconds * 1000:.2f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        with track_queries() as stats:
+            await self.app(scope, receive, send_wrapper)
+        if stats.suspects:
+            route = scope.get("route")
+            path = route.path if route is not None else scope.get("path")
+            for shape, caller in stats.suspects.items():
+                logger.warning(
+                    "N+1 suspect on %s %s: %d x from %s: %s",
+                    scope["method"], path, stats.shapes[shape], caller or "<unknown>", shape,
+                )
@@ -0,0 +1,288 @@
+"""
+Tenant Rate Limiter
+===================
+Token-bucket limiting per (organization, principal), enforced by
+`get_current_user` so every authenticated request is counted against the
+caller's own bucket rather than a per-IP one (plant users share one NAT).
+
+- Policy: `system_flags.rate_limit_enabled` / `rate_limit_requests_per_minute`
+  for the caller's organization, falling back to the `system-default` row and
+  then to the column defaults. A bucket holds one minute's worth of tokens and
+  refills continuously.
+- Policies are cached per organization. `crud.update_system_flags` bumps the
+  `system_flags` version and calls `invalidate()`, so the writing worker
+  applies new limits on the next request and other workers within
+  `RESOURCE_VERSION_REFRESH_SECONDS`.
+- Buckets are two numbers per active key. A bucket idle for longer than
+  `RATE_LIMIT_IDLE_SECONDS` would have refilled anyway, so it is evicted.
+- `RATE_LIMIT_STORE_PATH` switches the buckets to a SQLite file shared by all
+  uvicorn workers on the host; each check is a single atomic UPSERT.
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.config import system_config
+from backend.domains.core.models import DBSystemFlags
+from backend.versioning import resource_versions
+
+DEFAULT_FLAGS_SCOPE = "system-default"
+FLAGS_RESOURCE = "system_flags"
+
+
+def principal_subject(principal: dict) -> str:
+    """Bucket subject for a resolved principal: its API key, else its user."""
+    if principal.get("apiKeyId"):
+        return f"key:{principal['apiKeyId']}"
+    return f"user:{principal['id']}"
+
+
+class RateLimitPolicy(NamedTuple):
+    enabled: bool
+    requests_per_minute: int
+
+    @property
+    def capacity(self) -> float:
+        return float(self.requests_per_minute)
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.requests_per_minute / 60.0
+
+
+DEFAULT_POLICY = RateLimitPolicy(
+    enabled=DBSystemFlags.__table__.c.rate_limit_enabled.default.arg,
+    requests_per_minute=DBSystemFlags.__table__.c.rate_limit_requests_per_minute.default.arg,
+)
+
+
+class MemoryBucketStore:
+    """In-process buckets: key -> [tokens, updated_at], in least-recently-used order."""
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, idle_seconds: float):
+        self.idle_seconds = idle_seconds
+        self._buckets: "OrderedDict[Tuple[str, str], list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def take(self, key: Tuple[str, str], policy: RateLimitPolicy, cost: int = 1) -> float:
+        """Consume `cost` tokens. Returns 0 when allowed, else seconds until they are available."""
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [policy.capacity, now]
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(policy.capacity, bucket[0] + (now - bucket[1]) * policy.refill_per_second)
+                bucket[1] = now
+            self._evict_idle(now)
+
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            return (cost - bucket[0]) / policy.refill_per_second
+
+    def _evict_idle(self, now: float):
+        """Drop buckets untouched for idle_seconds (oldest first). Caller holds the lock."""
+        cutoff = now - self.idle_seconds
+        while self._buckets:
+            key, bucket = next(iter(self._buckets.items()))
+            if bucket[1] > cutoff:
+                break
+            del self._buckets[key]
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBucketStore:
+    """
+    Buckets in a SQLite file shared by every worker process. Refill, consume
+    and the allowed/denied decision happen in one UPSERT, so concurrent
+    workers never lose an update. Uses wall-clock time, which all workers on
+    the host agree on.
+    """
+
+    clock = staticmethod(time.time)
+    # Idle rows are purged once every this many checks
+    purge_every = 1000
+
+    _TAKE = """
+        INSERT INTO rate_limit_buckets (key, tokens, updated_at, allowed)
+        VALUES (:key, :capacity - :cost, :now, 1)
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = CASE
+                WHEN min(:capacity, tokens + max(:now - updated_at, 0) * :rate) >= :cost
+                THEN min(:capacity, tokens + max(:now - updated_at, 0) * :rate) - :cost
+                ELSE min(:capacity, tokens + max(:now - updated_at, 0) * :rate)
+            END,
+            allowed = min(:capacity, tokens + max(:now - updated_at, 0) * :rate) >= :cost,
+            updated_at = :now
+        RETURNING tokens, allowed
+    """
+
+    def __init__(self, path: str, idle_seconds: float):
+        self.path = path
+        self.idle_seconds = idle_seconds
+        self._local = threading.local()
+        self._checks = 0
+        self.evictions = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL,"
+            " updated_at REAL NOT NULL, allowed INTEGER NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit: every statement below is atomic on its own
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: Tuple[str, str], policy: RateLimitPolicy, cost: int = 1) -> float:
+        now = self.clock()
+        conn = self._connection()
+        (tokens, allowed), = conn.execute(self._TAKE, {
+            "key": "\x1f".join(key),
+            "capacity": policy.capacity,
+            "rate": policy.refill_per_second,
+            "cost": cost,
+            "now": now,
+        }).fetchall()
+
+        self._checks += 1
+        if self._checks % self.purge_every == 0:
+            purged = conn.execute(
+                "DELETE FROM rate_limit_buckets WHERE updated_at < ?", (now - self.idle_seconds,)
+            )
+            self.evictions += purged.rowcount
+
+        if allowed:
+            return 0.0
+        return (cost - tokens) / policy.refill_per_second
+
+    def __len__(self):
+        return self._connection().execute("SELECT count(*) FROM rate_limit_buckets").fetchone()[0]
+
+    def clear(self):
+        self._connection().execute("DELETE FROM rate_limit_buckets")
+
+
+class TenantRateLimiter:
+    """Resolves the caller's policy and charges one request to its bucket."""
+
+    def __init__(self, store, refresh_seconds: float = 2.0):
+        self.store = store
+        self.refresh_seconds = refresh_seconds
+        # organization scope -> (policy, versions, checked_at)
+        self._policies: dict = {}
+        self._lock = threading.Lock()
+        self.denied = 0
+
+    def check(self, db: Optional[Session], organization_id: Optional[str], subject: str, cost: int = 1):
+        """Raise 429 (with Retry-After) once `subject` has used up its organization's limit."""
+        scope = organization_id or DEFAULT_FLAGS_SCOPE
+        policy = self.policy(db, scope)
+        if not policy.enabled or policy.requests_per_minute <= 0:
+            return
+
+        # A single charge can never exceed a full bucket
+        cost = min(cost, policy.requests_per_minute)
+        retry_after = self.store.take((scope, subject), policy, cost)
+        if retry_after:
+            self.denied += 1
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limit exceeded: {policy.requests_per_minute} per 1 minute",
+                headers={
+                    "Retry-After": str(math.ceil(retry_after)),
+                    "X-RateLimit-Limit": str(policy.requests_per_minute),
+                },
+            )
+
+    def policy(self, db: Optional[Session], scope: str) -> RateLimitPolicy:
+        now = time.monotonic()
+        cached = self._policies.get(scope)
+        if cached is not None and (db is None or now - cached[2] < self.refresh_seconds):
+            return cached[0]
+        if db is None:
+            return DEFAULT_POLICY
+
+        scopes = (scope, DEFAULT_FLAGS_SCOPE)
+        versions = tuple(resource_versions.get(db, s, FLAGS_RESOURCE) for s in scopes)
+        if cached is not None and cached[1] == versions:
+            policy = cached[0]
+        else:
+            policy = self._load(db, scopes)
+        with self._lock:
+            self._policies[scope] = (policy, versions, now)
+        return policy
+
+    @staticmethod
+    def _load(db: Session, scopes) -> RateLimitPolicy:
+        rows = {
+            row.organization_id: row
+            for row in db.execute(
+                select(DBSystemFlags).where(DBSystemFlags.organization_id.in_(set(scopes)))
+            ).scalars()
+        }
+        for scope in scopes:
+            row = rows.get(scope)
+            if row is not None:
+                return RateLimitPolicy(
+                    enabled=DEFAULT_POLICY.enabled if row.rate_limit_enabled is None else row.rate_limit_enabled,
+                    requests_per_minute=row.rate_limit_requests_per_minute or DEFAULT_POLICY.requests_per_minute,
+                )
+        return DEFAULT_POLICY
+
+    def invalidate(self, organization_id: Optional[str] = None):
+        """Forget cached policies; a change to the default row affects every organization."""
+        with self._lock:
+            if organization_id is None or organization_id == DEFAULT_FLAGS_SCOPE:
+                self._policies.clear()
+            else:
+                self._policies.pop(organization_id, None)
+
+    def clear(self):
+        self.invalidate()
+        self.store.clear()
+        self.denied = 0
+
+    def stats(self) -> dict:
+        return {
+            "store": "sqlite" if isinstance(self.store, SQLiteBucketStore) else "memory",
+            "activeKeys": len(self.store),
+            "evictions": self.store.evictions,
+            "denied": self.denied,
+        }
+
+
+def _default_store():
+    if system_config.RATE_LIMIT_STORE_PATH:
+        return SQLiteBucketStore(system_config.RATE_LIMIT_STORE_PATH, system_config.RATE_LIMIT_IDLE_SECONDS)
+    return MemoryBucketStore(system_config.RATE_LIMIT_IDLE_SECONDS)
+
+
+rate_limiter = TenantRateLimiter(
+    _default_store(), refresh_seconds=system_config.RESOURCE_VERSION_REFRESH_SECONDS
+)
@@ -1,6 +1,6 @@
 import json
 from datetime import datetime
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
@@ -21,6 +21,8 @@ class LoginRequest(BaseModel):
 
 
 class EducationCreate(BaseModel):
+    # Existing row to update; omitted for new rows (matched by natural key)
+    id: Optional[int] = None
     degree: str
     institute: str
     year: str
@@ -40,6 +42,7 @@ class Education(EducationCreate, AuditBase):
 
 
 class ExperienceCreate(BaseModel):
+    id: Optional[int] = None
     org_name: str = Field(..., alias="orgName")
     designation: str
     from_: str = Field(..., alias="from")
@@ -59,6 +62,7 @@ class Experience(ExperienceCreate, AuditBase):
 
 
 class FamilyCreate(BaseModel):
+    id: Optional[int] = None
     name: str
     relationship: str
     dob: str
@@ -72,6 +76,7 @@ class Family(FamilyCreate, AuditBase):
 
 
 class DisciplineCreate(BaseModel):
+    id: Optional[int] = None
     date: str
     description: str
     outcome: str
@@ -85,6 +90,7 @@ class Discipline(DisciplineCreate, AuditBase):
 
 
 class IncrementCreate(BaseModel):
+    id: Optional[int] = None
     effective_date: str = Field(..., alias="effectiveDate")
     new_gross: float = Field(..., alias="newGross")
     type: str  # increment_type
@@ -156,7 +162,8 @@ class EmployeeCreate(EmployeeBase):
         return data
 
 
-class Employee(EmployeeBase, AuditBase):
+class EmployeeHeader(EmployeeBase, AuditBase):
+    """Employee record without its child tabs."""
     id: str
     department_id: str | None = None
     designation_id: str | None = None
@@ -164,6 +171,23 @@ class Employee(EmployeeBase, AuditBase):
     plant_id: str | None = None
     shift_id: str | None = None
 
+    class Config:
+        from_attributes = True
+
+
+class EmployeeProfile(EmployeeHeader):
+    """GET /employees/{id}: the header plus only the tabs named in `include`."""
+    education: Optional[list["Education"]] = None
+    experience: Optional[list["Experience"]] = None
+    family: Optional[list["Family"]] = None
+    discipline: Optional[list["Discipline"]] = None
+    increments: Optional[list["Increment"]] = None
+
+    class Config:
+        from_attributes = True
+
+
+class Employee(EmployeeHeader):
     education: list["Education"] = []
     experience: list["Experience"] = []
     family: list["Family"] = []
@@ -850,6 +874,19 @@ class ApiKeyList(BaseModel):
     total: int
 
 
+class BatchItem(BaseModel):
+    """One read inside POST /api/v1/batch; `path` may omit the /api/v1 prefix"""
+
+    id: Optional[str] = None
+    method: Literal["GET"] = "GET"
+    path: str
+    headers: Optional[Dict[str, str]] = None
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(..., min_length=1)
+
+
 # ===== Webhook Schemas =====
 class WebhookBase(BaseModel):
     name: str
@@ -1249,6 +1286,31 @@ class Attendance(AttendanceCreate, AuditBase):
     class Config:
         from_attributes = True
 
+
+class AttendancePunch(BaseModel):
+    """One raw clock event from a terminal."""
+    employee_id: str = Field(..., alias="employeeId")
+    timestamp: datetime
+    device: Optional[str] = None
+
+    class Config:
+        populate_by_name = True
+
+
+class AttendancePunchBatch(BaseModel):
+    punches: List[AttendancePunch]
+
+
+class AttendancePunchResult(BaseModel):
+    received: int
+    accepted: int
+    days_upserted: int = Field(..., alias="daysUpserted")
+    rejected: List[dict] = []
+    devices: dict = {}
+
+    class Config:
+        populate_by_name = True
+
 # --- Payroll Schemas ---
 class PayrollLedgerCreate(BaseModel):
     employee_id: str = Field(..., alias="employeeId")
@@ -1291,6 +1353,21 @@ class LeaveRequest(LeaveRequestCreate, AuditBase):
     class Config:
         from_attributes = True
 
+class LeaveApprovalBatch(BaseModel):
+    leave_ids: List[str] = Field(..., alias="leaveIds")
+
+    class Config:
+        populate_by_name = True
+
+
+class LeaveApprovalResult(BaseModel):
+    approved: List[str]
+    skipped: List[dict] = []  # {"id", "reason"}: not found or no longer Pending
+    balances_updated: int = Field(..., alias="balancesUpdated")
+
+    class Config:
+        populate_by_name = True
+
 class LeaveBalanceCreate(BaseModel):
     employee_id: str = Field(..., alias="employeeId")
     year: int
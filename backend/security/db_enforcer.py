@@ -4,11 +4,35 @@ import os
 from backend.config import settings
 
 
-def enforce_clean_db_state():
+def _remove_unauthorized(f, auth_db, auth_db_path):
+    """Delete a legacy database file unless it is the authorized one. Returns True if removed."""
+    # Skip if it happens to be the authorized one
+    if os.path.basename(f) == auth_db:
+        return False
+
+    # Check if this "other" file is actually the authorized path
+    if os.path.abspath(f) == auth_db_path:
+        return False
+
+    # POLICY: STRICT DELETE
+    try:
+        os.remove(f)
+        print(f"🚫 [SECURITY] DELETED UNAUTHORIZED DB: {f}")
+        return True
+    except Exception as e:
+        print(f"⚠️ [SECURITY] ERROR deleting {f}: {e}")
+        return False
+
+
+def enforce_clean_db_state(fast=False):
     """
     Startup Check: Verifies the authorized database matches configuration.
     Any other database files found in the workspace are IGNORED (not used),
     ensuring the system strictly adheres to the Single Source of Truth.
+
+    `fast` (FAST_START) only looks where legacy databases were created - the
+    project root, backend/, the data directory and the working directory -
+    instead of walking the whole tree.
     """
     project_root = os.path.dirname(
         os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -42,31 +66,30 @@ def enforce_clean_db_state():
     # 2. Scan and Ignore others (Optimized)
     found_others = False
     target_filenames = {"hunzal_hrms.db", "sql_app.db"}
-    
-    # Use os.walk with extensive pruning to avoid scanning node_modules, .git, etc.
-    for root, dirs, files in os.walk(project_root, topdown=True):
-        # Prune heavy directories in-place
-        dirs[:] = [d for d in dirs if d not in {"node_modules", ".git", "venv", "__pycache__", ".idea", ".vscode"}]
-        
-        for name in files:
-            if name in target_filenames:
-                f = os.path.join(root, name)
-                
-                # Skip if it happens to be the authorized one
-                if os.path.basename(f) == auth_db:
-                    continue
-
-                # Check if this "other" file is actually the authorized path
-                if os.path.abspath(f) == auth_db_path:
-                    continue
-
-                # POLICY: STRICT DELETE
-                try:
-                    os.remove(f)
-                    print(f"🚫 [SECURITY] DELETED UNAUTHORIZED DB: {f}")
+
+    if fast:
+        candidate_dirs = {
+            project_root,
+            os.path.join(project_root, "backend"),
+            os.path.join(project_root, "backend", "data"),
+            os.path.dirname(auth_db_path),
+            os.getcwd(),
+        }
+        for directory in sorted(candidate_dirs):
+            for name in target_filenames:
+                f = os.path.join(directory, name)
+                if os.path.isfile(f) and _remove_unauthorized(f, auth_db, auth_db_path):
                     found_others = True
-                except Exception as e:
-                    print(f"⚠️ [SECURITY] ERROR deleting {f}: {e}")
+    else:
+        # Use os.walk with extensive pruning to avoid scanning node_modules, .git, etc.
+        for root, dirs, files in os.walk(project_root, topdown=True):
+            # Prune heavy directories in-place
+            dirs[:] = [d for d in dirs if d not in {"node_modules", ".git", "venv", "__pycache__", ".idea", ".vscode"}]
+
+            for name in files:
+                if name in target_filenames:
+                    if _remove_unauthorized(os.path.join(root, name), auth_db, auth_db_path):
+                        found_others = True
 
     if not found_others:
         print("--- [STARTUP] Environment clean (No conflicting files) ---")
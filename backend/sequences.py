@@ -0,0 +1,196 @@
+"""
+Id Sequences
+============
+Collision-free, human-readable ids (`EMP-ACME-LHR-000042`, `LR-ACME-000107`)
+from hi/lo block allocation.
+
+- Each (organization, plant, entity) has one counter row. A process
+  reserves `block_size` values with a single UPDATE ... RETURNING and hands
+  them out from memory, so creating a thousand employees costs
+  1000 / block_size round trips and never retries on a duplicate key.
+- Plant-scoped employee numbers live on the plant itself
+  (`core_locations.current_sequence`); every other counter is a row in
+  `core_id_sequences`, created on first use.
+- A reservation runs in the caller's transaction. Until that commits, the
+  new block is private to the session; after commit its unused values join
+  the process-wide pool, and after a rollback they are dropped together with
+  the counter update. A committed block is never handed out twice, so a
+  crash or rollback only leaves gaps. Ids taken in a transaction that rolls
+  back must therefore not be reused after the rollback.
+- The label is the organization (and plant) code in upper-case
+  alphanumerics. A code that had to be normalized gets a short hash of its
+  row id, so two counters never render the same prefix.
+"""
+
+import hashlib
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+
+from backend.config import system_config
+from backend.database import upsert_insert
+from backend.domains.core.models import DBHRPlant, DBIdSequence, DBOrganization
+
+# entity -> id prefix
+ID_PREFIXES = {
+    "employee": "EMP",
+    "leave_request": "LR",
+}
+NUMBER_WIDTH = 6
+
+# (organization_id, plant_id, entity)
+Key = Tuple[str, str, str]
+
+_PENDING = "id_sequence_blocks"
+
+
+class IdSequences:
+    """Process-wide hi/lo allocator over the counter rows."""
+
+    def __init__(self, block_size: int = 50):
+        self.block_size = max(1, block_size)
+        # key -> deque of [next, last] ranges, all committed
+        self._blocks: Dict[Key, deque] = {}
+        # key -> label rendered into the id (plant or organization code)
+        self._labels: Dict[Key, str] = {}
+        self._lock = threading.Lock()
+        self.reservations = 0
+
+    # --- public API ---
+
+    def next_id(self, db: Session, entity: str, organization_id: str = "", plant_id: str = "") -> str:
+        """One formatted id, e.g. `EMP-ACME-LHR-000042`."""
+        return self.take(db, entity, 1, organization_id, plant_id)[0]
+
+    def take(self, db: Session, entity: str, count: int, organization_id: str = "", plant_id: str = "") -> List[str]:
+        """`count` formatted ids, reserving as many blocks as needed."""
+        key = (organization_id or "", plant_id or "", entity)
+        values = self._take_values(db, key, count)
+        label = self._label(db, key)
+        parts = [ID_PREFIXES.get(entity, entity.upper())] + ([label] if label else [])
+        return ["-".join(parts + [f"{value:0{NUMBER_WIDTH}d}"]) for value in values]
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+            self._labels.clear()
+
+    # --- blocks ---
+
+    def _take_values(self, db: Session, key: Key, count: int) -> List[int]:
+        values: List[int] = []
+        pending = db.info.setdefault(_PENDING, {})
+        while len(values) < count:
+            # Blocks this session reserved itself come first, then the shared pool
+            block = _pop(pending.get(key), count - len(values))
+            if block is None:
+                with self._lock:
+                    block = _pop(self._blocks.get(key), count - len(values))
+            if block is None:
+                self._reserve(db, key, max(self.block_size, count - len(values)))
+                continue
+            values.extend(block)
+        return values
+
+    def _reserve(self, db: Session, key: Key, size: int):
+        """Move the counter forward by `size` in the caller's transaction."""
+        last = self._advance(db, key, size)
+        self.reservations += 1
+        db.info[_PENDING].setdefault(key, deque()).append([last - size + 1, last])
+        self._watch(db)
+
+    def _advance(self, db: Session, key: Key, size: int) -> int:
+        organization_id, plant_id, entity = key
+        if entity == "employee" and plant_id:
+            last = db.execute(
+                update(DBHRPlant)
+                .where(DBHRPlant.id == plant_id)
+                .values(current_sequence=func.coalesce(DBHRPlant.current_sequence, 0) + size)
+                .returning(DBHRPlant.current_sequence)
+            ).scalar()
+            if last is not None:
+                return last
+        table = DBIdSequence.__table__
+        insert = upsert_insert(db)
+        stmt = insert(table).values(
+            organization_id=organization_id, plant_id=plant_id, entity=entity, last_value=size
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.organization_id, table.c.plant_id, table.c.entity],
+            set_={"last_value": table.c.last_value + size},
+        ).returning(table.c.last_value)
+        return db.execute(stmt).scalar()
+
+    def _watch(self, db: Session):
+        if db.info.get(f"{_PENDING}_watched"):
+            return
+        db.info[f"{_PENDING}_watched"] = True
+        event.listen(db, "after_commit", self._publish)
+        event.listen(db, "after_rollback", self._discard)
+
+    def _publish(self, db: Session):
+        """The reservations are durable: share what the session did not use."""
+        pending = db.info.get(_PENDING) or {}
+        with self._lock:
+            for key, blocks in pending.items():
+                self._blocks.setdefault(key, deque()).extend(blocks)
+        pending.clear()
+
+    def _discard(self, db: Session):
+        # The counter update rolled back with the transaction; the values are free again
+        (db.info.get(_PENDING) or {}).clear()
+
+    # --- labels ---
+
+    def _label(self, db: Session, key: Key) -> str:
+        """Organization code, plus the plant code for plant-scoped counters."""
+        label = self._labels.get(key)
+        if label is None:
+            organization_id, plant_id, _ = key
+            parts = []
+            if organization_id:
+                code = db.execute(
+                    select(DBOrganization.code).where(DBOrganization.id == organization_id)
+                ).scalar()
+                parts.append(_segment(code or organization_id, organization_id))
+            if plant_id:
+                code = db.execute(select(DBHRPlant.code).where(DBHRPlant.id == plant_id)).scalar()
+                parts.append(_segment(code or plant_id, plant_id))
+            label = "-".join(parts)
+            self._labels[key] = label
+        return label
+
+
+def _segment(code: str, source_id: str) -> str:
+    """
+    One label segment: the code itself when it is already upper-case
+    alphanumeric. Otherwise the normalized code plus `_` and a short hash of
+    the row id, so codes such as `A-B` and `AB` (or `acme` and `ACME`) never
+    render alike. `_` cannot occur in a plain segment, and dashes only ever
+    separate segments.
+    """
+    normalized = "".join(ch for ch in code.upper() if ch.isalnum())
+    if normalized == code:
+        return normalized
+    digest = hashlib.sha1(source_id.encode("utf-8")).hexdigest()[:6].upper()
+    return f"{normalized}_{digest}"
+
+
+def _pop(blocks: Optional[deque], count: int) -> Optional[List[int]]:
+    """Take up to `count` values from the first non-empty range."""
+    while blocks:
+        block = blocks[0]
+        if block[0] > block[1]:
+            blocks.popleft()
+            continue
+        end = min(block[1], block[0] + count - 1)
+        values = list(range(block[0], end + 1))
+        block[0] = end + 1
+        return values
+    return None
+
+
+id_sequences = IdSequences(block_size=system_config.ID_BLOCK_SIZE)
@@ -0,0 +1,195 @@
+"""
+Fast JSON Responses
+===================
+Opt-in replacement for FastAPI's `response_model` serialization on large
+list endpoints. The default path validates every ORM object into a Pydantic
+model (`from_attributes`), dumps it back to Python primitives and then runs
+the stdlib `json` encoder over the result.
+
+`ResponseSerializer` is built once per response schema and renders straight
+to bytes, in one of two modes:
+
+- ``validated``: a precompiled TypeAdapter validates and dumps to JSON in
+  pydantic-core, skipping the intermediate dict and the stdlib encoder.
+- ``trusted``: rows loaded from our own tables are trusted to already match
+  the schema, so validation is skipped entirely: a precompiled field plan
+  reads the attributes and the result goes to orjson (stdlib json if orjson
+  is not installed). Schemas with validators are never trusted; they fall
+  back to ``validated``.
+
+Routes keep their `response_model`, so the OpenAPI contract is unchanged;
+FastAPI skips its own serialization when a Response is returned.
+`FAST_JSON_MODE` defaults to ``off`` (the stock path everywhere). Only
+``validated`` keeps the contract enforced on every row; ``trusted`` emits
+whatever the ORM holds (a string where the schema says int, null for a
+required field) and is an explicit per-deployment opt-in.
+"""
+
+import datetime
+import decimal
+import enum
+import json
+import types
+import typing
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+from backend.config import system_config
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON bytes via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; pre-rendered bytes pass through untouched."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+# --- Trusted field plans ---
+# A plan is a tuple of (output key, attribute names to try, default, nested)
+# where nested is None for scalars, or ("model" | "list", sub-plan).
+
+def _unwrap(annotation) -> Tuple[Optional[str], Any]:
+    """Return ("list" | "model" | None, model class) for a field annotation."""
+    origin = typing.get_origin(annotation)
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    if origin in (list, List) and args:
+        kind, model = _unwrap(args[0])
+        return ("list", model) if kind == "model" else (None, None)
+    if origin in (typing.Union, types.UnionType):
+        return _unwrap(args[0]) if len(args) == 1 else (None, None)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return "model", annotation
+    return None, None
+
+
+def _has_validators(model: type) -> bool:
+    decorators = model.__pydantic_decorators__
+    return bool(
+        decorators.field_validators or decorators.model_validators
+        or decorators.validators or decorators.root_validators
+        or decorators.field_serializers or decorators.model_serializers
+        or decorators.computed_fields
+    )
+
+
+@lru_cache(maxsize=None)
+def _plan(model: type):
+    """Field plan for trusted rendering, or None if the model has validators."""
+    if _has_validators(model):
+        return None
+    plan = []
+    for name, info in model.model_fields.items():
+        kind, nested_model = _unwrap(info.annotation)
+        nested = None
+        if kind:
+            sub_plan = _plan(nested_model)
+            if sub_plan is None:
+                return None
+            nested = (kind, sub_plan)
+        default = None if info.is_required() else info.get_default(call_default_factory=True)
+        # from_attributes looks up the alias first, then the field name
+        names = (info.alias, name) if info.alias else (name,)
+        plan.append((info.alias or name, names, default, nested))
+    return tuple(plan)
+
+
+_MISSING = object()
+
+
+def _extract(obj, plan) -> dict:
+    out = {}
+    for key, names, default, nested in plan:
+        value = _MISSING
+        for attr in names:
+            value = getattr(obj, attr, _MISSING)
+            if value is not _MISSING:
+                break
+        if value is _MISSING:
+            value = default
+        if nested is not None and value is not None:
+            kind, sub_plan = nested
+            if kind == "list":
+                value = [_extract(item, sub_plan) for item in value]
+            else:
+                value = _extract(value, sub_plan)
+        out[key] = value
+    return out
+
+
+class ResponseSerializer:
+    """Precompiled JSON serializer for one response schema (a model or List[model])."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.adapter = TypeAdapter(schema)
+        kind, model = _unwrap(schema)
+        self.many = kind == "list"
+        self.plan = _plan(model) if kind else None
+
+    @property
+    def trusted(self) -> bool:
+        return self.plan is not None
+
+    def validated_json(self, content) -> bytes:
+        value = self.adapter.validate_python(content, from_attributes=True)
+        return self.adapter.dump_json(value, by_alias=True)
+
+    def trusted_json(self, content) -> bytes:
+        if self.plan is None:
+            return self.validated_json(content)
+        if self.many:
+            return dumps([_extract(row, self.plan) for row in content])
+        return dumps(_extract(content, self.plan))
+
+    def render(self, content, mode: Optional[str] = None) -> bytes:
+        mode = mode or system_config.FAST_JSON_MODE
+        return self.trusted_json(content) if mode == "trusted" else self.validated_json(content)
+
+
+@lru_cache(maxsize=None)
+def serializer_for(schema) -> ResponseSerializer:
+    return ResponseSerializer(schema)
+
+
+def fast_response(schema, content, response: Optional[Response] = None):
+    """
+    Render `content` for `schema` into a FastJSONResponse, carrying over any
+    headers already set on the injected `response`. Returns `content`
+    unchanged when FAST_JSON_MODE is off, leaving FastAPI to serialize it.
+    """
+    if system_config.FAST_JSON_MODE not in ("validated", "trusted"):
+        return content
+    rendered = FastJSONResponse(content=serializer_for(schema).render(content))
+    if response is not None:
+        rendered.raw_headers.extend(
+            (name, value) for name, value in response.raw_headers
+            if name not in (b"content-length", b"content-type")
+        )
+    return rendered
@@ -0,0 +1,156 @@
+"""
+Startup Profiling
+=================
+Times each phase of the API process's startup and serves the result at
+`GET /api/v1/system/startup-report`.
+
+Fast-start mode (`FAST_START=1`) trims cold starts under autoscaling and
+rolling restarts:
+- the legacy-database check looks in the known locations only, instead of
+  walking the project tree (`enforce_clean_db_state(fast=True)`);
+- `create_all` is skipped when the fingerprint of the model metadata matches
+  the one stored in `core_schema_state` by the last run that created it;
+- the audit scheduler is started after the first request has been served
+  (`DeferredStartMiddleware`).
+"""
+
+import datetime
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_STATE_ID = "metadata"
+
+
+def schema_fingerprint(metadata) -> str:
+    """Stable hash of the tables, columns and indexes declared in `metadata`."""
+    digest = hashlib.sha256()
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        digest.update(f"table:{table.name}\n".encode())
+        for column in table.columns:
+            digest.update(
+                f"col:{column.name}:{column.type!r}:{column.nullable}:{column.primary_key}\n".encode()
+            )
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            columns = ",".join(c.name for c in index.columns)
+            digest.update(f"idx:{index.name}:{columns}:{index.unique}\n".encode())
+    return digest.hexdigest()
+
+
+def stored_fingerprint(engine) -> Optional[str]:
+    from backend.domains.core.models import DBSchemaState
+
+    try:
+        with Session(engine) as db:
+            return db.execute(
+                select(DBSchemaState.fingerprint).where(DBSchemaState.id == SCHEMA_STATE_ID)
+            ).scalar()
+    except Exception:  # table not created yet
+        return None
+
+
+def ensure_schema(engine, metadata, fast: bool) -> str:
+    """create_all unless fast-start finds the stored fingerprint current; returns the action taken."""
+    from backend.domains.core.models import DBSchemaState
+
+    fingerprint = schema_fingerprint(metadata)
+    if fast and stored_fingerprint(engine) == fingerprint:
+        return "skipped"
+    metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        db.merge(DBSchemaState(id=SCHEMA_STATE_ID, fingerprint=fingerprint))
+        db.commit()
+    return "created"
+
+
+class StartupProfiler:
+    """Phase timings for one process start, plus work deferred to the first request."""
+
+    def __init__(self):
+        self.mode = "standard"
+        self.started_at = datetime.datetime.utcnow()
+        self.phases: List[dict] = []
+        self._deferred: List[Tuple[str, Callable[[], None]]] = []
+        self._lock = threading.Lock()
+
+    def begin(self, mode: str):
+        """Start a new report (a test client may run startup more than once); import timing is kept."""
+        self.mode = mode
+        self.started_at = datetime.datetime.utcnow()
+        self.phases = [p for p in self.phases if p["name"] == "imports"]
+        with self._lock:
+            self._deferred = []
+
+    def record(self, name: str, started: float, status: str = "ok", detail: Optional[str] = None):
+        entry = {"name": name, "ms": round((time.perf_counter() - started) * 1000, 2), "status": status}
+        if detail is not None:
+            entry["detail"] = detail
+        self.phases.append(entry)
+        return entry
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block; the yielded dict's "detail" ends up in the report."""
+        started = time.perf_counter()
+        info: dict = {}
+        try:
+            yield info
+        except Exception as e:
+            self.record(name, started, "failed", str(e))
+            raise
+        self.record(name, started, info.get("status", "ok"), info.get("detail"))
+
+    def defer(self, name: str, fn: Callable[[], None]):
+        """Run `fn` (in a worker thread) once the first request has been served."""
+        with self._lock:
+            self._deferred.append((name, fn))
+
+    def has_deferred(self) -> bool:
+        return bool(self._deferred)
+
+    def take_deferred(self) -> List[Tuple[str, Callable[[], None]]]:
+        with self._lock:
+            pending, self._deferred = self._deferred, []
+        return pending
+
+    def report(self) -> dict:
+        with self._lock:
+            deferred = [name for name, _ in self._deferred]
+        return {
+            "mode": self.mode,
+            "startedAt": self.started_at.isoformat() + "Z",
+            "totalMs": round(sum(p["ms"] for p in self.phases if not p["name"].endswith("(deferred)")), 2),
+            "phases": list(self.phases),
+            "pendingDeferred": deferred,
+        }
+
+
+class DeferredStartMiddleware:
+    """Runs the profiler's deferred startup work after the first HTTP response."""
+
+    def __init__(self, app, profiler: StartupProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+        if scope["type"] != "http" or not self.profiler.has_deferred():
+            return
+        for name, fn in self.profiler.take_deferred():
+            try:
+                with self.profiler.phase(f"{name} (deferred)"):
+                    await run_in_threadpool(fn)
+            except Exception as e:
+                logger.error(f"Deferred startup step '{name}' failed: {e}")
+
+
+startup_profiler = StartupProfiler()
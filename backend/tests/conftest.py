@@ -1,6 +1,9 @@
 import pytest
+from typing import Optional
+from fastapi import Depends, Request
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 import sys
@@ -13,17 +16,30 @@ os.environ["APP_ENV"] = "test"
 # Add backend to path (if not already handled by pytest pythonpath)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.database import Base
-from backend.main import app, get_db
+from backend.database import Base, configure_sqlite
+from backend.dependencies import api_key_header, get_current_user, get_current_user_async, oauth2_scheme
+from backend.main import app, get_async_db, get_db, get_writer_sessions
+from backend.query_stats import instrument_engine
+from backend.sequences import id_sequences
 
-# Use in-memory SQLite for tests - now handled by DATABASE_URL env var
-SQLALCHEMY_DATABASE_URL = os.environ["DATABASE_URL"]
+# Named shared-cache in-memory database, so the sync engine and the async
+# (aiosqlite) engine used by the async read endpoints see the same tables.
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:people_os_test?mode=memory&cache=shared&uri=true"
+ASYNC_SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False},
     poolclass=StaticPool # Add StaticPool for in-memory
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=StaticPool)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+# Read-only like the app's async engine: a write on the async path fails loudly
+configure_sqlite(async_engine.sync_engine, file_backed=False, read_only=True)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False, info={"read_only": True}
+)
 
 
 @pytest.fixture(scope="function")
@@ -35,8 +51,9 @@ def db():
         yield db
     finally:
         db.close()
-        # Drop tables after tests
+        # Drop tables after tests; reserved id blocks went with them
         Base.metadata.drop_all(bind=engine)
+        id_sequences.clear()
 
 
 @pytest.fixture(scope="function")
@@ -51,8 +68,42 @@ def client():
         finally:
             db.close()
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
+    async def follow_get_current_user(
+        request: Request,
+        token: Optional[str] = Depends(oauth2_scheme),
+        db=Depends(get_async_db),
+        api_key: Optional[str] = Depends(api_key_header),
+        writer_sessions=Depends(get_writer_sessions),
+    ):
+        # Tests fake the caller by overriding get_current_user; async routes see the same user
+        fake = app.dependency_overrides.get(get_current_user)
+        if fake is not None:
+            return fake()
+        return await get_current_user_async(request, token, db, api_key, writer_sessions)
+
+    async def override_get_writer_sessions():
+        return TestingSessionLocal
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_user_async] = follow_get_current_user
+    app.dependency_overrides[get_writer_sessions] = override_get_writer_sessions
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
     Base.metadata.drop_all(bind=engine)
+    id_sequences.clear()
+
+
+@pytest.fixture(scope="function")
+def client_db(client):
+    # Seed / inspect the database `client` serves; closed before its tables are dropped
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
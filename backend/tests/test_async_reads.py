@@ -0,0 +1,102 @@
+"""
+Async Read Path Tests
+Hot read endpoints served from the AsyncSession (aiosqlite in tests).
+"""
+
+import inspect
+
+import anyio.to_thread
+import pytest
+
+from backend.database import async_database_url
+from backend.dependencies import create_access_token, get_current_user
+from backend.domains.core.models import DBHRPlant, DBOrganization, DBPlantDivision, DBUser
+from backend.domains.hcm.models import DBAttendance, DBEducation, DBEmployee, DBLeaveRequest
+from backend.main import app
+from backend.principal_cache import principal_cache
+
+ASYNC_ROUTES = [
+    "/api/v1/employees", "/api/v1/employees/{employee_id}", "/api/v1/organizations",
+    "/api/v1/plants", "/api/v1/departments", "/api/v1/grades", "/api/v1/designations",
+    "/api/v1/shifts", "/api/v1/hcm/attendance", "/api/v1/hcm/leaves", "/api/v1/health",
+]
+
+
+@pytest.fixture
+def seeded(client_db):
+    client_db.add(DBOrganization(id="ORG-1", code="O1", name="Org One"))
+    client_db.add(DBHRPlant(id="PL-1", name="Plant", code="P1", organization_id="ORG-1"))
+    client_db.add(DBPlantDivision(id="DV-1", plant_id="PL-1", name="Assembly", code="D1"))
+    client_db.add(DBEmployee(id="E1", name="Ayesha", email="a@x.com", status="Active",
+                             organization_id="ORG-1"))
+    client_db.add(DBEducation(employee_id="E1", degree="BSc", institute="Uni", passing_year="2015",
+                              score="A", marks_obtained=800, total_marks=1000))
+    client_db.add(DBAttendance(employee_id="E1", date="2025-03-01", status="Present"))
+    client_db.add(DBLeaveRequest(id="LR-1", employee_id="E1", type="Annual",
+                                 start_date="2025-03-10", end_date="2025-03-11", reason="Trip"))
+    client_db.commit()
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "Root", "organization_id": "ORG-1"}
+    yield client_db
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_hot_reads_are_coroutines():
+    endpoints = {route.path: route.endpoint for route in app.routes if "GET" in getattr(route, "methods", ())}
+    assert all(inspect.iscoroutinefunction(endpoints[path]) for path in ASYNC_ROUTES)
+
+
+def test_relationships_are_loaded_before_leaving_the_session(client, seeded):
+    # Lazy loads after run_sync would fail with MissingGreenlet
+    employee = client.get("/api/v1/employees/E1?include=education").json()
+    assert employee["education"][0]["degree"] == "BSc"
+
+    plants = client.get("/api/v1/plants").json()
+    assert [d["name"] for d in plants[0]["divisions"]] == ["Assembly"]
+
+    leaves = client.get("/api/v1/hcm/leaves").json()
+    assert leaves[0]["id"] == "LR-1"
+
+
+def test_list_headers_still_set(client, seeded):
+    res = client.get("/api/v1/hcm/attendance?limit=1&include_total=true")
+    assert res.status_code == 200
+    assert res.headers["X-Total-Count"] == "1"
+    assert client.get("/api/v1/employees?view=summary&fields=name").json() == [{"id": "E1", "name": "Ayesha"}]
+
+
+def test_auth_permission_and_etag_stay_off_the_threadpool(client, seeded, monkeypatch):
+    # Real token auth, permission matrix and ETag lookups, all on the AsyncSession
+    app.dependency_overrides.pop(get_current_user, None)
+    # Real lookups move the shared cache counters other tests assert on
+    monkeypatch.setattr(principal_cache, "hits", principal_cache.hits)
+    monkeypatch.setattr(principal_cache, "misses", principal_cache.misses)
+    seeded.add(DBUser(id="U-1", username="reader", role="Root", organization_id="ORG-1"))
+    seeded.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'reader'})}"}
+
+    offloaded = []
+    run_sync = anyio.to_thread.run_sync
+
+    async def counting_run_sync(func, *args, **kwargs):
+        offloaded.append(getattr(func, "__name__", repr(func)))
+        return await run_sync(func, *args, **kwargs)
+
+    monkeypatch.setattr(anyio.to_thread, "run_sync", counting_run_sync)
+    for path in ("/api/v1/employees", "/api/v1/plants", "/api/v1/departments", "/api/v1/hcm/leaves"):
+        assert client.get(path, headers=headers).status_code == 200
+    assert offloaded == []
+
+
+def test_health_uses_async_session(client):
+    assert client.get("/api/v1/health").json()["database"] == "Connected"
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("sqlite:///data/people_os.db", "sqlite+aiosqlite:///data/people_os.db"),
+    ("sqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+    ("postgresql://u:p@db/hr", "postgresql+asyncpg://u:p@db/hr"),
+    ("postgresql+psycopg2://u:p@db/hr", "postgresql+asyncpg://u:p@db/hr"),
+    ("sqlite+aiosqlite:///x.db", "sqlite+aiosqlite:///x.db"),
+])
+def test_async_database_url(url, expected):
+    assert async_database_url(url) == expected
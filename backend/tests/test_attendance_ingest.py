@@ -0,0 +1,96 @@
+"""
+Attendance Punch Ingest Tests
+Set-based upsert of terminal punches into hcm_attendance.
+"""
+
+import random
+from datetime import datetime
+
+from backend import crud, schemas
+from backend.dependencies import get_current_user
+from backend.domains.hcm.models import DBAttendance, DBEmployee
+from backend.main import app
+
+
+def _punch(emp, ts, device="T1"):
+    return schemas.AttendancePunch(employeeId=emp, timestamp=datetime.fromisoformat(ts), device=device)
+
+
+def _seed(db, *ids):
+    for emp in ids:
+        db.add(DBEmployee(id=emp, name=emp, email=f"{emp}@x.com"))
+    db.commit()
+
+
+def _day(db, emp, date):
+    row = db.query(DBAttendance).filter_by(employee_id=emp, date=date).one()
+    db.refresh(row)
+    return row.clock_in, row.clock_out, row.status
+
+
+def test_punches_fold_into_one_row_per_day(db):
+    _seed(db, "E1", "E2")
+    punches = [
+        _punch("E1", "2025-04-01T17:02:00"),
+        _punch("E1", "2025-04-01T08:55:10"),
+        _punch("E1", "2025-04-01T12:30:00", device="T2"),
+        _punch("E2", "2025-04-01T09:00:00"),
+        _punch("E1", "2025-04-02T09:01:00"),
+        _punch("GHOST", "2025-04-01T09:00:00"),
+    ]
+    result = crud.ingest_attendance_punches(db, punches, "terminal", chunk_size=2)
+
+    assert result["accepted"] == 5
+    assert result["days_upserted"] == 3
+    assert result["rejected"] == [{"index": 5, "employeeId": "GHOST", "error": "Unknown employee"}]
+    assert result["devices"] == {"T1": 4, "T2": 1}
+    assert _day(db, "E1", "2025-04-01") == ("08:55:10", "17:02:00", "Present")
+    assert _day(db, "E2", "2025-04-01") == ("09:00:00", None, "Present")
+
+
+def test_redelivery_and_reordering_are_idempotent(db):
+    _seed(db, "E1")
+    punches = [_punch("E1", f"2025-04-01T{h:02d}:00:00") for h in (8, 12, 18)]
+    crud.ingest_attendance_punches(db, punches, "terminal")
+    shuffled = punches[:]
+    random.Random(7).shuffle(shuffled)
+    # later deliveries one punch at a time, including exact duplicates
+    for punch in shuffled + punches:
+        crud.ingest_attendance_punches(db, [punch], "terminal")
+
+    assert db.query(DBAttendance).count() == 1
+    assert _day(db, "E1", "2025-04-01") == ("08:00:00", "18:00:00", "Present")
+
+
+def test_late_earlier_punch_extends_the_day_and_keeps_manual_status(db):
+    _seed(db, "E1")
+    db.add(DBAttendance(employee_id="E1", date="2025-04-01", clock_in="09:00:00", status="Late"))
+    db.commit()
+    crud.ingest_attendance_punches(db, [_punch("E1", "2025-04-01T07:45:00")], "terminal")
+    assert _day(db, "E1", "2025-04-01") == ("07:45:00", "09:00:00", "Late")
+
+
+def test_punch_endpoint(client):
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "Root"}
+    try:
+        res = client.post("/api/v1/hcm/attendance/punches", json={
+            "punches": [{"employeeId": "NOPE", "timestamp": "2025-04-01T09:00:00", "device": "T9"}]
+        })
+        assert res.status_code == 200
+        assert res.json()["daysUpserted"] == 0
+        assert res.json()["rejected"][0]["employeeId"] == "NOPE"
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_duplicate_day_post_is_a_conflict(client, client_db):
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "Root"}
+    _seed(client_db, "E1")
+    record = {"employeeId": "E1", "date": "2025-04-01", "clockIn": "09:00:00", "status": "Present"}
+    try:
+        assert client.post("/api/v1/hcm/attendance", json=record).status_code == 200
+        res = client.post("/api/v1/hcm/attendance", json={**record, "clockIn": "09:30:00"})
+        assert res.status_code == 409
+        assert "already exists" in res.json()["detail"]
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
@@ -0,0 +1,133 @@
+"""
+Batch Endpoint Tests
+Multiplexed GETs: per-item status, principal resolved once, ETags and limits.
+"""
+
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend import dependencies
+from backend.config import system_config
+from backend.database import Base, configure_sqlite
+from backend.dependencies import create_access_token, get_current_user, get_db, get_writer_sessions
+from backend.domains.core.models import DBOrganization, DBUser
+from backend.domains.hcm.models import DBEmployee
+from backend.main import app
+from backend.principal_cache import principal_cache
+from backend.rate_limiter import rate_limiter
+from backend.versioning import resource_versions
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+    rate_limiter.clear()
+    resource_versions.clear()
+
+
+@pytest.fixture
+def admin(client):
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "Root", "organization_id": "ORG-1"}
+    yield client
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def _seed(db):
+    db.add(DBOrganization(id="ORG-1", name="Org", code="ORG1"))
+    db.add(DBUser(id="u1", username="root", password_hash="x", role="Root",
+                  organization_id="ORG-1", is_active=True))
+    db.add(DBEmployee(id="E1", name="Emp", email="e@x.com", status="Active", organization_id="ORG-1"))
+    db.commit()
+
+
+def test_items_are_multiplexed_in_request_order(client, client_db):
+    _seed(client_db)
+    token = create_access_token({"sub": "root"})
+    res = client.post("/api/v1/batch", headers={"Authorization": f"Bearer {token}"}, json={"requests": [
+        {"id": "emp", "path": "/employees/E1"},
+        {"id": "plants", "path": "/api/v1/plants"},
+        {"id": "health", "path": "health"},
+        {"id": "missing", "path": "/no-such-route"},
+    ]})
+    assert res.status_code == 200
+    items = res.json()["responses"]
+    assert [i["id"] for i in items] == ["emp", "plants", "health", "missing"]
+    assert [i["status"] for i in items] == [200, 200, 200, 404]
+    assert items[0]["body"]["name"] == "Emp"
+    assert items[1]["body"] == []
+    assert "etag" in items[1]["headers"]
+    # authenticated once for the whole batch: sub-requests never reach the principal cache
+    assert principal_cache.stats()["misses"] == 1
+    assert principal_cache.stats()["hits"] == 0
+
+
+def test_sub_request_honours_conditional_headers(admin):
+    client = admin
+    first = client.post("/api/v1/batch", json={"requests": [{"path": "/plants"}]}).json()["responses"][0]
+    etag = first["headers"]["etag"]
+    again = client.post("/api/v1/batch", json={"requests": [
+        {"path": "/plants", "headers": {"If-None-Match": etag}},
+    ]}).json()["responses"][0]
+    assert again["id"] == "0"
+    assert again["status"] == 304
+    assert again["body"] is None
+
+
+def test_only_api_reads_are_allowed(admin):
+    client = admin
+    items = client.post("/api/v1/batch", json={"requests": [
+        {"path": "/api/v1/batch"},
+        {"path": "/api/auth/login"},
+    ]}).json()["responses"]
+    assert [i["status"] for i in items] == [400, 400]
+    res = client.post("/api/v1/batch", json={"requests": [{"method": "POST", "path": "/plants"}]})
+    assert res.status_code == 422
+
+
+def test_batch_size_is_capped(admin, monkeypatch):
+    client = admin
+    monkeypatch.setattr(system_config, "BATCH_MAX_REQUESTS", 2)
+    res = client.post("/api/v1/batch", json={"requests": [{"path": "/health"}] * 3})
+    assert res.status_code == 400
+
+
+@pytest.fixture
+def file_sqlite(client, tmp_path, monkeypatch):
+    """The production engine layout on a file: one writer connection with a short pool timeout, plus readers."""
+    url = f"sqlite:///{tmp_path / 'batch.db'}"
+    writer = create_engine(url, connect_args={"check_same_thread": False}, pool_size=1, max_overflow=0, pool_timeout=1)
+    reader = create_engine(url, connect_args={"check_same_thread": False})
+    configure_sqlite(writer, file_backed=True)
+    configure_sqlite(reader, file_backed=True, read_only=True)
+    Base.metadata.create_all(bind=writer)
+    writers = sessionmaker(bind=writer, autoflush=False)
+    monkeypatch.setattr(dependencies, "SessionLocal", writers)
+    monkeypatch.setattr(dependencies, "ReadSessionLocal", sessionmaker(bind=reader, autoflush=False, info={"read_only": True}))
+    # The real get_db picks the session, so the batch's own auth session is exercised
+    overrides = {dep: app.dependency_overrides.pop(dep) for dep in (get_db, get_writer_sessions)}
+    with writers() as db:
+        db.add(DBOrganization(id="ORG-1", name="Org", code="ORG1"))
+        db.add(DBUser(id="u1", username="root", password_hash="x", role="Root", organization_id="ORG-1", is_active=True))
+        db.commit()
+    yield client
+    app.dependency_overrides.update(overrides)
+    writer.dispose()
+    reader.dispose()
+
+
+def test_batch_does_not_hold_the_writer_connection(file_sqlite):
+    token = create_access_token({"sub": "root"})
+    started = time.perf_counter()
+    res = file_sqlite.post("/api/v1/batch", headers={"Authorization": f"Bearer {token}"}, json={"requests": [
+        {"id": "settings", "path": "/payroll-settings"},  # @writes_on_read: needs the writer
+        {"id": "health", "path": "/health"},
+    ]})
+    assert res.status_code == 200
+    assert [i["status"] for i in res.json()["responses"]] == [200, 200]
+    assert res.json()["responses"][0]["body"]["currency"] == "PKR"
+    assert time.perf_counter() - started < 1  # never waited out the writer's pool timeout
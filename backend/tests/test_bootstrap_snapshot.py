@@ -0,0 +1,91 @@
+"""
+Organization Bootstrap Snapshot Tests
+Cached document, section-level rebuilds, ETag revalidation and org isolation.
+"""
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend import crud, schemas
+from backend.bootstrap_snapshot import bootstrap_snapshots
+from backend.dependencies import _WRITES_ON_READ, get_current_user, get_writer_sessions
+from backend.domains.core.models import DBOrganization, DBPayrollSettings
+from backend.main import app, get_organization_bootstrap
+from backend.versioning import resource_versions
+
+URL = "/api/v1/organizations/ORG-1/bootstrap"
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    bootstrap_snapshots.clear()
+    yield
+    bootstrap_snapshots.clear()
+    resource_versions.clear()
+
+
+@pytest.fixture
+def session(client_db):
+    client_db.add(DBOrganization(id="ORG-1", name="Org", code="ORG1"))
+    client_db.commit()
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "HRManager", "organization_id": "ORG-1"}
+    yield client_db
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_document_is_served_from_cache(client, session):
+    first = client.get(URL)
+    assert first.status_code == 200
+    body = first.json()
+    assert body["profile"]["name"] == "Org"
+    assert body["grades"] == [] and body["plants"] == []
+    assert "payrollSettings" in body
+    builds = bootstrap_snapshots.builds
+
+    second = client.get(URL)
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert bootstrap_snapshots.builds == builds
+
+
+def test_write_rebuilds_only_the_stale_section(client, session):
+    before = client.get(URL)
+    section_builds = bootstrap_snapshots.section_builds
+
+    crud.create_department(session, schemas.DepartmentCreate(code="ops", name="Operations", organizationId="ORG-1"), "admin")
+    after = client.get(URL)
+    assert after.headers["etag"] != before.headers["etag"]
+    assert [d["name"] for d in after.json()["departments"]] == ["Operations"]
+    assert bootstrap_snapshots.section_builds == section_builds + 1
+
+
+def test_matching_etag_returns_304(client, session):
+    etag = client.get(URL).headers["etag"]
+    res = client.get(URL, headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.headers["etag"] == etag
+
+
+def test_other_organizations_are_forbidden(client, session):
+    assert client.get("/api/v1/organizations/ORG-2/bootstrap").status_code == 403
+    app.dependency_overrides[get_current_user] = lambda: {"id": "r", "role": "Root", "organization_id": "ORG-1"}
+    assert client.get("/api/v1/organizations/ORG-2/bootstrap").status_code == 404
+
+
+def test_missing_payroll_settings_are_created_once_on_a_writer_session(client, session):
+    opened = []
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=session.get_bind())
+
+    def counting():
+        opened.append(1)
+        return factory()
+
+    app.dependency_overrides[get_writer_sessions] = lambda: counting
+    assert get_organization_bootstrap not in _WRITES_ON_READ
+
+    body = client.get(URL).json()
+    assert body["payrollSettings"]["currency"] == "PKR"
+    assert client.get(URL).json() == body
+    assert opened == [1]
+    assert session.query(DBPayrollSettings).filter_by(organization_id="ORG-1").count() == 1
+
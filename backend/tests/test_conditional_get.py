@@ -0,0 +1,69 @@
+"""
+Conditional GET Tests
+ETag / If-None-Match on org-setup reference listings.
+"""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from backend import crud, schemas
+from backend.dependencies import get_current_user
+from backend.main import app
+from backend.versioning import ResourceVersions, resource_versions
+
+
+@pytest.fixture
+def session(client_db):
+    resource_versions.clear()
+    yield client_db
+    resource_versions.clear()
+
+
+def test_matching_etag_returns_304_until_a_write(client, session):
+    first = client.get("/api/v1/departments")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/v1/departments", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    crud.create_department(
+        session, schemas.DepartmentCreate(code="ops", name="Operations", organizationId="ORG-1"), "u1"
+    )
+    fresh = client.get("/api/v1/departments", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert [d["code"] for d in fresh.json()] == ["OPS"]
+
+
+def test_org_scoped_etag_ignores_other_organizations(client, session):
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "Root", "organization_id": "ORG-1"}
+    try:
+        etag = client.get("/api/v1/plants").headers["ETag"]
+
+        crud.create_plant(session, schemas.PlantCreate(name="Remote", code="R1", organizationId="ORG-2"), "u1")
+        assert client.get("/api/v1/plants", headers={"If-None-Match": etag}).status_code == 304
+
+        crud.create_plant(session, schemas.PlantCreate(name="Home", code="H1", organizationId="ORG-1"), "u1")
+        assert client.get("/api/v1/plants", headers={"If-None-Match": etag}).status_code == 200
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_bumped_version_is_published_only_on_commit(db):
+    versions = ResourceVersions(refresh_seconds=60)
+    other = Session()  # another request on this worker: served from the cache
+    assert versions.get(db, "ORG-1", "plants") == 0
+
+    versions.bump(db, "ORG-1", "plants")
+    assert versions.get(db, "ORG-1", "plants") == 1  # the writer sees its own bump
+    assert versions.get(other, "ORG-1", "plants") == 0  # nobody else does before commit
+
+    db.rollback()
+    assert versions.get(db, "ORG-1", "plants") == 0  # the rolled-back version never existed
+
+    versions.bump(db, "ORG-1", "plants")
+    db.commit()
+    assert versions.get(other, "ORG-1", "plants") == 1
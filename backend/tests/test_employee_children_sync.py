@@ -0,0 +1,93 @@
+"""
+Employee Child Sync Tests
+create/update write only the child rows that changed, in one transaction.
+"""
+
+import pytest
+
+from backend import crud, schemas
+from backend.domains.hcm.models import DBEducation, DBFamily
+from backend.query_stats import track_queries
+
+
+def _payload(**overrides):
+    data = {
+        "id": "EMP-1",
+        "name": "Ayesha Khan",
+        "email": "ayesha@example.com",
+        "status": "Active",
+        "organizationId": "ORG-1",
+        "education": [
+            {"degree": "BSc", "institute": "NUST", "year": "2015", "gradeGpa": "3.5", "marksObtained": 800, "totalMarks": 1000},
+            {"degree": "MSc", "institute": "LUMS", "year": "2018", "gradeGpa": "3.8", "marksObtained": 900, "totalMarks": 1000},
+        ],
+        "family": [{"name": "Ali", "relationship": "Spouse", "dob": "1990-01-01"}],
+        "increments": [{"effectiveDate": "2024-07-01", "newGross": 150000, "type": "Annual", "remarks": "-"}],
+    }
+    data.update(overrides)
+    return schemas.EmployeeCreate(**data)
+
+
+def _writes(stats):
+    """Write statements as "VERB table", one entry per execute (tab version bumps left out)."""
+    writes = []
+    for shape, count in stats.shapes.items():
+        words = shape.split()
+        if words[0] in ("INSERT", "UPDATE", "DELETE"):
+            table = words[1] if words[0] == "UPDATE" else words[2]
+            if table != "core_resource_versions":
+                writes += [f"{words[0]} {table}"] * count
+    return sorted(writes)
+
+
+@pytest.fixture
+def employee(db):
+    return crud.create_employee(db, _payload(), "admin")
+
+
+def test_create_saves_children_in_one_transaction(db):
+    with track_queries() as stats:
+        emp = crud.create_employee(db, _payload(), "admin")
+    assert [e.degree for e in emp.education] == ["BSc", "MSc"]
+    assert emp.family[0].relationship == "Spouse"
+    assert emp.increments[0].new_gross == 150000
+    # one INSERT per new row (SQLite returns autoincrement keys row by row), nothing else
+    assert _writes(stats) == [
+        "INSERT hcm_employee_education", "INSERT hcm_employee_education", "INSERT hcm_employee_family",
+        "INSERT hcm_employee_increments", "INSERT hcm_employees",
+    ]
+
+
+def test_unchanged_children_are_not_rewritten(db, employee):
+    ids = [e.id for e in employee.education]
+    with track_queries() as stats:
+        emp = crud.update_employee(db, "EMP-1", _payload(email="new@example.com"), "editor")
+    assert _writes(stats) == ["UPDATE hcm_employees"]
+    assert [e.id for e in emp.education] == ids
+
+
+def test_children_are_diffed_by_id_and_natural_key(db, employee):
+    bsc, msc = employee.education
+    payload = _payload(
+        education=[
+            # matched by id, one value changed
+            {"id": bsc.id, "degree": "BSc", "institute": "NUST", "year": "2015", "gradeGpa": "3.6", "marksObtained": 810, "totalMarks": 1000},
+            # new row
+            {"degree": "PhD", "institute": "MIT", "year": "2023", "gradeGpa": "4.0", "marksObtained": 950, "totalMarks": 1000},
+        ],
+        # matched by natural key (name, relationship) without an id
+        family=[{"name": "Ali", "relationship": "Spouse", "dob": "1990-02-02"}],
+    )
+    family_id = employee.family[0].id
+    with track_queries() as stats:
+        emp = crud.update_employee(db, "EMP-1", payload, "editor")
+
+    assert {e.degree: e.id for e in emp.education}["BSc"] == bsc.id
+    assert db.get(DBEducation, msc.id) is None
+    assert emp.family[0].id == family_id and emp.family[0].dob == "1990-02-02"
+    assert db.get(DBEducation, bsc.id).updated_by == "editor"
+    assert _writes(stats) == [
+        "DELETE hcm_employee_education", "INSERT hcm_employee_education",
+        "UPDATE hcm_employee_education", "UPDATE hcm_employee_family", "UPDATE hcm_employees",
+    ]
+    assert db.query(DBFamily).count() == 1
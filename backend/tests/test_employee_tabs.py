@@ -0,0 +1,92 @@
+"""
+Employee Profile Tab Tests
+Header-only profile by default, `?include=`, and per-tab paging and ETags.
+"""
+
+import pytest
+
+from backend import crud, schemas
+from backend.dependencies import get_current_user
+from backend.main import app
+from backend.query_stats import track_queries
+from backend.versioning import resource_versions
+
+URL = "/api/v1/employees/EMP-1"
+
+
+def _payload(increments=3, **overrides):
+    data = {
+        "id": "EMP-1",
+        "name": "Ayesha Khan",
+        "email": "ayesha@example.com",
+        "organizationId": "ORG-1",
+        "education": [{"degree": "BSc", "institute": "NUST", "year": "2015", "gradeGpa": "3.5", "marksObtained": 800, "totalMarks": 1000}],
+        "family": [{"name": "Ali", "relationship": "Spouse", "dob": "1990-01-01"}],
+        "increments": [
+            {"effectiveDate": f"{2015 + i}-07-01", "newGross": 100000 + i, "type": "Annual", "remarks": "-"}
+            for i in range(increments)
+        ],
+    }
+    data.update(overrides)
+    return schemas.EmployeeCreate(**data)
+
+
+@pytest.fixture
+def session(client_db):
+    crud.create_employee(client_db, _payload(), "admin")
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "Root"}
+    yield client_db
+    app.dependency_overrides.pop(get_current_user, None)
+    resource_versions.clear()
+
+
+def test_profile_is_header_only_by_default(client, session):
+    with track_queries() as stats:
+        body = client.get(URL).json()
+    assert body["id"] == "EMP-1" and body["email"] == "ayesha@example.com"
+    assert not set(body) & set(crud.EMPLOYEE_CHILDREN)
+    assert not any("hcm_employee_" in shape for shape in stats.shapes)
+
+
+def test_include_embeds_the_named_tabs(client, session):
+    body = client.get(URL, params={"include": "education,increments"}).json()
+    assert [e["degree"] for e in body["education"]] == ["BSc"]
+    assert len(body["increments"]) == 3
+    assert "family" not in body
+
+    assert set(crud.EMPLOYEE_CHILDREN) <= set(client.get(URL, params={"include": "all"}).json())
+    assert client.get(URL, params={"include": "payslips"}).status_code == 400
+    assert client.get("/api/v1/employees/EMP-404").status_code == 404
+
+
+def test_profile_contract_leaves_tabs_optional(client, session):
+    response = app.openapi()["paths"]["/api/v1/employees/{employee_id}"]["get"]["responses"]["200"]
+    assert response["content"]["application/json"]["schema"]["$ref"].endswith("/EmployeeProfile")
+    profile = app.openapi()["components"]["schemas"]["EmployeeProfile"]
+    assert not set(profile.get("required", [])) & set(crud.EMPLOYEE_CHILDREN)
+    # both shapes the route returns fit the declared model
+    schemas.EmployeeProfile.model_validate(client.get(URL).json())
+    schemas.EmployeeProfile.model_validate(client.get(URL, params={"include": "all"}).json())
+
+
+def test_tab_pages_with_cursor(client, session):
+    first = client.get(f"{URL}/increments", params={"limit": 2, "sort": "-effective_date", "include_total": True})
+    assert [r["effectiveDate"] for r in first.json()] == ["2017-07-01", "2016-07-01"]
+    assert first.headers["x-total-count"] == "3"
+
+    rest = client.get(f"{URL}/increments", params={"limit": 2, "sort": "-effective_date", "cursor": first.headers["x-next-cursor"]})
+    assert [r["effectiveDate"] for r in rest.json()] == ["2015-07-01"]
+    assert "x-next-cursor" not in rest.headers
+
+
+def test_tab_etag_changes_only_when_that_tab_changes(client, session):
+    family = client.get(f"{URL}/family")
+    increments = client.get(f"{URL}/increments")
+    assert client.get(f"{URL}/family", headers={"If-None-Match": family.headers["etag"]}).status_code == 304
+
+    # Adding an increment leaves the family tab (and its ETag) untouched
+    crud.update_employee(session, "EMP-1", _payload(increments=4), "editor")
+    assert client.get(f"{URL}/family", headers={"If-None-Match": family.headers["etag"]}).status_code == 304
+    changed = client.get(f"{URL}/increments", headers={"If-None-Match": increments.headers["etag"]})
+    assert changed.status_code == 200
+    assert len(changed.json()) == 4
@@ -0,0 +1,49 @@
+"""
+Employee List View Tests
+Covers the column-only summary projection on /api/v1/employees.
+"""
+
+import pytest
+
+from backend.dependencies import get_current_user
+from backend.domains.hcm.models import DBEducation, DBEmployee
+from backend.main import app
+
+
+@pytest.fixture
+def seeded_client(client, client_db):
+    for i in range(3):
+        client_db.add(DBEmployee(
+            id=f"EMP-{i}", name=f"Employee {i}", email=f"e{i}@x.com",
+            status="Active", organization_id="ORG-1",
+        ))
+        client_db.add(DBEducation(employee_id=f"EMP-{i}", degree="BSc"))
+    client_db.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "Root"}
+    yield client
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_summary_view_is_flat_subset_of_detail(seeded_client):
+    summary = seeded_client.get("/api/v1/employees?view=summary&limit=2")
+    assert summary.status_code == 200
+    rows = summary.json()
+    assert [r["id"] for r in rows] == ["EMP-0", "EMP-1"]
+    assert rows[0]["organizationId"] == "ORG-1"
+    assert "education" not in rows[0]
+    assert "X-Next-Cursor" in summary.headers
+
+    nxt = seeded_client.get(
+        f"/api/v1/employees?view=summary&limit=2&cursor={summary.headers['X-Next-Cursor']}"
+    )
+    assert [r["id"] for r in nxt.json()] == ["EMP-2"]
+
+
+def test_fields_selects_requested_columns(seeded_client):
+    res = seeded_client.get("/api/v1/employees?fields=name,email&sort=-name")
+    assert res.status_code == 200
+    assert res.json()[0] == {"id": "EMP-2", "name": "Employee 2", "email": "e2@x.com"}
+
+    bad = seeded_client.get("/api/v1/employees?fields=salary")
+    assert bad.status_code == 400
@@ -0,0 +1,44 @@
+"""
+Import Time Budget Tests
+`python -X importtime -c "import backend.main"` in a fresh interpreter: the
+backend's own modules must stay under budget, and rarely used subsystems
+(audit engine, scheduler, cleanup, AI) must not be imported at all.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# Self time of backend.* modules (third-party imports excluded); ~0.8s today
+BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", 1500))
+LAZY_PREFIXES = ("apscheduler", "backend.audit", "backend.cleanup", "ai_engine")
+
+
+def _import_profile():
+    env = dict(os.environ, DATABASE_URL="sqlite:///:memory:", APP_ENV="test")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us)))
+    return rows
+
+
+def test_backend_import_cost_within_budget():
+    rows = _import_profile()
+    names = [name for name, _ in rows]
+    assert "backend.main" in names
+
+    eager = [name for name in names if name.startswith(LAZY_PREFIXES)]
+    assert eager == [], f"imported eagerly by backend.main: {eager}"
+
+    own_ms = sum(us for name, us in rows if name == "backend" or name.startswith("backend.")) / 1000
+    assert own_ms < BUDGET_MS, f"backend.* import self time {own_ms:.0f} ms exceeds {BUDGET_MS:.0f} ms"
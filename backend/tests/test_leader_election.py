@@ -0,0 +1,115 @@
+"""
+Leader Election Tests
+Single leader per lease, renewal, bounded failover, graceful handover.
+"""
+
+import datetime
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.domains.core.models import DBLease
+from backend.leader_election import LeaderLease
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime.datetime(2026, 1, 1, 12, 0, 0)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += datetime.timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'lease.db'}")
+    Base.metadata.create_all(bind=engine, tables=[DBLease.__table__])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _lease(sessions, clock, holder, events=None):
+    events = events if events is not None else []
+    return LeaderLease(
+        "audit-scheduler", ttl_seconds=30, heartbeat_seconds=10,
+        on_elected=lambda: events.append(f"{holder}+"), on_demoted=lambda: events.append(f"{holder}-"),
+        session_factory=sessions, holder_id=holder, clock=clock,
+    )
+
+
+def test_only_one_worker_leads(sessions):
+    clock, events = Clock(), []
+    workers = [_lease(sessions, clock, f"w{i}", events) for i in range(3)]
+    assert [w.tick() for w in workers] == [True, False, False]
+    clock.advance(10)
+    # the leader renews, the others keep waiting
+    assert [w.tick() for w in workers] == [True, False, False]
+    assert events == ["w0+"]
+    assert workers[0].term == 1
+
+
+def test_standby_takes_over_after_leader_dies(sessions):
+    clock, events = Clock(), []
+    leader, standby = _lease(sessions, clock, "a", events), _lease(sessions, clock, "b", events)
+    leader.tick()
+    standby.tick()
+
+    # leader stops heartbeating; the lease is still valid just before the TTL
+    clock.advance(29)
+    assert not standby.tick()
+    clock.advance(1)
+    assert standby.tick()
+    assert standby.term == 2
+
+    # the old leader wakes up and finds it has been replaced
+    assert not leader.tick()
+    assert events == ["a+", "b+", "a-"]
+
+
+def test_leader_steps_down_when_it_cannot_renew(sessions):
+    clock, events = Clock(), []
+    leader = _lease(sessions, clock, "a", events)
+    leader.tick()
+
+    def broken():
+        raise RuntimeError("database unavailable")
+
+    leader.session_factory = broken
+    clock.advance(10)
+    assert leader.tick()  # lease it last wrote is still valid
+    clock.advance(20)
+    assert not leader.tick()
+    assert events == ["a+", "a-"]
+
+
+def test_stop_hands_over_without_waiting_for_ttl(sessions):
+    clock, events = Clock(), []
+    leader, standby = _lease(sessions, clock, "a", events), _lease(sessions, clock, "b", events)
+    leader.tick()
+    leader.stop()
+    assert standby.tick()
+    assert events == ["a+", "a-", "b+"]
+
+
+def test_expiry_timer_demotes_without_waiting_for_a_heartbeat(sessions):
+    events = []
+    leader = LeaderLease(
+        "audit-scheduler", ttl_seconds=0.3, heartbeat_seconds=0.1, db_timeout_seconds=0.05,
+        on_demoted=lambda: events.append("demoted"), session_factory=sessions, holder_id="a",
+    )
+    assert leader.tick()
+    # no further heartbeat (e.g. one stuck on a locked database): the timer steps down
+    time.sleep(0.5)
+    assert not leader.is_leader
+    assert events == ["demoted"]
+
+
+def test_db_timeout_must_fit_inside_the_renewal_slack(sessions):
+    with pytest.raises(ValueError):
+        LeaderLease("audit-scheduler", ttl_seconds=30, heartbeat_seconds=10, db_timeout_seconds=20, session_factory=sessions)
@@ -0,0 +1,108 @@
+"""
+Leave Approval Tests
+Batch approval: one status UPDATE, balances charged to the leave's own year
+with grouped increments, missing balances created, no double charging.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from backend import crud
+from backend.dependencies import get_current_user
+from backend.domains.hcm.models import DBEmployee, DBLeaveBalance, DBLeaveRequest
+from backend.main import app
+from backend.query_stats import track_queries
+
+
+def _seed(db):
+    for emp in ("E1", "E2"):
+        db.add(DBEmployee(id=emp, name=emp, email=f"{emp}@x.com", status="Active", organization_id="ORG-1"))
+    leaves = [
+        ("LR-1", "E1", "Annual", 2.0, "2026-03-10"),
+        ("LR-2", "E1", "Annual", 1.5, "2026-04-01"),
+        ("LR-3", "E1", "Sick", 1.0, "2026-04-02"),
+        ("LR-4", "E1", "Annual", 3.0, "2027-01-05"),  # charged to next year
+        ("LR-5", "E2", "Casual", 1.0, "2026-05-05"),
+    ]
+    for leave_id, emp, kind, days, start in leaves:
+        db.add(DBLeaveRequest(id=leave_id, employee_id=emp, type=kind, days=days, reason="-",
+                              start_date=start, end_date=start))
+    db.add(DBLeaveRequest(id="LR-6", employee_id="E2", type="Annual", days=5.0, reason="-",
+                          start_date="2026-06-01", end_date="2026-06-05", status="Rejected"))
+    db.add(DBLeaveBalance(employee_id="E1", year=2026, annual_used=4.0))
+    db.commit()
+
+
+def _balance(db, employee_id, year):
+    db.expire_all()
+    return db.query(DBLeaveBalance).filter_by(employee_id=employee_id, year=year).one()
+
+
+def test_batch_approval_charges_each_year_set_based(db):
+    _seed(db)
+    with track_queries() as stats:
+        result = crud.approve_leave_requests(db, ["LR-1", "LR-2", "LR-3", "LR-4", "LR-5", "LR-6", "LR-404"], "mgr")
+
+    assert result["approved"] == ["LR-1", "LR-2", "LR-3", "LR-4", "LR-5"]
+    assert result["skipped"] == [{"id": "LR-6", "reason": "Already Rejected"}, {"id": "LR-404", "reason": "Not found"}]
+    assert result["balances_updated"] == 3
+
+    e1 = _balance(db, "E1", 2026)
+    assert (e1.annual_used, e1.sick_used) == (7.5, 1.0)
+    assert _balance(db, "E1", 2027).annual_used == 3.0
+    assert _balance(db, "E2", 2026).casual_used == 1.0
+
+    writes = sorted(
+        shape.split()[0] + " " + shape.split()[1 if shape.startswith("UPDATE") else 2]
+        for shape, count in stats.shapes.items() if shape.split()[0] in ("INSERT", "UPDATE")
+        for _ in range(count)
+    )
+    # one status update, one balance upsert, one grouped update per leave type touched
+    assert writes == [
+        "INSERT hcm_leave_balances",
+        "UPDATE hcm_leave_balances", "UPDATE hcm_leave_balances", "UPDATE hcm_leave_balances",
+        "UPDATE hcm_leave_requests",
+    ]
+
+
+def test_reapproving_does_not_charge_twice(db):
+    _seed(db)
+    crud.approve_leave_requests(db, ["LR-1"], "mgr")
+    again = crud.approve_leave_requests(db, ["LR-1"], "mgr")
+    assert again["approved"] == [] and again["skipped"] == [{"id": "LR-1", "reason": "Already Approved"}]
+    assert _balance(db, "E1", 2026).annual_used == 6.0
+
+
+def test_single_status_update_uses_the_leave_year(db):
+    _seed(db)
+    leave = crud.update_leave_status(db, "LR-4", "Approved", "mgr")
+    assert leave.status == "Approved"
+    assert _balance(db, "E1", 2027).annual_used == 3.0
+
+
+@pytest.mark.parametrize("leave_id, status, detail", [
+    ("LR-6", 409, "Already Rejected"),
+    ("LR-1", 409, "Already Approved"),
+    ("LR-404", 404, "Not found"),
+])
+def test_single_approval_of_a_non_pending_request_fails(db, leave_id, status, detail):
+    _seed(db)
+    crud.approve_leave_requests(db, ["LR-1"], "mgr")
+    with pytest.raises(HTTPException) as exc:
+        crud.update_leave_status(db, leave_id, "Approved", "mgr")
+    assert (exc.value.status_code, exc.value.detail) == (status, detail)
+    assert _balance(db, "E1", 2026).annual_used == 6.0
+
+
+@pytest.mark.parametrize("role, status", [("Root", 200), ("User", 403)])
+def test_endpoint_requires_approve_leaves(client, client_db, role, status):
+    _seed(client_db)
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": role, "username": "mgr"}
+    try:
+        res = client.post("/api/v1/hcm/leaves/approve-batch", json={"leaveIds": ["LR-1", "LR-5"]})
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+    assert res.status_code == status
+    if status == 200:
+        assert res.json()["approved"] == ["LR-1", "LR-5"]
+        assert res.json()["balancesUpdated"] == 2
@@ -0,0 +1,90 @@
+"""
+Request Metrics Tests
+Route-template counters, histograms and the Prometheus endpoint.
+"""
+
+import asyncio
+import inspect
+
+import pytest
+
+from backend.dependencies import get_current_user
+from backend.domains.hcm.models import DBEmployee
+from backend.main import app
+from backend.metrics import LATENCY_BUCKETS, MetricsMiddleware, RequestMetrics, request_metrics
+
+
+@pytest.fixture
+def admin(client):
+    request_metrics.reset()
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "SystemAdmin"}
+    yield client
+    app.dependency_overrides.pop(get_current_user, None)
+    request_metrics.reset()
+
+
+def test_requests_are_grouped_by_route_template(admin, client_db):
+    for employee_id in ("E1", "E2", "E3"):
+        client_db.add(DBEmployee(id=employee_id, name=employee_id, email=f"{employee_id}@x.com",
+                                 status="Active", organization_id="ORG-1"))
+    client_db.commit()
+
+    for employee_id in ("E1", "E2", "E3"):
+        admin.get(f"/api/v1/employees/{employee_id}")
+    admin.get("/api/v1/health")
+    admin.get("/no/such/path")
+
+    routes = request_metrics.routes
+    assert routes[("GET", "/api/v1/employees/{employee_id}")].count == 3
+    assert routes[("GET", "/api/v1/health")].statuses == {200: 1}
+    assert routes[("GET", "<unmatched>")].statuses == {404: 1}
+    assert sum(request_metrics.in_flight.values()) == 0
+
+
+def test_prometheus_exposition(admin):
+    admin.get("/api/v1/health")
+    res = admin.get("/api/v1/system/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    body = res.text
+    assert 'http_requests_total{method="GET",route="/api/v1/health",status="200"} 1' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/health",le="+Inf"} 1' in body
+    assert "# TYPE http_requests_in_flight gauge" in body
+
+
+def test_summary_quantiles(admin):
+    admin.get("/api/v1/health")
+    summary = admin.get("/api/v1/system/metrics/summary").json()
+    health = next(r for r in summary["routes"] if r["route"] == "/api/v1/health")
+    assert health["count"] == 1
+    assert health["p50Ms"] <= health["p95Ms"] <= health["p99Ms"]
+
+
+def test_quantiles_interpolate_within_buckets():
+    metrics = RequestMetrics()
+    stats = metrics.stats("GET", "/x")
+    # 90 fast requests in the first bucket, 10 slow ones in the 0.5-0.75s bucket
+    stats.buckets[0], stats.buckets[LATENCY_BUCKETS.index(0.75)] = 90, 10
+    stats.count = 100
+    assert stats.quantile(0.5) < LATENCY_BUCKETS[0]
+    assert 0.5 < stats.quantile(0.95) <= 0.75
+
+
+def test_unhandled_errors_count_as_500():
+    metrics = RequestMetrics()
+
+    async def boom(scope, receive, send):
+        raise RuntimeError("boom")
+
+    middleware = MetricsMiddleware(boom, metrics)
+    with pytest.raises(RuntimeError):
+        asyncio.run(middleware({"type": "http", "method": "GET"}, None, None))
+    assert metrics.routes[("GET", "<unmatched>")].statuses == {500: 1}
+    assert metrics.in_flight == {"GET": 0}
+
+
+def test_metric_endpoints_read_on_the_event_loop():
+    # A threadpool reader could iterate `routes` while the middleware adds a key
+    endpoints = {route.path: route.endpoint for route in app.routes if hasattr(route, "endpoint")}
+    for path in ("/api/v1/system/metrics", "/api/v1/system/metrics/summary"):
+        assert inspect.iscoroutinefunction(endpoints[path])
@@ -0,0 +1,97 @@
+"""
+Keyset Pagination Tests
+Walks list endpoints page by page with cursors and checks the headers.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from backend import crud
+from backend.domains.core.models import DBAuditLog
+from backend.domains.hcm.models import DBAttendance
+from backend.main import app
+from backend.dependencies import get_current_user
+from backend.pagination import decode_cursor, next_cursor, resolve_order
+
+
+def _seed_audit_logs(db, times):
+    for i, t in enumerate(times):
+        db.add(DBAuditLog(id=f"LOG-{i:03d}", user="u", action="a", status="ok", time=t))
+    db.commit()
+
+
+def _walk(fetch, limit, sort=None):
+    """Collect every row by following cursors until the last page."""
+    order = resolve_order(crud.list_sort_orders("audit_logs"), sort)
+    seen, cursor = [], None
+    while True:
+        rows = fetch(cursor=cursor, limit=limit, sort=sort)
+        seen.extend(rows)
+        cursor = next_cursor(rows, order, limit)
+        if cursor is None:
+            return seen
+
+
+class TestKeysetPagination:
+    def test_cursor_walk_matches_full_ordering(self, db):
+        _seed_audit_logs(db, [f"2025-01-{d:02d}" for d in (5, 1, 3, 3, 2, 4, 3)])
+
+        fetch = lambda **kw: crud.get_audit_logs(db, **kw)
+        rows = _walk(fetch, limit=2, sort="time")
+        keys = [(r.time, r.id) for r in rows]
+        assert keys == sorted(keys)
+        assert len(keys) == 7
+
+        rows = _walk(fetch, limit=3, sort="-time")
+        keys = [(r.time, r.id) for r in rows]
+        assert keys == sorted(keys, reverse=True)
+
+    def test_null_sort_keys_are_not_skipped(self, db):
+        _seed_audit_logs(db, [None, "2025-01-02", None, "2025-01-01", None])
+        fetch = lambda **kw: crud.get_audit_logs(db, **kw)
+
+        for sort in ("time", "-time"):
+            ids = [r.id for r in _walk(fetch, limit=2, sort=sort)]
+            assert sorted(ids) == [f"LOG-{i:03d}" for i in range(5)]
+
+    def test_offset_parameters_still_work(self, db):
+        _seed_audit_logs(db, ["t"] * 5)
+        rows = crud.get_audit_logs(db, skip=3, limit=10)
+        assert [r.id for r in rows] == ["LOG-003", "LOG-004"]
+
+    def test_cursor_for_other_sort_is_rejected(self, db):
+        _seed_audit_logs(db, ["a", "b", "c"])
+        order = resolve_order(crud.list_sort_orders("audit_logs"), "time")
+        cursor = next_cursor(crud.get_audit_logs(db, limit=2, sort="time"), order, 2)
+
+        with pytest.raises(HTTPException) as exc:
+            crud.get_audit_logs(db, limit=2, sort="id", cursor=cursor)
+        assert exc.value.status_code == 400
+        with pytest.raises(HTTPException):
+            decode_cursor("not-a-cursor", order)
+        with pytest.raises(HTTPException):
+            crud.get_audit_logs(db, sort="action")
+
+
+class TestPaginationHeaders:
+    def test_attendance_endpoint_returns_cursor_and_total(self, client, client_db):
+        for day in range(1, 6):
+            client_db.add(DBAttendance(employee_id="EMP-1", date=f"2025-02-{day:02d}", status="Present"))
+        client_db.commit()
+
+        app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "Root"}
+        try:
+            res = client.get("/api/v1/hcm/attendance?limit=2&sort=-date&include_total=true")
+            assert res.status_code == 200
+            assert [r["date"] for r in res.json()] == ["2025-02-05", "2025-02-04"]
+            assert res.headers["X-Total-Count"] == "5"
+
+            dates = [r["date"] for r in res.json()]
+            cursor = res.headers["X-Next-Cursor"]
+            while cursor:
+                res = client.get(f"/api/v1/hcm/attendance?limit=2&sort=-date&cursor={cursor}")
+                dates += [r["date"] for r in res.json()]
+                cursor = res.headers.get("X-Next-Cursor")
+            assert dates == [f"2025-02-{d:02d}" for d in range(5, 0, -1)]
+        finally:
+            app.dependency_overrides.pop(get_current_user, None)
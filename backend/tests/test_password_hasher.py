@@ -0,0 +1,84 @@
+"""
+Password Hasher Tests
+Bounded bcrypt pool, cost calibration, load shedding and rehash-on-login.
+"""
+
+import threading
+
+import bcrypt
+import pytest
+
+from backend.domains.core.models import DBUser
+from backend.password_hasher import (
+    MAX_ROUNDS,
+    MIN_ROUNDS,
+    PasswordHasher,
+    calibrate_rounds,
+    hash_rounds,
+    password_hasher,
+)
+
+
+@pytest.fixture
+def cheap_rounds():
+    previous = password_hasher.rounds
+    password_hasher.rounds = 5
+    yield
+    password_hasher.rounds = previous
+
+
+def test_hash_and_verify_on_the_pool():
+    hasher = PasswordHasher(workers=1, queue_limit=4, rounds=4)
+    hashed = hasher.hash_sync("secret")
+    assert hash_rounds(hashed) == 4
+    assert hasher.verify_sync("secret", hashed)
+    assert not hasher.verify_sync("wrong", hashed)
+    assert not hasher.verify_sync("secret", "not-a-hash")
+    stats = hasher.stats()
+    assert stats["completed"] == 4
+    assert stats["pending"] == 0
+
+
+def test_calibration_is_clamped():
+    assert calibrate_rounds(0.001) == MIN_ROUNDS
+    assert calibrate_rounds(10 ** 9) == MAX_ROUNDS
+
+
+def test_needs_rehash_only_below_the_current_cost():
+    hasher = PasswordHasher(workers=1, queue_limit=4, rounds=5)
+    assert hasher.needs_rehash(bcrypt.hashpw(b"x", bcrypt.gensalt(4)).decode())
+    assert not hasher.needs_rehash(bcrypt.hashpw(b"x", bcrypt.gensalt(5)).decode())
+    # a stronger hash (e.g. from a faster host's calibration) is kept
+    assert not hasher.needs_rehash(bcrypt.hashpw(b"x", bcrypt.gensalt(6)).decode())
+
+
+def test_full_queue_is_shed_with_429():
+    hasher = PasswordHasher(workers=1, queue_limit=1, rounds=4)
+    release = threading.Event()
+    blocked = hasher._submit(release.wait)
+    try:
+        with pytest.raises(Exception) as exc:
+            hasher.verify_sync("secret", "hash")
+        assert exc.value.status_code == 429
+        assert exc.value.headers["Retry-After"] == "1"
+        assert hasher.stats()["rejected"] == 1
+    finally:
+        release.set()
+        blocked.result()
+
+
+def test_login_rehashes_outdated_cost(client, client_db, cheap_rounds):
+    client_db.add(DBUser(id="u-1", username="shift-a", role="Manager", is_active=True,
+                         password_hash=bcrypt.hashpw(b"pw-123", bcrypt.gensalt(4)).decode()))
+    client_db.commit()
+
+    bad = client.post("/api/v1/auth/login", json={"username": "shift-a", "password": "nope"})
+    assert bad.status_code == 401
+    res = client.post("/api/v1/auth/login", json={"username": "shift-a", "password": "pw-123"})
+    assert res.status_code == 200
+    assert res.json()["access_token"]
+
+    client_db.expire_all()
+    stored = client_db.get(DBUser, "u-1").password_hash
+    assert hash_rounds(stored) == 5
+    assert bcrypt.checkpw(b"pw-123", stored.encode())
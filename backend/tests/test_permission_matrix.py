@@ -0,0 +1,81 @@
+"""
+Permission Matrix Tests
+Verifies the compiled RBAC matrix and its rebuild on permission writes.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from backend import crud
+from backend.dependencies import check_permission
+from backend.permission_matrix import (
+    PermissionMatrix,
+    get_permission_matrix,
+    reload_permission_matrix,
+)
+from backend.versioning import resource_versions
+
+
+@pytest.fixture(autouse=True)
+def fresh_versions():
+    resource_versions.clear()
+    yield
+    resource_versions.clear()
+
+
+class TestPermissionMatrix:
+    def test_grants_and_denials(self):
+        matrix = PermissionMatrix({"Manager": ["view_employees", "view_leaves"], "User": []})
+        assert matrix.allows("Manager", "view_employees")
+        assert matrix.allows("Manager", "view_leaves")
+        assert not matrix.allows("Manager", "run_payroll")
+        assert not matrix.allows("User", "view_employees")
+        assert not matrix.allows("Unknown", "view_employees")
+
+    def test_super_roles_and_wildcard_have_full_access(self):
+        matrix = PermissionMatrix({"Ops": ["*"]}, super_roles={"Root"})
+        assert matrix.allows("Root", "anything")
+        assert matrix.allows("Ops", "anything")
+        assert matrix.permissions_for("Ops") == ["*"]
+
+    def test_permissions_for_role(self):
+        matrix = PermissionMatrix({"Manager": ["a", "b"], "User": ["b"]})
+        assert sorted(matrix.permissions_for("Manager")) == ["a", "b"]
+        assert matrix.permissions_for("User") == ["b"]
+
+
+class TestMatrixRebuild:
+    def test_update_role_permissions_rebuilds_matrix(self, db):
+        reload_permission_matrix(db)
+        assert not get_permission_matrix(db).allows("Manager", "view_payroll")
+
+        crud.update_role_permissions(db, "Manager", ["view_payroll"])
+
+        matrix = get_permission_matrix(db)
+        assert matrix.allows("Manager", "view_payroll")
+        assert matrix.version == resource_versions.get(db, "system", "role_permissions")
+
+    def test_other_worker_picks_up_version_change(self, db):
+        crud.update_role_permissions(db, "User", ["view_leaves"])
+        first = get_permission_matrix(db)
+
+        # Simulate a write from another process: only the shared counter moves
+        from backend.permission_matrix import mark_permissions_changed
+        db.query(crud.models.DBRolePermission).filter_by(role="User").delete()
+        mark_permissions_changed(db)
+        db.commit()
+        resource_versions.clear()
+
+        second = get_permission_matrix(db)
+        assert second.version == first.version + 1
+        assert not second.allows("User", "view_leaves")
+
+    def test_check_permission_dependency(self, db):
+        crud.update_role_permissions(db, "Manager", ["view_employees"])
+        checker = check_permission("view_employees")
+        user = {"id": "u1", "role": "Manager"}
+        assert checker(db=db, current_user=user) is user
+
+        with pytest.raises(HTTPException) as exc:
+            check_permission("run_payroll")(db=db, current_user=user)
+        assert exc.value.status_code == 403
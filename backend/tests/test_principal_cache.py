@@ -0,0 +1,115 @@
+"""
+Principal Cache Tests
+Covers the LRU/TTL behaviour and CRUD-driven invalidation of cached principals.
+"""
+
+import time
+
+import pytest
+
+from backend import crud, schemas
+from backend.dependencies import create_access_token, get_current_user
+from backend.domains.core.models import DBUser
+from backend.principal_cache import PrincipalCache, principal_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+def _user(user_id, username="u"):
+    return {"id": user_id, "username": username, "role": "User"}
+
+
+class TestPrincipalCache:
+    def test_hit_and_miss_counters(self):
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        assert cache.get("tok-a") is None
+        cache.put("tok-a", {"sub": "a"}, _user("1", "a"))
+        claims, user = cache.get("tok-a")
+        assert claims["sub"] == "a"
+        assert user["id"] == "1"
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_returned_user_is_a_copy(self):
+        cache = PrincipalCache()
+        cache.put("tok", {}, _user("1"))
+        cache.get("tok")[1]["role"] = "Root"
+        assert cache.get("tok")[1]["role"] == "User"
+
+    def test_lru_eviction(self):
+        cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+        cache.put("a", {}, _user("1", "a"))
+        cache.put("b", {}, _user("2", "b"))
+        cache.get("a")  # 'b' becomes least recently used
+        cache.put("c", {}, _user("3", "c"))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_entry_never_outlives_token_exp(self):
+        cache = PrincipalCache(ttl_seconds=60)
+        cache.put("expired", {"exp": time.time() - 1}, _user("1"))
+        assert cache.get("expired") is None
+
+    def test_ttl_expiry(self):
+        cache = PrincipalCache(ttl_seconds=0.01)
+        cache.put("tok", {}, _user("1"))
+        time.sleep(0.02)
+        assert cache.get("tok") is None
+
+    def test_invalidate_user_drops_all_tokens(self):
+        cache = PrincipalCache()
+        cache.put("t1", {}, _user("1", "alice"))
+        cache.put("t2", {}, _user("1", "alice"))
+        cache.put("t3", {}, _user("2", "bob"))
+        assert cache.invalidate_user(username="alice") == 2
+        assert cache.get("t1") is None
+        assert cache.get("t2") is None
+        assert cache.get("t3") is not None
+
+
+class TestCurrentUserCaching:
+    def _seed_user(self, db):
+        user = DBUser(
+            id="cache-user-1",
+            username="cached",
+            password_hash="x",
+            role="Manager",
+            is_active=True,
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    def test_second_lookup_served_from_cache(self, db):
+        self._seed_user(db)
+        token = create_access_token({"sub": "cached"})
+
+        first = get_current_user(token=token, db=db)
+        second = get_current_user(token=token, db=None)  # no DB access on a hit
+
+        assert first == second
+        assert principal_cache.stats()["hits"] == 1
+
+    def test_update_user_invalidates_cached_principal(self, db):
+        self._seed_user(db)
+        token = create_access_token({"sub": "cached"})
+        get_current_user(token=token, db=db)
+
+        crud.update_user(
+            db,
+            "cache-user-1",
+            schemas.UserUpdate(organizationId="org-1", status="Inactive"),
+            updater_id="admin",
+        )
+
+        assert principal_cache.get(token) is None
+        with pytest.raises(Exception) as exc:
+            get_current_user(token=token, db=db)
+        assert exc.value.status_code == 403
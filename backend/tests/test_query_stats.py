@@ -0,0 +1,92 @@
+"""
+SQL Instrumentation Tests
+Per-request query counts, N+1 suspects and the slow-query log.
+"""
+
+import logging
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from backend import crud
+from backend.config import system_config
+from backend.dependencies import get_current_user
+from backend.domains.hcm.models import DBEmployee, DBLeaveBalance, DBLeaveRequest
+from backend.main import app
+from backend.query_stats import normalize_sql, track_queries
+
+
+def _seed_leaves(db, employees):
+    for i in range(employees):
+        db.add(DBEmployee(id=f"E{i}", name=f"Emp {i}", email=f"e{i}@x.com", status="Active",
+                          organization_id="ORG-1"))
+        db.add(DBLeaveRequest(id=f"LR-{i}", employee_id=f"E{i}", type="Annual", reason="-",
+                              start_date="2025-03-10", end_date="2025-03-11"))
+        db.add(DBLeaveBalance(employee_id=f"E{i}", year=2025))
+    db.commit()
+    db.expunge_all()
+
+
+@pytest.mark.parametrize("sql, shape", [
+    ("SELECT * FROM t WHERE id = 42 AND name = 'O''Neil'", "SELECT * FROM t WHERE id = ? AND name = ?"),
+    ("SELECT a\n  FROM t WHERE id IN (?, ?, ?)", "SELECT a FROM t WHERE id IN (...)"),
+    ("SELECT a FROM t WHERE id IN (%(id_1)s, %(id_2)s)", "SELECT a FROM t WHERE id IN (...)"),
+    ("SELECT col_1 FROM t_2", "SELECT col_1 FROM t_2"),
+])
+def test_normalize_sql(sql, shape):
+    assert normalize_sql(sql) == shape
+
+
+def test_leave_listings_no_longer_load_employees_per_row(db):
+    _seed_leaves(db, 12)
+    with track_queries() as stats:
+        requests = crud.get_leave_requests(db)
+        balances = crud.get_leave_balances(db, year=2025)
+    assert sorted(r.employee_name for r in requests) == sorted(f"Emp {i}" for i in range(12))
+    assert len(balances) == 12
+    assert stats.count == 2
+    assert stats.suspects == {}
+
+
+def test_repeated_shapes_are_flagged_with_their_crud_caller(db, monkeypatch):
+    monkeypatch.setattr(system_config, "N_PLUS_ONE_THRESHOLD", 3)
+    _seed_leaves(db, 4)
+    with track_queries() as stats:
+        for i in range(4):
+            crud.get_employee(db, f"E{i}")
+            db.expunge_all()
+    assert "crud.get_employee" in stats.suspects.values()
+
+
+def test_slow_queries_are_logged_with_caller(db, monkeypatch, caplog):
+    monkeypatch.setattr(system_config, "SLOW_QUERY_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="backend.slow_queries"):
+        crud.get_departments(db)
+    assert "from crud.get_departments" in caplog.text
+    assert "LIMIT ? OFFSET ?" in caplog.text
+
+
+def test_failed_statements_leave_no_timing_state_on_the_connection(db):
+    conn = db.connection()
+    info = repr(conn.info)
+    with track_queries() as stats:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.exec_driver_sql("SELECT * FROM no_such_table")
+        conn.exec_driver_sql("SELECT 1")
+    assert stats.count == 1
+    assert repr(conn.info) == info
+
+
+def test_query_count_header(client, client_db):
+    _seed_leaves(client_db, 5)
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "Root"}
+    try:
+        sync = client.get("/api/v1/rbac/permissions")
+        leaves = client.get("/api/v1/hcm/leaves")  # async route
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+    assert int(sync.headers["X-Query-Count"]) >= 1
+    # one SELECT for the page (employees joined in), whatever the row count
+    assert leaves.headers["X-Query-Count"] == "1"
+    assert float(leaves.headers["X-Query-Time-Ms"]) >= 0
@@ -0,0 +1,130 @@
+"""
+Tenant Rate Limiter Tests
+Token buckets per (organization, user), idle eviction, the shared SQLite
+store and limits driven by system_flags.
+"""
+
+import pytest
+
+from backend import crud, schemas
+from backend.dependencies import create_access_token
+from backend.domains.core.models import DBUser
+from backend.principal_cache import principal_cache
+from backend.rate_limiter import (
+    MemoryBucketStore,
+    RateLimitPolicy,
+    SQLiteBucketStore,
+    TenantRateLimiter,
+    rate_limiter,
+)
+from backend.versioning import resource_versions
+
+POLICY = RateLimitPolicy(enabled=True, requests_per_minute=3)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def reset_limiter():
+    rate_limiter.clear()
+    principal_cache.clear()
+    yield
+    rate_limiter.clear()
+    principal_cache.clear()
+    resource_versions.clear()
+
+
+@pytest.mark.parametrize("make_store", [
+    lambda tmp_path: MemoryBucketStore(idle_seconds=120),
+    lambda tmp_path: SQLiteBucketStore(str(tmp_path / "buckets.db"), idle_seconds=120),
+])
+def test_bucket_drains_and_refills(make_store, tmp_path, clock):
+    store = make_store(tmp_path)
+    store.clock = clock
+    assert [store.take(("ORG-1", "user:a"), POLICY) for _ in range(3)] == [0, 0, 0]
+    retry_after = store.take(("ORG-1", "user:a"), POLICY)
+    assert retry_after == pytest.approx(20.0)  # 3/minute -> one token every 20s
+    # other principals and organizations have their own buckets
+    assert store.take(("ORG-1", "user:b"), POLICY) == 0
+    assert store.take(("ORG-2", "user:a"), POLICY) == 0
+
+    clock.now += 20
+    assert store.take(("ORG-1", "user:a"), POLICY) == 0
+    assert store.take(("ORG-1", "user:a"), POLICY) > 0
+
+
+def test_idle_buckets_are_evicted(clock):
+    store = MemoryBucketStore(idle_seconds=60)
+    store.clock = clock
+    store.take(("ORG-1", "user:a"), POLICY)
+    clock.now += 30
+    store.take(("ORG-1", "user:b"), POLICY)
+    clock.now += 31
+    store.take(("ORG-1", "user:c"), POLICY)
+    assert len(store) == 2
+    assert store.evictions == 1
+
+
+def test_sqlite_store_is_shared_between_workers(tmp_path, clock):
+    path = str(tmp_path / "buckets.db")
+    workers = [SQLiteBucketStore(path, idle_seconds=120) for _ in range(2)]
+    for store in workers:
+        store.clock = clock
+    results = [workers[i % 2].take(("ORG-1", "user:a"), POLICY) for i in range(4)]
+    assert results[:3] == [0, 0, 0]
+    assert results[3] > 0
+
+
+def test_denied_request_raises_429_with_retry_after(clock):
+    store = MemoryBucketStore(idle_seconds=120)
+    store.clock = clock
+    limiter = TenantRateLimiter(store)
+    limiter._policies["ORG-1"] = (POLICY, (0, 0), float("inf"))
+    for _ in range(3):
+        limiter.check(None, "ORG-1", "user:a")
+    with pytest.raises(Exception) as exc:
+        limiter.check(None, "ORG-1", "user:a")
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "20"
+    assert limiter.stats()["denied"] == 1
+
+
+def test_limits_follow_system_flags(client, client_db):
+    client_db.add_all([
+        DBUser(id="u-a", username="plant-a", password_hash="x", role="SystemAdmin",
+               organization_id="ORG-1", is_active=True),
+        DBUser(id="u-b", username="plant-b", password_hash="x", role="SystemAdmin",
+               organization_id="ORG-1", is_active=True),
+    ])
+    client_db.commit()
+    crud.update_system_flags(
+        client_db, "ORG-1", schemas.SystemFlagsUpdate(rate_limit_requests_per_minute=2), "u-a"
+    )
+
+    def get(username):
+        token = create_access_token({"sub": username})
+        return client.get("/api/v1/system/cache/stats", headers={"Authorization": f"Bearer {token}"})
+
+    assert [get("plant-a").status_code for _ in range(3)] == [200, 200, 429]
+    # same NAT, same organization, different user: own bucket
+    assert get("plant-b").status_code == 200
+
+    # raising the limit applies on the next request
+    res = client.post(
+        "/api/v1/system/flags",
+        json={"rate_limit_enabled": False},
+        headers={"Authorization": f"Bearer {create_access_token({'sub': 'plant-b'})}"},
+    )
+    assert res.status_code == 200
+    assert [get("plant-a").status_code for _ in range(3)] == [200, 200, 200]
@@ -0,0 +1,136 @@
+"""
+Id Sequence Tests
+Hi/lo blocks: one counter round trip per block, no duplicates across
+processes, rollback safety and plant-scoped employee numbers.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend import crud, schemas
+from backend.database import Base
+from backend.domains.core.models import DBHRPlant, DBIdSequence, DBOrganization
+from backend.domains.hcm.models import DBEmployee
+from backend.sequences import IdSequences
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ids.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[DBOrganization.__table__, DBHRPlant.__table__, DBIdSequence.__table__],
+    )
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add(DBOrganization(id="org-1", code="ACME", name="Acme"))
+        db.add(DBHRPlant(id="plant-1", code="LHR", name="Lahore", organization_id="org-1"))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+def test_ids_come_from_one_reservation_per_block(sessions):
+    ids = IdSequences(block_size=10)
+    with sessions() as db:
+        taken = [ids.next_id(db, "leave_request") for _ in range(25)]
+        db.commit()
+    assert taken[:2] == ["LR-000001", "LR-000002"]
+    assert len(set(taken)) == 25
+    assert ids.reservations == 3
+    with sessions() as db:
+        assert db.get(DBIdSequence, ("", "", "leave_request")).last_value == 30
+
+
+def test_concurrent_processes_never_share_an_id(sessions):
+    # Two allocators stand in for two worker processes sharing the database
+    workers = [IdSequences(block_size=7), IdSequences(block_size=7)]
+    results = []
+
+    def create(ids):
+        for _ in range(40):
+            with sessions() as db:
+                results.append(ids.next_id(db, "employee", "org-1"))
+                db.commit()
+
+    threads = [threading.Thread(target=create, args=(ids,)) for ids in workers for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 160
+    assert len(set(results)) == 160
+    assert all(r.startswith("EMP-ACME-") for r in results)
+
+
+def test_rolled_back_reservation_is_not_handed_out(sessions):
+    ids = IdSequences(block_size=5)
+    with sessions() as db:
+        assert ids.next_id(db, "leave_request") == "LR-000001"
+        db.rollback()
+    # Another process reserves the same range now that the counter is back at 0
+    other = IdSequences(block_size=5)
+    with sessions() as db:
+        assert other.next_id(db, "leave_request") == "LR-000001"
+        db.commit()
+    with sessions() as db:
+        assert ids.next_id(db, "leave_request") == "LR-000006"
+        db.commit()
+
+
+def test_plant_employees_use_the_plant_counter(sessions):
+    ids = IdSequences(block_size=50)
+    with sessions() as db:
+        assert ids.take(db, "employee", 2, "org-1", "plant-1") == ["EMP-ACME-LHR-000001", "EMP-ACME-LHR-000002"]
+        db.commit()
+        assert db.get(DBHRPlant, "plant-1").current_sequence == 50
+        assert db.query(DBIdSequence).count() == 0
+
+
+def test_codes_that_normalize_alike_get_distinct_labels(sessions):
+    with sessions() as db:
+        db.add_all([
+            DBOrganization(id="org-ab", code="AB", name="AB"),
+            DBOrganization(id="org-a-b", code="A-B", name="A-B"),
+            DBOrganization(id="org-lower", code="ab", name="ab"),
+        ])
+        db.commit()
+        ids = IdSequences(block_size=5)
+        labels = [ids.next_id(db, "employee", org).rsplit("-", 1)[0] for org in ("org-ab", "org-a-b", "org-lower")]
+        db.commit()
+    assert labels[0] == "EMP-AB"
+    assert labels[1].startswith("EMP-AB_") and labels[2].startswith("EMP-AB_")
+    assert len(set(labels)) == 3
+
+
+def test_create_employee_in_the_same_second_does_not_collide(db):
+    created = [
+        crud.create_employee(
+            db, schemas.EmployeeCreate(name=f"E{i}", email=f"e{i}@x.com", organizationId="ORG-1"), "admin"
+        )
+        for i in range(3)
+    ]
+    # No organization row: the id stands in for the code, hashed since "-" was dropped
+    assert [e.id for e in created] == ["EMP-ORG1_3FA398-000001", "EMP-ORG1_3FA398-000002", "EMP-ORG1_3FA398-000003"]
+
+
+def test_leave_requests_are_numbered_per_employee_organization(db):
+    db.add_all([
+        DBOrganization(id="org-1", code="ACME", name="Acme"),
+        DBOrganization(id="org-2", code="GLOBEX", name="Globex"),
+        DBHRPlant(id="plant-1", code="LHR", name="Lahore", organization_id="org-1"),
+    ])
+    db.add_all([
+        DBEmployee(id="E1", name="E1", email="e1@x.com", organization_id="org-1", plant_id="plant-1"),
+        DBEmployee(id="E2", name="E2", email="e2@x.com", organization_id="org-2"),
+    ])
+    db.commit()
+
+    def leave(employee_id):
+        request = schemas.LeaveRequestCreate(employeeId=employee_id, startDate="2026-03-01", endDate="2026-03-01", reason="-")
+        return crud.create_leave_request(db, request, "admin").id
+
+    assert [leave("E1"), leave("E2"), leave("E1")] == ["LR-ACME-LHR-000001", "LR-GLOBEX-000001", "LR-ACME-LHR-000002"]
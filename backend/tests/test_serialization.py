@@ -0,0 +1,72 @@
+"""
+Fast JSON Serialization Tests
+Pre-rendered list responses must match the stock response_model output.
+"""
+
+import os
+
+import pytest
+
+from backend import schemas
+from backend.config import system_config
+from backend.dependencies import get_current_user
+from backend.domains.core.models import DBAuditLog
+from backend.domains.hcm.models import DBAttendance, DBEducation, DBEmployee, DBLeaveRequest
+from backend.main import app
+from backend.serialization import fast_response, serializer_for
+
+LIST_URLS = ["/api/v1/employees", "/api/v1/hcm/attendance", "/api/v1/hcm/leaves", "/api/v1/audit-logs"]
+
+
+@pytest.fixture
+def seeded(client_db):
+    for i in range(3):
+        client_db.add(DBEmployee(id=f"E{i}", name=f"Émp {i}", email=f"e{i}@x.com", status="Active",
+                                 organization_id="ORG-1", created_by="seed"))
+        client_db.add(DBEducation(employee_id=f"E{i}", degree="BSc", institute="Uni", passing_year="2015",
+                                  score="A", marks_obtained=812.5, total_marks=1000))
+        client_db.add(DBAttendance(employee_id=f"E{i}", date="2025-03-01", clock_in="09:00:00", status="Present"))
+    client_db.add(DBLeaveRequest(id="LR-1", employee_id="E1", type="Annual", start_date="2025-03-10",
+                                 end_date="2025-03-11", reason="Trip"))
+    client_db.add(DBAuditLog(id="LOG-1", organization_id="ORG-1", user="u1", action="Login",
+                             status="Hashed", time="2025-03-01T09:00:00"))
+    client_db.commit()
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "Root"}
+    yield client_db
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def _fetch_all(client, monkeypatch, mode):
+    monkeypatch.setattr(system_config, "FAST_JSON_MODE", mode)
+    return {url: client.get(f"{url}?limit=2&include_total=true") for url in LIST_URLS}
+
+
+@pytest.mark.parametrize("mode", ["validated", "trusted"])
+def test_fast_output_matches_response_model(client, seeded, monkeypatch, mode):
+    stock = _fetch_all(client, monkeypatch, "off")
+    fast = _fetch_all(client, monkeypatch, mode)
+    for url in LIST_URLS:
+        assert fast[url].status_code == stock[url].status_code == 200
+        assert fast[url].json() == stock[url].json(), url
+        for header in ("X-Next-Cursor", "X-Total-Count"):
+            assert fast[url].headers.get(header) == stock[url].headers.get(header)
+    assert fast["/api/v1/employees"].json()[0]["education"][0]["marksObtained"] == 812.5
+
+
+def test_schemas_with_validators_are_never_trusted():
+    assert serializer_for(list[schemas.Employee]).trusted
+    # CandidateBase normalises `skills` in a field validator
+    assert not serializer_for(list[schemas.Candidate]).trusted
+
+
+def test_openapi_contract_unchanged():
+    response = app.openapi()["paths"]["/api/v1/employees"]["get"]["responses"]["200"]
+    schema = response["content"]["application/json"]["schema"]
+    assert schema["items"]["$ref"].endswith("/Employee")
+
+
+def test_fast_serialization_is_opt_in():
+    # Unset in the environment means the stock response_model path
+    if "FAST_JSON_MODE" not in os.environ:
+        assert system_config.FAST_JSON_MODE == "off"
+        assert fast_response(list[schemas.Employee], [], None) == []
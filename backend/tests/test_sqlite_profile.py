@@ -0,0 +1,120 @@
+"""
+SQLite Profile Tests
+WAL pragmas, read-only reader connections, the single writer and get_db routing.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from starlette.requests import Request
+
+from backend import dependencies
+from backend.database import configure_sqlite, is_file_sqlite
+
+
+@pytest.fixture
+def engines(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    writer = create_engine(url, connect_args={"check_same_thread": False}, pool_size=1, max_overflow=0, pool_timeout=5)
+    reader = create_engine(url, connect_args={"check_same_thread": False}, pool_size=4, max_overflow=0)
+    configure_sqlite(writer, file_backed=True)
+    configure_sqlite(reader, file_backed=True, read_only=True)
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)"))
+        conn.execute(text("INSERT INTO t (v) VALUES ('a')"))
+    yield writer, reader
+    reader.dispose()
+    writer.dispose()
+
+
+def test_file_detection():
+    assert is_file_sqlite("sqlite:///./data/people_os.db")
+    assert not is_file_sqlite("sqlite:///:memory:")
+    assert not is_file_sqlite("sqlite:///file:x?mode=memory&cache=shared&uri=true")
+    assert not is_file_sqlite("postgresql://u:p@h/db")
+
+
+def test_profile_pragmas_are_applied(engines):
+    writer, reader = engines
+    with writer.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() > 0
+    with reader.connect() as conn:
+        assert conn.execute(text("PRAGMA query_only")).scalar() == 1
+
+
+def test_reader_is_read_only_and_not_blocked_by_writer(engines):
+    writer, reader = engines
+    with reader.connect() as conn, pytest.raises(OperationalError):
+        conn.execute(text("INSERT INTO t (v) VALUES ('b')"))
+
+    with writer.connect() as wconn:
+        wconn.execute(text("BEGIN IMMEDIATE"))
+        wconn.execute(text("INSERT INTO t (v) VALUES ('c')"))
+        # WAL: readers see the last committed state while a write is open
+        with reader.connect() as rconn:
+            assert rconn.execute(text("SELECT count(*) FROM t")).scalar() == 1
+        wconn.execute(text("COMMIT"))
+
+
+def test_concurrent_writers_queue_on_the_single_connection(engines):
+    writer, _ = engines
+    errors = []
+
+    def write(n):
+        try:
+            for i in range(20):
+                with writer.begin() as conn:
+                    conn.execute(text("INSERT INTO t (v) VALUES (:v)"), {"v": f"{n}-{i}"})
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    with writer.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 1 + 8 * 20
+
+
+def _request(method, endpoint):
+    class Route:
+        pass
+
+    route = Route()
+    route.endpoint = endpoint
+    return Request({"type": "http", "method": method, "headers": [], "route": route})
+
+
+class _Session:
+    def __init__(self, kind):
+        self.kind = kind
+
+    def close(self):
+        pass
+
+
+def test_get_db_routes_reads_to_the_reader(monkeypatch):
+    monkeypatch.setattr(dependencies, "SessionLocal", lambda: _Session("writer"))
+    monkeypatch.setattr(dependencies, "ReadSessionLocal", lambda: _Session("reader"))
+    monkeypatch.setattr(dependencies, "_WRITES_ON_READ", set())
+
+    def endpoint():
+        pass
+
+    def session_for(method):
+        sessions = dependencies.get_db(_request(method, endpoint))
+        kind = next(sessions).kind
+        sessions.close()
+        return kind
+
+    assert session_for("GET") == "reader"
+    assert session_for("POST") == "writer"
+    dependencies.writes_on_read(endpoint)
+    assert session_for("GET") == "writer"
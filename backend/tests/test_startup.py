@@ -0,0 +1,71 @@
+"""
+Startup Profiler Tests
+Phase report, schema fingerprint skip, targeted DB check and deferred start.
+"""
+
+import asyncio
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+
+from backend.database import Base
+from backend.dependencies import get_current_user
+from backend.main import app
+from backend.security.db_enforcer import enforce_clean_db_state
+from backend.startup import DeferredStartMiddleware, StartupProfiler, ensure_schema, schema_fingerprint
+
+
+def test_startup_report_lists_phases(client):
+    app.dependency_overrides[get_current_user] = lambda: {"id": "u1", "role": "SystemAdmin", "organization_id": "ORG-1"}
+    try:
+        report = client.get("/api/v1/system/startup-report").json()
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+    names = [p["name"] for p in report["phases"]]
+    assert report["mode"] == "standard"
+    assert names[:2] == ["imports", "db_enforcer"]
+    assert {"schema", "permission_matrix", "scheduler"} <= set(names)
+    assert report["totalMs"] >= 0
+
+
+def test_create_all_is_skipped_when_fingerprint_matches(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    assert ensure_schema(engine, Base.metadata, fast=True) == "created"
+    assert ensure_schema(engine, Base.metadata, fast=True) == "skipped"
+    # standard mode always runs create_all
+    assert ensure_schema(engine, Base.metadata, fast=False) == "created"
+    engine.dispose()
+
+
+def test_fingerprint_tracks_schema_changes():
+    def metadata(*extra):
+        md = MetaData()
+        Table("t", md, Column("id", Integer, primary_key=True), *extra)
+        return md
+
+    assert schema_fingerprint(metadata()) == schema_fingerprint(metadata())
+    assert schema_fingerprint(metadata()) != schema_fingerprint(metadata(Column("name", String)))
+
+
+def test_fast_check_removes_legacy_db_in_known_locations(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    legacy = tmp_path / "sql_app.db"
+    legacy.write_bytes(b"")
+    enforce_clean_db_state(fast=True)
+    assert not legacy.exists()
+
+
+def test_deferred_work_runs_after_first_response():
+    profiler = StartupProfiler()
+    events = []
+    profiler.defer("scheduler", lambda: events.append("scheduler"))
+
+    async def inner(scope, receive, send):
+        events.append("response")
+
+    middleware = DeferredStartMiddleware(inner, profiler)
+    assert profiler.report()["pendingDeferred"] == ["scheduler"]
+    asyncio.run(middleware({"type": "http"}, None, None))
+    asyncio.run(middleware({"type": "http"}, None, None))
+    assert events == ["response", "scheduler", "response"]
+    assert profiler.report()["phases"][0]["name"] == "scheduler (deferred)"
+    assert profiler.report()["pendingDeferred"] == []
@@ -0,0 +1,124 @@
+"""
+Resource Versions
+=================
+Monotonic change counters per (scope, resource), stored in
+`core_resource_versions` so every worker process sees the same value.
+
+Reads go through a short-lived in-process cache (`refresh_seconds`), so a
+version check is normally a dict lookup. Writers bump the counter inside
+their own transaction; the new value reaches the local cache when that
+transaction commits, so the worker that made the change never serves a
+stale version, and no reader ever sees a version whose rows are not yet
+committed (or were rolled back).
+"""
+
+import threading
+import time
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from backend.config import system_config
+from backend.database import upsert_insert
+from backend.domains.core.models import DBResourceVersion
+
+_PENDING = "resource_versions_pending"
+
+SYSTEM_SCOPE = "system"
+# Scope for unfiltered (all-organization) listings
+ALL_SCOPE = "*"
+
+
+class ResourceVersions:
+    """Cached reader / transactional writer for resource version counters."""
+
+    def __init__(self, refresh_seconds: float = 2.0):
+        self.refresh_seconds = refresh_seconds
+        # (scope, resource) -> (version, checked_at)
+        self._cache: dict = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, scope: str, resource: str) -> int:
+        key = (scope, resource)
+        pending = db.info.get(_PENDING)
+        if pending and key in pending:
+            # This session's own uncommitted bump: visible to it, never cached
+            return pending[key]
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and now - cached[1] < self.refresh_seconds:
+            return cached[0]
+
+        version = db.execute(
+            select(DBResourceVersion.version).where(
+                DBResourceVersion.scope == scope,
+                DBResourceVersion.resource == resource,
+            )
+        ).scalar()
+        version = version or 0
+        self._remember(key, version, now)
+        return version
+
+    def bump(self, db: Session, scope: str, resource: str) -> int:
+        """Increment a counter inside the caller's transaction (caller commits)."""
+        table = DBResourceVersion.__table__
+        insert = upsert_insert(db)
+        stmt = insert(table).values(scope=scope, resource=resource, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.scope, table.c.resource],
+            set_={"version": table.c.version + 1},
+        )
+        db.execute(stmt)
+
+        version = db.execute(
+            select(table.c.version).where(
+                table.c.scope == scope, table.c.resource == resource
+            )
+        ).scalar()
+        # Published on commit; until then readers keep the committed version
+        db.info.setdefault(_PENDING, {})[(scope, resource)] = version
+        self._watch(db)
+        return version
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _remember(self, key, version: int, checked_at: float):
+        with self._lock:
+            cached = self._cache.get(key)
+            # Commits can finish out of order; a version never moves backwards
+            if cached is None or cached[0] <= version:
+                self._cache[key] = (version, checked_at)
+
+    def _watch(self, db: Session):
+        if db.info.get(f"{_PENDING}_watched"):
+            return
+        db.info[f"{_PENDING}_watched"] = True
+        event.listen(db, "after_commit", self._publish)
+        event.listen(db, "after_rollback", self._discard)
+
+    def _publish(self, db: Session):
+        pending = db.info.get(_PENDING) or {}
+        now = time.monotonic()
+        for key, version in pending.items():
+            self._remember(key, version, now)
+        pending.clear()
+
+    def _discard(self, db: Session):
+        pending = db.info.get(_PENDING) or {}
+        with self._lock:
+            for key in pending:
+                # The cached value may be from this session's read of its own bump
+                self._cache.pop(key, None)
+        pending.clear()
+
+
+def make_etag(scope: str, resource: str, version: int) -> str:
+    """Strong ETag for one version of a (scope, resource) listing."""
+    return f'"{resource}.{scope}.v{version}"'
+
+
+resource_versions = ResourceVersions(
+    refresh_seconds=system_config.RESOURCE_VERSION_REFRESH_SECONDS
+)
@@ -0,0 +1,119 @@
+"""
+Benchmark: attendance punch ingest
+==================================
+Generates terminal punches (four per employee-day, shuffled) and loads them
+into a throwaway SQLite database twice: once through the batch upsert path
+(`crud.ingest_attendance_punches`) and once as one `create_attendance_record`
+call per employee-day, which is what a terminal integration had to do before.
+A second batch pass re-delivers the same punches to show the upsert cost of a
+retried upload. The batch path is checked against the ingest target
+(`--target`, punches/s); request parsing and HTTP overhead are not included.
+
+    python scripts/bench_attendance_ingest.py [--employees 2000] [--days 5] [--batch 5000] [--target 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend import crud, schemas
+from backend.database import Base
+from backend.domains.hcm.models import DBAttendance, DBEmployee
+
+
+def make_punches(employees: int, days: int):
+    rng = random.Random(42)
+    start = datetime(2025, 4, 1)
+    punches = []
+    for i in range(employees):
+        for d in range(days):
+            day = start + timedelta(days=d)
+            for minutes in (rng.randint(480, 560), 780, 810, rng.randint(1020, 1140)):
+                punches.append(schemas.AttendancePunch(
+                    employeeId=f"EMP-{i:06d}", timestamp=day + timedelta(minutes=minutes),
+                    device=f"T{i % 8}",
+                ))
+    rng.shuffle(punches)
+    return punches
+
+
+def fresh_session(tmp: str, name: str, employees: int):
+    engine = create_engine(f"sqlite:///{os.path.join(tmp, name)}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.execute(insert(DBEmployee), [
+        {"id": f"EMP-{i:06d}", "name": f"Employee {i}", "email": f"emp{i}@bench.local"}
+        for i in range(employees)
+    ])
+    session.commit()
+    return engine, session
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=5000, help="punches per API call")
+    parser.add_argument("--target", type=int, default=20000, help="required punches/s for the batch path")
+    args = parser.parse_args()
+
+    punches = make_punches(args.employees, args.days)
+    batches = [punches[i:i + args.batch] for i in range(0, len(punches), args.batch)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session = fresh_session(tmp, "batch.db", args.employees)
+        ingest = lambda: [crud.ingest_attendance_punches(session, b, "bench") for b in batches]
+        first = timed(ingest)
+        again = timed(ingest)
+        rows = session.query(DBAttendance).count()
+        session.close()
+        engine.dispose()
+
+        engine, session = fresh_session(tmp, "rows.db", args.employees)
+
+        def row_at_a_time():
+            # Pre-aggregated by the caller, so this only measures the write path
+            days = {}
+            for p in punches:
+                key = (p.employee_id, p.timestamp.date().isoformat())
+                at = p.timestamp.strftime("%H:%M:%S")
+                lo, hi = days.get(key, (at, at))
+                days[key] = (min(lo, at), max(hi, at))
+            for (employee_id, day), (lo, hi) in days.items():
+                crud.create_attendance_record(session, schemas.AttendanceCreate(
+                    employee_id=employee_id, date=day, clock_in=lo, clock_out=hi, status="Present",
+                ), "bench")
+
+        single = timed(row_at_a_time)
+        session.close()
+        engine.dispose()
+
+    total = len(punches)
+    print(f"{total:,} punches -> {rows:,} employee-days, {len(batches)} batches of {args.batch}")
+    print(f"  batch upsert     : {first:7.2f} s  {total / first:10,.0f} punches/s")
+    print(f"  batch re-deliver : {again:7.2f} s  {total / again:10,.0f} punches/s")
+    print(f"  row at a time    : {single:7.2f} s  {total / single:10,.0f} punches/s")
+    slowest = total / max(first, again)
+    verdict = "met" if slowest >= args.target else "NOT met"
+    print(f"  target {args.target:,} punches/s: {verdict} (slowest batch pass {slowest:,.0f} punches/s)")
+
+
+if __name__ == "__main__":
+    main()
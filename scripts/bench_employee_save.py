@@ -0,0 +1,121 @@
+"""
+Benchmark: employee save write amplification
+============================================
+Saves one employee (several rows in every child tab) through the old
+full-replace strategy and through `crud.update_employee`'s diff, and reports
+the write statements issued and rows touched per save for two edits: an
+email-only change and a single education row edit.
+
+    python scripts/bench_employee_save.py [--rows 5] [--saves 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, delete, event
+from sqlalchemy.orm import sessionmaker
+
+from backend import crud, schemas
+from backend.database import Base
+from backend.domains.hcm.models import DBEmployee
+
+WRITE_VERBS = ("INSERT", "UPDATE", "DELETE")
+
+
+class WriteCounter:
+    def __init__(self, engine):
+        self.statements = 0
+        self.rows = 0
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(" ", 1)[0].upper() in WRITE_VERBS:
+            self.statements += 1
+            self.rows += max(cursor.rowcount, 0)
+
+
+def payload(rows: int, email: str = "bench@example.com", gpa: str = "3.0") -> schemas.EmployeeCreate:
+    return schemas.EmployeeCreate(
+        id="EMP-BENCH", name="Bench Employee", email=email, organizationId="ORG-BENCH",
+        education=[
+            {"degree": f"Degree {i}", "institute": "Uni", "year": str(2000 + i),
+             "gradeGpa": gpa if i == 0 else "3.0", "marksObtained": 800, "totalMarks": 1000}
+            for i in range(rows)
+        ],
+        experience=[
+            {"orgName": f"Company {i}", "designation": "Engineer", "from": f"{2010 + i}-01-01",
+             "to": f"{2011 + i}-01-01", "grossSalary": 100000, "remarks": "-"}
+            for i in range(rows)
+        ],
+        family=[{"name": f"Relative {i}", "relationship": "Child", "dob": "2010-01-01"} for i in range(rows)],
+        discipline=[{"date": f"2020-01-{i + 1:02d}", "description": f"Note {i}", "outcome": "Closed"} for i in range(rows)],
+        increments=[
+            {"effectiveDate": f"{2015 + i}-07-01", "newGross": 100000 + i, "type": "Annual", "remarks": "-"}
+            for i in range(rows)
+        ],
+    )
+
+
+def full_replace(db, employee: schemas.EmployeeCreate, user_id: str):
+    """The pre-diff strategy: delete every child row, re-insert them all."""
+    db_employee = db.get(DBEmployee, employee.id)
+    db_employee.email = employee.email
+    db_employee.updated_by = user_id
+    children = crud.employee_child_rows(employee, employee.id, user_id)
+    for model, _ in crud.EMPLOYEE_CHILDREN.values():
+        db.execute(delete(model).where(model.employee_id == employee.id))
+        db.add_all(model(**values) for values in children[model])
+    db.commit()
+    db.expire_all()
+
+
+def measure(engine, save, edits, saves: int):
+    """(write statements, rows touched, ms) per save, alternating between `edits`."""
+    Session = sessionmaker(bind=engine)
+    counter = WriteCounter(engine)
+    started = time.perf_counter()
+    with Session() as db:
+        for n in range(saves):
+            save(db, edits[n % len(edits)], "bench")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    event.remove(engine, "after_cursor_execute", counter._after)
+    return counter.statements / saves, counter.rows / saves, elapsed_ms / saves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=5, help="rows per child tab")
+    parser.add_argument("--saves", type=int, default=200)
+    args = parser.parse_args()
+
+    scenarios = {
+        "email only": [payload(args.rows, email="a@example.com"), payload(args.rows, email="b@example.com")],
+        "one education row": [payload(args.rows, gpa="3.5"), payload(args.rows, gpa="3.9")],
+    }
+    strategies = {
+        "full replace": full_replace,
+        "diff": lambda db, employee, user_id: crud.update_employee(db, employee.id, employee, user_id),
+    }
+
+    print(f"{args.rows} rows per child tab, {args.saves} saves per run")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scenario, edits in scenarios.items():
+            for strategy, save in strategies.items():
+                engine = create_engine(f"sqlite:///{os.path.join(tmp, f'{len(os.listdir(tmp))}.db')}")
+                Base.metadata.create_all(bind=engine)
+                with sessionmaker(bind=engine)() as db:
+                    crud.create_employee(db, payload(args.rows), "bench")
+                statements, rows, ms = measure(engine, save, edits, args.saves)
+                engine.dispose()
+                print(f"  {scenario:<18} {strategy:<12}: {statements:6.1f} writes, {rows:6.1f} rows, {ms:7.2f} ms/save")
+
+
+if __name__ == "__main__":
+    main()
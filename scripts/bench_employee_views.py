@@ -0,0 +1,115 @@
+"""
+Benchmark: /employees detail vs summary view
+============================================
+Seeds a throwaway SQLite tenant (50k employees by default, two education and
+two family rows each) and times one directory page in both modes, covering
+the query plus the serialization FastAPI would do for each.
+
+    python scripts/bench_employee_views.py [--employees 50000] [--limit 100] [--pages 20]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend import crud, schemas
+from backend.database import Base
+from backend.domains.hcm.models import DBEducation, DBEmployee, DBFamily
+
+
+def seed(session, employees: int):
+    batch = 5000
+    for start in range(0, employees, batch):
+        ids = range(start, min(start + batch, employees))
+        session.execute(insert(DBEmployee), [
+            {
+                "id": f"EMP-{i:06d}",
+                "name": f"Employee {i}",
+                "role": "Staff",
+                "department": "Operations",
+                "status": "Active",
+                "join_date": "2024-01-01",
+                "email": f"emp{i}@bench.local",
+                "organization_id": "ORG-BENCH",
+            }
+            for i in ids
+        ])
+        session.execute(insert(DBEducation), [
+            {
+                "employee_id": f"EMP-{i:06d}", "degree": "BSc", "institute": "Uni",
+                "passing_year": "2015", "score": "A", "marks_obtained": 800, "total_marks": 1000,
+            }
+            for i in ids for _ in range(2)
+        ])
+        session.execute(insert(DBFamily), [
+            {"employee_id": f"EMP-{i:06d}", "name": "Relative", "relationship": "Spouse", "dob": "1990-01-01"}
+            for i in ids for _ in range(2)
+        ])
+        session.commit()
+
+
+def run(session, fetch, serialize, pages: int, limit: int) -> float:
+    """Average milliseconds per page, walking `pages` pages by offset."""
+    started = time.perf_counter()
+    for page in range(pages):
+        session.expunge_all()
+        serialize(fetch(skip=page * limit, limit=limit))
+    return (time.perf_counter() - started) * 1000 / pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--employees", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args()
+
+    detail_adapter = TypeAdapter(List[schemas.Employee])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+
+        print(f"Seeding {args.employees:,} employees...")
+        seed(session, args.employees)
+
+        detail_ms = run(
+            session,
+            lambda **kw: crud.get_employees(session, **kw),
+            lambda rows: detail_adapter.dump_json(
+                detail_adapter.validate_python(rows, from_attributes=True), by_alias=True
+            ),
+            args.pages,
+            args.limit,
+        )
+        summary_ms = run(
+            session,
+            lambda **kw: crud.get_employee_summaries(session, **kw),
+            lambda rows: json.dumps([dict(r._mapping) for r in rows]),
+            args.pages,
+            args.limit,
+        )
+        session.close()
+        engine.dispose()
+
+    print(f"page size {args.limit}, {args.pages} pages")
+    print(f"  view=detail : {detail_ms:8.2f} ms/page")
+    print(f"  view=summary: {summary_ms:8.2f} ms/page")
+    print(f"  speedup     : {detail_ms / summary_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
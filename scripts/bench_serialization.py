@@ -0,0 +1,107 @@
+"""
+Benchmark: response serialization per row
+=========================================
+Loads a page of ORM rows once and times only the serialization step, per
+row, for the stock FastAPI path (response_model validation, dump to Python,
+stdlib json) and for both fast JSON modes.
+
+    python scripts/bench_serialization.py [--rows 1000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend import crud, schemas
+from backend.database import Base
+from backend.domains.hcm.models import DBAttendance, DBEducation, DBEmployee, DBFamily
+from backend.serialization import orjson, serializer_for
+
+
+def seed(session, rows: int):
+    session.execute(insert(DBEmployee), [
+        {"id": f"EMP-{i:06d}", "name": f"Employee {i}", "role": "Staff", "department": "Operations",
+         "status": "Active", "join_date": "2024-01-01", "email": f"emp{i}@bench.local",
+         "organization_id": "ORG-BENCH"}
+        for i in range(rows)
+    ])
+    session.execute(insert(DBEducation), [
+        {"employee_id": f"EMP-{i:06d}", "degree": "BSc", "institute": "Uni", "passing_year": "2015",
+         "score": "A", "marks_obtained": 800, "total_marks": 1000}
+        for i in range(rows) for _ in range(2)
+    ])
+    session.execute(insert(DBFamily), [
+        {"employee_id": f"EMP-{i:06d}", "name": "Relative", "relationship": "Spouse", "dob": "1990-01-01"}
+        for i in range(rows) for _ in range(2)
+    ])
+    session.execute(insert(DBAttendance), [
+        {"employee_id": f"EMP-{i:06d}", "date": "2025-03-01", "clock_in": "09:00:00",
+         "clock_out": "17:00:00", "status": "Present"}
+        for i in range(rows)
+    ])
+    session.commit()
+
+
+def stock(schema):
+    field = create_response_field(name="Response_bench", type_=schema)
+
+    def render(rows):
+        content = asyncio.run(serialize_response(field=field, response_content=rows, is_coroutine=False))
+        return JSONResponse(content).body
+    return render
+
+
+def per_row_us(render, rows, repeat: int) -> float:
+    render(rows)  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render(rows)
+    return (time.perf_counter() - started) * 1e6 / (repeat * len(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        seed(session, args.rows)
+        datasets = [
+            ("Employee", List[schemas.Employee], crud.get_employees(session, limit=args.rows)),
+            ("Attendance", List[schemas.Attendance], crud.get_attendance_records(session, limit=args.rows)),
+        ]
+
+        print(f"{args.rows} rows x {args.repeat}, orjson {'on' if orjson else 'off'}")
+        for name, schema, rows in datasets:
+            fast = serializer_for(schema)
+            before = per_row_us(stock(schema), rows, args.repeat)
+            validated = per_row_us(fast.validated_json, rows, args.repeat)
+            trusted = per_row_us(fast.trusted_json, rows, args.repeat)
+            print(f"{name}")
+            print(f"  stock response_model : {before:8.1f} us/row")
+            print(f"  fast validated       : {validated:8.1f} us/row  ({before / validated:4.1f}x)")
+            print(f"  fast trusted         : {trusted:8.1f} us/row  ({before / trusted:4.1f}x)")
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
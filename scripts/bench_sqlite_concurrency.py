@@ -0,0 +1,138 @@
+"""
+Benchmark: SQLite concurrency profile
+=====================================
+Runs reader and writer threads against a temporary SQLite file, first with
+the old setup (one pooled engine, rollback journal, foreign_keys only) and
+then with the profile from backend/database.py (WAL, single writer
+connection, query_only reader pool). Reports throughput, read latency and
+"database is locked" errors for each.
+
+    python scripts/bench_sqlite_concurrency.py [--readers 16] [--writers 4] [--seconds 5]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from backend.config import system_config
+from backend.database import configure_sqlite
+
+ROWS = 5_000
+
+
+def legacy_engines(url):
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return engine, engine
+
+
+def profiled_engines(url):
+    args = {"connect_args": {"check_same_thread": False}, "max_overflow": 0}
+    writer = create_engine(url, pool_size=1, pool_timeout=system_config.SQLITE_WRITE_TIMEOUT_SECONDS, **args)
+    reader = create_engine(url, pool_size=system_config.SQLITE_READ_POOL_SIZE, **args)
+    configure_sqlite(writer, file_backed=True)
+    configure_sqlite(reader, file_backed=True, read_only=True)
+    return writer, reader
+
+
+def seed(engine):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE employees (id INTEGER PRIMARY KEY, name TEXT, dept INTEGER, salary REAL)"))
+        conn.execute(
+            text("INSERT INTO employees (name, dept, salary) VALUES (:n, :d, :s)"),
+            [{"n": f"emp-{i}", "d": i % 20, "s": 1000.0 + i} for i in range(ROWS)],
+        )
+
+
+def run(label, make_engines, readers, writers, seconds):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        writer, reader = make_engines(url)
+        seed(writer)
+        stop = time.perf_counter() + seconds
+        latencies, lock = [], threading.Lock()
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+
+        def read_loop(n):
+            local, done, locked = [], 0, 0
+            while time.perf_counter() < stop:
+                started = time.perf_counter()
+                try:
+                    with reader.connect() as conn:
+                        conn.execute(
+                            text("SELECT dept, count(*), avg(salary) FROM employees WHERE dept = :d GROUP BY dept"),
+                            {"d": n % 20},
+                        ).all()
+                    done += 1
+                    local.append(time.perf_counter() - started)
+                except OperationalError:
+                    locked += 1
+            with lock:
+                latencies.extend(local)
+                counts["reads"] += done
+                counts["locked"] += locked
+
+        def write_loop(n):
+            done, locked = 0, 0
+            while time.perf_counter() < stop:
+                try:
+                    with writer.begin() as conn:
+                        conn.execute(
+                            text("UPDATE employees SET salary = salary + 1 WHERE id = :id"),
+                            {"id": (n * 7919 + done) % ROWS + 1},
+                        )
+                    done += 1
+                except OperationalError:
+                    locked += 1
+            with lock:
+                counts["writes"] += done
+                counts["locked"] += locked
+
+        threads = [threading.Thread(target=read_loop, args=(n,)) for n in range(readers)]
+        threads += [threading.Thread(target=write_loop, args=(n,)) for n in range(writers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        reader.dispose()
+        writer.dispose()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+    median = statistics.median(latencies) if latencies else 0.0
+    print(f"{label}")
+    print(f"  reads          : {counts['reads'] / seconds:10,.0f} /s   (p50 {median * 1e3:.2f} ms, p95 {p95 * 1e3:.2f} ms)")
+    print(f"  writes         : {counts['writes'] / seconds:10,.0f} /s")
+    print(f"  locked errors  : {counts['locked']:10,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:g}s each")
+    run("rollback journal, shared pool", legacy_engines, args.readers, args.writers, args.seconds)
+    run("WAL, single writer + read-only pool", profiled_engines, args.readers, args.writers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Load test: sync vs async read path
+==================================
+Serves the real app with uvicorn on a throwaway SQLite file and drives it
+with concurrent HTTP clients. Each hot read endpoint (now `async def` on the
+AsyncSession) is measured next to a sync twin registered by this script that
+runs the same crud reader on the blocking Session in the threadpool, which is
+how every route was served before. The async routes authenticate, check
+permissions and answer ETags through the `*_async` dependencies on the same
+AsyncSession, so the threadpool hand-offs per request (`offload/req`) should
+be zero for them and at least one for the sync twins.
+
+Client and server share one process (and GIL), so compare the two columns
+with each other rather than reading the absolute numbers as capacity.
+
+    python scripts/loadtest_read_paths.py [--employees 2000] [--concurrency 200] [--seconds 10]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+# Add project root to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+TMP = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TMP.name, 'loadtest.db')}"
+
+import anyio.to_thread
+import httpx
+import uvicorn
+from fastapi import Depends
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from backend import crud, schemas
+from backend.database import Base, SessionLocal, engine
+from backend.dependencies import get_current_user, get_current_user_async, get_db
+from backend.domains.core.models import DBDepartment, DBOrganization
+from backend.domains.hcm.models import DBAttendance, DBEmployee
+from backend.main import app
+
+# (label, async route, sync twin)
+PATHS = [
+    ("employees", "/api/v1/employees?limit=50", "/loadtest/sync/employees?limit=50"),
+    ("departments", "/api/v1/departments", "/loadtest/sync/departments"),
+    ("attendance", "/api/v1/hcm/attendance?limit=100", "/loadtest/sync/attendance?limit=100"),
+    ("health", "/api/v1/health", "/loadtest/sync/health"),
+]
+
+
+def register_sync_twins():
+    def employees(limit: int = 100, db: Session = Depends(get_db)):
+        return crud.get_employees(db, limit=limit)
+
+    def departments(db: Session = Depends(get_db)):
+        return crud.get_departments(db)
+
+    def attendance(limit: int = 100, db: Session = Depends(get_db)):
+        return crud.get_attendance_records(db, limit=limit)
+
+    def health(db: Session = Depends(get_db)):
+        db.execute(text("SELECT 1"))
+        return {"status": "Optimal"}
+
+    app.add_api_route("/loadtest/sync/employees", employees, response_model=List[schemas.Employee])
+    app.add_api_route("/loadtest/sync/departments", departments, response_model=List[schemas.Department])
+    app.add_api_route("/loadtest/sync/attendance", attendance, response_model=List[schemas.Attendance])
+    app.add_api_route("/loadtest/sync/health", health)
+
+
+def seed(employees: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(DBOrganization(id="ORG-LOAD", code="LOAD", name="Load Test"))
+    db.flush()
+    db.execute(insert(DBDepartment), [
+        {"id": f"DEP-{i}", "code": f"D{i}", "name": f"Department {i}", "organization_id": "ORG-LOAD"}
+        for i in range(30)
+    ])
+    db.execute(insert(DBEmployee), [
+        {"id": f"EMP-{i:06d}", "name": f"Employee {i}", "email": f"e{i}@load.test",
+         "status": "Active", "role": "Staff", "department": "Ops", "join_date": "2024-01-01",
+         "organization_id": "ORG-LOAD"}
+        for i in range(employees)
+    ])
+    db.execute(insert(DBAttendance), [
+        {"employee_id": f"EMP-{i:06d}", "date": f"2025-03-{d:02d}", "status": "Present"}
+        for i in range(employees) for d in range(1, 6)
+    ])
+    db.commit()
+    db.close()
+
+
+class ThreadpoolCounter:
+    """Counts work handed to anyio's worker threads (sync endpoints and dependencies)."""
+
+    def __init__(self):
+        self.calls = 0
+        self._run_sync = anyio.to_thread.run_sync
+        anyio.to_thread.run_sync = self._counting
+
+    async def _counting(self, func, *args, **kwargs):
+        self.calls += 1
+        return await self._run_sync(func, *args, **kwargs)
+
+
+async def loadtest_user():
+    return {"id": "loadtest", "role": "Root"}
+
+
+def serve(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning", lifespan="off"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def hammer(url: str, concurrency: int, seconds: float):
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                res = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                errors += res.status_code != 200
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def report(label: str, latencies: List[float], errors: int, seconds: float, offloaded: int):
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"  {label:<6} {len(latencies) / seconds:9.0f} req/s   p50 {q[49] * 1000:7.1f} ms"
+          f"   p95 {q[94] * 1000:7.1f} ms   offload/req {offloaded / max(len(latencies), 1):4.1f}"
+          f"   errors {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    print(f"Seeding {args.employees:,} employees...")
+    seed(args.employees)
+    register_sync_twins()
+    app.dependency_overrides[get_current_user] = lambda: {"id": "loadtest", "role": "Root"}
+    app.dependency_overrides[get_current_user_async] = loadtest_user
+    threadpool = ThreadpoolCounter()
+    server = serve(args.port)
+
+    base = f"http://127.0.0.1:{args.port}"
+    print(f"{args.concurrency} concurrent clients, {args.seconds:g}s per run")
+    try:
+        for label, async_path, sync_path in PATHS:
+            print(label)
+            for kind, path in (("sync", sync_path), ("async", async_path)):
+                before = threadpool.calls
+                latencies, errors = asyncio.run(hammer(base + path, args.concurrency, args.seconds))
+                report(kind, latencies, errors, args.seconds, threadpool.calls - before)
+    finally:
+        server.should_exit = True
+        TMP.cleanup()
+
+
+if __name__ == "__main__":
+    main()
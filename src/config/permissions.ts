@@ -32,6 +32,7 @@ export const DEFAULT_ROLE_PERMISSIONS: Record<SystemRole, Permission[]> = {
   'Business Admin': [], // To be configured via System Settings
   Manager: [], // To be configured via System Settings
   User: [], // To be configured via System Settings
+  Integration: [], // API-key clients; to be configured via System Settings
 };
 
 // ============================================================
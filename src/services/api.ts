@@ -608,6 +608,24 @@ class ApiService {
     }
   }
 
+  // One profile tab (education, experience, family, discipline, increments), paged
+  async getEmployeeTab<T = any>(
+    id: string,
+    tab: 'education' | 'experience' | 'family' | 'discipline' | 'increments',
+    params: { limit?: number; cursor?: string; sort?: string } = {}
+  ): Promise<{ rows: T[]; nextCursor: string | null }> {
+    const query = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== undefined) query.set(key, String(value));
+    });
+    const suffix = query.toString() ? `?${query}` : '';
+    const response = await this.request(`${this.apiUrl}/employees/${id}/${tab}${suffix}`);
+    if (!response.ok) {
+      throw new Error(`Failed to load employee ${tab}`);
+    }
+    return { rows: await response.json(), nextCursor: response.headers.get('X-Next-Cursor') };
+  }
+
   async deleteEmployee(id: string): Promise<void> {
     this.enforceRateLimit();
     await this.governanceIntercept(`Delete Employee: ${id}`, 'HCM_API');
@@ -1986,6 +2004,68 @@ class ApiService {
     return await response.json();
   }
 
+  async getLatencySummary(): Promise<{
+    since: string;
+    inFlight: number;
+    routes: Array<{
+      method: string;
+      route: string;
+      count: number;
+      errors: number;
+      meanMs: number | null;
+      p50Ms: number | null;
+      p95Ms: number | null;
+      p99Ms: number | null;
+    }>;
+    authQueue?: {
+      workers: number;
+      queueLimit: number;
+      rounds: number | null;
+      pending: number;
+      running: number;
+      maxPending: number;
+      completed: number;
+      rejected: number;
+      meanWaitMs: number | null;
+      meanHashMs: number | null;
+    };
+  }> {
+    const response = await this.request(`${this.apiUrl}/system/metrics/summary`);
+    if (!response.ok) {
+      return { since: '', inFlight: 0, routes: [] };
+    }
+    return await response.json();
+  }
+
+  // --- Batch Reads ---
+  // One POST /batch instead of one GET per list; results keyed by request id
+  async batch(
+    requests: Array<{ id: string; path: string }>
+  ): Promise<Record<string, { status: number; body: any }>> {
+    const response = await this.request(`${this.apiUrl}/batch`, {
+      method: 'POST',
+      body: JSON.stringify({ requests }),
+    });
+    if (!response.ok) {
+      throw new Error('Failed to run batch request');
+    }
+    const data = await response.json();
+    const results: Record<string, { status: number; body: any }> = {};
+    for (const item of data.responses) {
+      results[item.id] = { status: item.status, body: item.body };
+    }
+    return results;
+  }
+
+  // Organization setup in one cached document (profile, plants, departments, grades, ...)
+  async getBootstrap(orgId: string): Promise<Record<string, any>> {
+    const response = await this.request(`${this.apiUrl}/organizations/${orgId}/bootstrap`);
+    if (!response.ok) {
+      throw new Error('Failed to load organization bootstrap');
+    }
+    return await response.json();
+  }
+
   // --- Notification Settings ---
   async getNotificationSettings(): Promise<any> {
     const response = await this.request(`${this.apiUrl}/notifications/config`);
@@ -2339,6 +2419,18 @@ class ApiService {
     return await response.json();
   }
 
+  // Approve many pending requests in one call; skipped ids come back with a reason
+  async approveLeaveRequests(
+    leaveIds: string[]
+  ): Promise<{ approved: string[]; skipped: { id: string; reason: string }[]; balancesUpdated: number }> {
+    const response = await this.request(`${this.apiUrl}/hcm/leaves/approve-batch`, {
+      method: 'POST',
+      body: JSON.stringify({ leaveIds }),
+    });
+    if (!response.ok) throw new Error('Failed to approve leave requests');
+    return await response.json();
+  }
+
   async getLeaveBalances(): Promise<LeaveBalance[]> {
     const response = await this.request(`${this.apiUrl}/hcm/leaves/balances`);
     if (!response.ok) return [];
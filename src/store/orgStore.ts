@@ -360,7 +360,26 @@ export const useOrgStore = create<OrgState>()(
           }));
 
           // Phases 2 & 3: Structural & Operational (Merged for performance)
-          // Navigation, Structural and Operational data can all be loaded in parallel
+          // All lists come back from a single POST /batch; any item that failed
+          // (or the whole batch, on an older backend) falls back to its own GET
+          const batched = await safeFetch(
+            api.batch([
+              { id: 'plants', path: '/plants' },
+              { id: 'departments', path: '/departments' },
+              { id: 'subDepartments', path: '/sub-departments' },
+              { id: 'designations', path: '/designations' },
+              { id: 'grades', path: '/grades' },
+              { id: 'shifts', path: '/shifts' },
+              { id: 'jobLevels', path: '/job-levels' },
+              { id: 'holidays', path: '/holidays' },
+              { id: 'banks', path: '/banks' },
+              { id: 'positions', path: '/positions' },
+            ]),
+            'batch'
+          );
+          const fromBatch = <T>(id: string, fallback: () => Promise<T>): Promise<T> =>
+            batched?.[id]?.status === 200 ? Promise.resolve(batched[id].body as T) : fallback();
+
           const [
             plants,
             depts,
@@ -373,16 +392,22 @@ export const useOrgStore = create<OrgState>()(
             banks,
             positions,
           ] = await Promise.all([
-            safeFetch(api.getPlants?.() ?? Promise.resolve([]), 'plants'),
-            safeFetch(api.getDepartments(), 'departments'),
-            safeFetch(api.getSubDepartments(), 'subDepartments'),
-            safeFetch(api.getDesignations(), 'designations'),
-            safeFetch(api.getGrades(), 'grades'),
-            safeFetch(api.getShifts(), 'shifts'),
-            safeFetch(api.getJobLevels(), 'jobLevels'),
-            safeFetch(api.getHolidays(), 'holidays'),
-            safeFetch(api.getBanks(), 'banks'),
-            safeFetch(api.getPositions?.() ?? Promise.resolve(null), 'positions'),
+            safeFetch(
+              fromBatch('plants', () => api.getPlants?.() ?? Promise.resolve([])),
+              'plants'
+            ),
+            safeFetch(fromBatch('departments', () => api.getDepartments()), 'departments'),
+            safeFetch(fromBatch('subDepartments', () => api.getSubDepartments()), 'subDepartments'),
+            safeFetch(fromBatch('designations', () => api.getDesignations()), 'designations'),
+            safeFetch(fromBatch('grades', () => api.getGrades()), 'grades'),
+            safeFetch(fromBatch('shifts', () => api.getShifts()), 'shifts'),
+            safeFetch(fromBatch('jobLevels', () => api.getJobLevels()), 'jobLevels'),
+            safeFetch(fromBatch('holidays', () => api.getHolidays()), 'holidays'),
+            safeFetch(fromBatch('banks', () => api.getBanks()), 'banks'),
+            safeFetch(
+              fromBatch('positions', () => api.getPositions?.() ?? Promise.resolve(null)),
+              'positions'
+            ),
           ]);
 
           const now = Date.now();
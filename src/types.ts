@@ -801,7 +801,8 @@ export type SystemRole =
   | 'SystemAdmin'
   | 'Business Admin'
   | 'Manager'
-  | 'User';
+  | 'User'
+  | 'Integration';
 
 /**
  * Organization Roles - Managed in Org Setup (TBD)